@@ -0,0 +1,99 @@
+"""Benchmark: time-series figures with adaptive buckets vs. one point per day.
+
+Extends the loaded year to --years years by repeating its per-day rollup
+tables, then, for ranges from a day to the whole span, builds the three
+time-series charts (rides, revenue and cancellations over time) with the
+granularity Utils.buckets picks and, for comparison, always per day. Reports
+the granularity, points per trace, build + serialize time and the trace data
+sent in the callback's Patch. Run from the project root:
+
+    python -m Benchmarks.bench_buckets [--csv Data/uber_rides_cleaned.csv]
+        [--years 20] [--repeat 20]
+"""
+import argparse
+import time
+
+import pandas as pd
+from plotly.io.json import to_json_plotly
+
+from Figures import charts
+from Utils import buckets, cancellations
+from Utils.dataset import Dataset
+from Utils.preprocessing import DATA_PATH
+from Utils.rollup import Rollup
+
+SPANS = {
+    "1 day": pd.Timedelta(days=0),
+    "1 week": pd.Timedelta(days=6),
+    "2 weeks": pd.Timedelta(days=13),
+    "1 month": pd.DateOffset(months=1, days=-1),
+    "1 quarter": pd.DateOffset(months=3, days=-1),
+    "1 year": pd.DateOffset(years=1, days=-1),
+    "5 years": pd.DateOffset(years=5, days=-1),
+    "20 years": pd.DateOffset(years=20, days=-1),
+}
+
+
+def repeated(rollup, years):
+    """The rollup's tables repeated for `years` consecutive years."""
+    tables = {}
+    for key, table in rollup.tables.items():
+        copies = []
+        for year in range(years):
+            copy = table.copy()
+            copy.index = table.index + pd.DateOffset(years=year)
+            copies.append(copy[~copy.index.duplicated()])
+        tables[key] = pd.concat(copies).groupby(level=0).sum()
+    return Rollup(tables)
+
+
+def figures(summary, granularity):
+    timeline = cancellations.breakdowns(summary, granularity)["timeline"]
+    return [
+        charts.rides_over_time(summary.over_time("bookings", granularity)),
+        charts.revenue_over_time(summary.over_time("revenue", granularity)),
+        charts.cancellations_over_time(timeline),
+    ]
+
+
+def measure(summary, granularity, repeat):
+    """Best-of-repeat ms to build and serialize, patch bytes and points per trace."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        built = figures(summary, granularity)
+        payload = to_json_plotly([charts.data_patch(figure) for figure in built])
+        best = min(best, time.perf_counter() - start)
+    points = max(len(trace["y"]) for figure in built for trace in figure["data"])
+    return best * 1000, len(payload), points
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--csv", default=DATA_PATH)
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    data = Dataset(args.csv).load()
+    rollup = repeated(data.rollup, args.years)
+    first = rollup.tables["totals"].index[0]
+
+    print(f"{args.years} years of per-day tables, at most {buckets.max_points()} points per trace, "
+          f"best of {args.repeat}\n")
+    print(f"{'range':<10} {'buckets':<8} {'points':>7} {'ms':>7} {'bytes':>9}   "
+          f"{'daily points':>12} {'daily ms':>9} {'daily bytes':>12}")
+    for name, span in SPANS.items():
+        start, end = first, first + span
+        if end > rollup.tables["totals"].index[-1]:
+            continue
+        summary = rollup.days(start, end)
+        granularity = summary.granularity(start, end)
+        ms, size, points = measure(summary, granularity, args.repeat)
+        daily_ms, daily_size, daily_points = measure(summary, "day", args.repeat)
+        print(f"{name:<10} {granularity:<8} {points:>7,} {ms:>7.2f} {size:>9,}   "
+              f"{daily_points:>12,} {daily_ms:>9.2f} {daily_size:>12,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Benchmark: streamed raw data export vs. encoding the whole range at once.
+
+For each size a synthetic CSV is loaded (see Benchmarks.synthetic) and a
+month, a quarter and the whole year are exported as CSV, gzipped CSV and
+Parquet through Utils.export, and, for comparison, with a single
+DataFrame.to_csv / to_parquet call. Each variant runs in a fresh
+subprocess; a sampling thread records how far RSS grows above what the
+loaded data already takes. Finally the Overview page body is timed alone
+and while a year's CSV export streams in another thread. Run from the
+project root:
+
+    python -m Benchmarks.bench_export [--sizes 100K 1M] [--chunk-rows 50000]
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+import psutil
+
+from Benchmarks import synthetic
+
+RANGES = {
+    "month": ("2024-01-01", "2024-01-31"),
+    "quarter": ("2024-01-01", "2024-03-31"),
+    "year": ("2024-01-01", "2024-12-31"),
+}
+VARIANTS = ["csv", "csv.gz", "parquet", "to_csv", "to_parquet"]
+
+
+class PeakRSS:
+    """RSS growth above the starting point, sampled every millisecond."""
+
+    def __init__(self):
+        self.process = psutil.Process()
+        self.base = self.peak = self.process.memory_info().rss
+        self.done = threading.Event()
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+
+    def sample(self):
+        while not self.done.wait(0.001):
+            self.peak = max(self.peak, self.process.memory_info().rss)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.done.set()
+        self.thread.join()
+
+    @property
+    def growth_mb(self):
+        return (self.peak - self.base) / 2**20
+
+
+def run_one(args):
+    from Utils import export
+    from Utils.dataset import Dataset
+
+    data = Dataset(args.csv).load()
+    rows = data.rows(*RANGES[args.range])
+    start = time.perf_counter()
+    size = 0
+    with PeakRSS() as peak:
+        if args.run == "to_csv":
+            size = len(rows.to_csv(index=False).encode())
+        elif args.run == "to_parquet":
+            buffer = io.BytesIO()
+            rows.to_parquet(buffer, index=False)
+            size = len(buffer.getvalue())
+        else:
+            fmt, _, gz = args.run.partition(".")
+            for chunk in export.export_chunks(rows, fmt, gzip=bool(gz), size=args.chunk_rows):
+                size += len(chunk)
+    print(json.dumps({"seconds": time.perf_counter() - start, "rows": len(rows),
+                      "mb": size / 2**20, "rss_growth_mb": peak.growth_mb}))
+
+
+def page_latency(csv, chunk_rows, repeat=10):
+    """Median Overview page time alone and while a year's export streams."""
+    os.environ["UBER_RESULT_CACHE"] = "off"
+    os.environ["UBER_DATA_PATH"] = csv
+    from Callbacks import callbacks
+    from Utils import export
+
+    callbacks.data.load()
+    overview = callbacks.page("overview").overall_analysis
+
+    def timings():
+        out = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            overview("2024-01-01", "2024-03-31")
+            out.append(time.perf_counter() - start)
+        return statistics.median(out) * 1000
+
+    idle = timings()
+    rows = callbacks.data.rows(*RANGES["year"])
+    streaming = threading.Event()
+
+    def download():
+        for _ in export.export_chunks(rows, "csv", size=chunk_rows):
+            if streaming.is_set():
+                return
+
+    thread = threading.Thread(target=download)
+    thread.start()
+    busy = timings()
+    streaming.set()
+    thread.join()
+    return idle, busy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=["100K", "1M"])
+    parser.add_argument("--chunk-rows", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csv", help=argparse.SUPPRESS)
+    parser.add_argument("--range", choices=list(RANGES), help=argparse.SUPPRESS)
+    parser.add_argument("--run", choices=VARIANTS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        return run_one(args)
+
+    print(f"{args.chunk_rows:,} rows per chunk; RSS growth is the peak above the loaded data\n")
+    print(f"{'size':<6} {'range':<8} {'variant':<11} {'rows':>10} {'seconds':>8} {'MiB out':>8} {'RSS growth':>11}")
+    for size in args.sizes:
+        csv = synthetic.ensure(synthetic.parse_rows(size), args.seed)
+        for range_name in RANGES:
+            for variant in VARIANTS:
+                out = subprocess.run(
+                    [sys.executable, "-m", "Benchmarks.bench_export", "--csv", csv, "--range", range_name,
+                     "--run", variant, "--chunk-rows", str(args.chunk_rows)],
+                    check=True, capture_output=True, text=True,
+                )
+                r = json.loads(out.stdout.strip().splitlines()[-1])
+                print(f"{size:<6} {range_name:<8} {variant:<11} {r['rows']:>10,} {r['seconds']:>8.2f} "
+                      f"{r['mb']:>8.1f} {r['rss_growth_mb']:>8.1f} MB")
+        print()
+
+    idle, busy = page_latency(csv, args.chunk_rows)
+    print(f"Overview page (one quarter, {args.sizes[-1]} rows): {idle:.1f} ms alone, "
+          f"{busy:.1f} ms while a year's CSV export streams")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Benchmark: figure build time and JSON payload size per chart.
+
+Builds every dashboard chart from the same pre-aggregated rollup values,
+once through plotly.express (how the pages used to build them) and once
+through the dict figures in Figures.charts, and serializes each the way Dash
+does for a callback response. Run from the project root:
+
+    python -m Benchmarks.bench_figures [--csv Data/uber_rides_cleaned.csv]
+        [--start 2024-01-01] [--end 2024-12-31] [--repeat 20]
+"""
+import argparse
+import time
+
+import plotly.express as px
+from plotly.io.json import to_json_plotly
+
+from Figures import charts
+from Utils.dataset import Dataset
+from Utils.preprocessing import DATA_PATH
+
+
+def express_figures(summary):
+    """The same charts built with plotly.express, for reference."""
+    status = summary.counts("Booking Status")
+    monthly = summary.over_time("bookings", "month").rename_axis("Month").reset_index(name="Bookings")
+    vehicles = summary.counts("Vehicle Type").sort_values(ascending=False)
+    payments = summary.counts("Payment Method").sort_values(ascending=False)
+    bookings = summary.total("bookings")
+    customer = int(summary.total("customer_cancelled"))
+    rating_dist = summary.counts("Customer Rating").sort_index()
+    by_vehicle = summary.average_rating_by_vehicle()
+    revenue = summary.daily("revenue").rename_axis("Date").reset_index(name="Booking Value")
+    return {
+        "booking_status_pie": lambda: px.pie(
+            names=status.index, values=status.values, title="Booking Status Breakdown",
+            hole=0.4, labels={"names": "Booking Status"}),
+        "rides_over_time": lambda: px.line(
+            monthly, x="Month", y="Bookings", title="Ride Volume Over Time", markers=True),
+        "vehicle_type_bar": lambda: px.bar(
+            x=vehicles.index, y=vehicles.values, title="Bookings by Vehicle Type",
+            labels={"x": "Vehicle Type", "y": "Bookings"}),
+        "payment_method_bar": lambda: px.bar(
+            x=payments.index, y=payments.values, title="Payment Method Distribution",
+            labels={"x": "Payment Method", "y": "Count"}),
+        "cancellation_pie": lambda: px.pie(
+            values=[bookings - customer, customer], names=["Completed", "Cancelled by Customer"],
+            title="Cancelled Rides by Customers", color_discrete_sequence=["#4CAF50", "#FF6B6B"]),
+        "rating_distribution_bar": lambda: px.bar(
+            x=rating_dist.index, y=rating_dist.values, title="Rating Distribution",
+            labels={"x": "Rating", "y": "Count"}, color_discrete_sequence=["#2196F3"]),
+        "ratings_by_vehicle_bar": lambda: px.bar(
+            x=by_vehicle.index, y=by_vehicle.values, title="Average Ratings by Vehicle Type",
+            labels={"x": "Vehicle Type", "y": "Customer Rating"}, color_discrete_sequence=["#4CAF50"]),
+        "revenue_over_time": lambda: px.line(
+            revenue, x="Date", y="Booking Value", title="Revenue Over Time", markers=True,
+            color_discrete_sequence=["#FF9800"]),
+    }
+
+
+def lean_figures(summary):
+    bookings = summary.total("bookings")
+    customer = int(summary.total("customer_cancelled"))
+    return {
+        "booking_status_pie": lambda: charts.booking_status_pie(summary.counts("Booking Status")),
+        "rides_over_time": lambda: charts.rides_over_time(summary.over_time("bookings", "month")),
+        "vehicle_type_bar": lambda: charts.vehicle_type_bar(summary.counts("Vehicle Type")),
+        "payment_method_bar": lambda: charts.payment_method_bar(summary.counts("Payment Method")),
+        "cancellation_pie": lambda: charts.cancellation_pie(
+            bookings - customer, customer, "Cancelled by Customer",
+            title="Cancelled Rides by Customers", colors=["#4CAF50", "#FF6B6B"]),
+        "rating_distribution_bar": lambda: charts.rating_distribution_bar(
+            summary.counts("Customer Rating").sort_index()),
+        "ratings_by_vehicle_bar": lambda: charts.ratings_by_vehicle_bar(summary.average_rating_by_vehicle()),
+        "revenue_over_time": lambda: charts.revenue_over_time(summary.daily("revenue")),
+    }
+
+
+def measure(build, repeat):
+    """Best-of-repeat milliseconds to build and serialize, and payload bytes."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        payload = to_json_plotly(build())
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, len(payload)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--csv", default=DATA_PATH)
+    parser.add_argument("--start", default="2024-01-01")
+    parser.add_argument("--end", default="2024-12-31")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    data = Dataset(args.csv).load()
+    summary = data.summary(args.start, args.end)
+    express = express_figures(summary)
+    lean = lean_figures(summary)
+
+    print(f"{len(data.df):,} rows, {args.start} to {args.end}, best of {args.repeat}\n")
+    print(f"{'chart':<26} {'express ms':>11} {'lean ms':>9} {'express bytes':>14} {'lean bytes':>11}")
+    totals = [0, 0, 0, 0]
+    for name in express:
+        ms_px, bytes_px = measure(express[name], args.repeat)
+        ms_lean, bytes_lean = measure(lean[name], args.repeat)
+        for i, value in enumerate((ms_px, ms_lean, bytes_px, bytes_lean)):
+            totals[i] += value
+        print(f"{name:<26} {ms_px:>11.2f} {ms_lean:>9.2f} {bytes_px:>14,} {bytes_lean:>11,}")
+    print(f"{'total':<26} {totals[0]:>11.2f} {totals[1]:>9.2f} {totals[2]:>14,} {totals[3]:>11,}")
+
+
+if __name__ == "__main__":
+    main()
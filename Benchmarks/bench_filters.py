@@ -0,0 +1,104 @@
+"""Benchmark: cross-filtered row selection with row-id indexes vs. boolean masks.
+
+Each size's synthetic CSV is loaded in a fresh process, as in
+Benchmarks.suite. The per-value row-id indexes of the filter columns are
+built (Utils.query.FrameIndex), and conjunctions of one to three filters
+over a day, a month and the year are selected three ways:
+  - masks: one boolean mask per condition over the whole frame, as a
+    straightforward implementation would;
+  - slice + masks: the date range as a binary-searched slice, then masks
+    over its rows (filter_data without an index);
+  - index: the most selective filter's row ids in the range, checked
+    against the other filters (filter_data with the index).
+All three are checked to return the same rows. Run from the project root:
+
+    python -m Benchmarks.bench_filters [--sizes 100K 1M 10M] [--repeat 5]
+
+With less than 8 GB of memory, set UBER_LOAD_COLUMNS=pages for 10M rows.
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from Benchmarks import synthetic
+from Benchmarks.suite import run_child, timed
+
+RANGES = {
+    "day": ("2024-06-15", "2024-06-15 23:59:59"),
+    "month": ("2024-06-01", "2024-06-30"),
+    "year": ("2024-01-01", "2024-12-31"),
+}
+FILTERS = {
+    "Completed": {"Booking Status": ["Completed"]},
+    "Bike": {"Vehicle Type": ["Bike"]},
+    "Bike, UPI": {"Vehicle Type": ["Bike"], "Payment Method": ["UPI"]},
+    "Bike|Auto, UPI|Cash, Completed": {"Vehicle Type": ["Bike", "Auto"], "Payment Method": ["UPI", "Cash"],
+                                       "Booking Status": ["Completed"]},
+    "Bike, Cancelled by Driver": {"Vehicle Type": ["Bike"], "Booking Status": ["Cancelled by Driver"]},
+}
+
+
+def masked(df, start, end, filters):
+    """Every condition as a boolean mask over the whole frame."""
+    mask = (df["Datetime"] >= start).to_numpy() & (df["Datetime"] <= end).to_numpy()
+    for col, values in filters:
+        mask &= df[col].isin(values).to_numpy()
+    return df[mask]
+
+
+def run_size(args):
+    import pandas as pd
+
+    from Utils.preprocessing import filter_data, load_data
+    from Utils.query import FrameIndex, normalize
+
+    df = load_data(args.csv)
+    started = time.perf_counter()
+    index = FrameIndex(df)
+    results = {"rows": len(df), "build": time.perf_counter() - started,
+               "bytes": sum(c.order.nbytes + c.offsets.nbytes for c in index.columns.values()), "cases": []}
+    for range_name, (start, end) in RANGES.items():
+        for name, spec in FILTERS.items():
+            filters = normalize(spec)
+            selected = filter_data(df, start, end, filters, index)
+            reference = masked(df, pd.Timestamp(start), pd.Timestamp(end), filters)
+            assert np.array_equal(selected["Booking ID"].to_numpy(), reference["Booking ID"].to_numpy()), name
+            results["cases"].append({
+                "range": range_name, "filters": name, "selected": len(selected),
+                "masks": timed(args.repeat, lambda: masked(df, pd.Timestamp(start), pd.Timestamp(end), filters))[1],
+                "slice": timed(args.repeat, lambda: filter_data(df, start, end, filters))[1],
+                "index": timed(args.repeat, lambda: filter_data(df, start, end, filters, index))[1],
+            })
+    print(json.dumps(results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=["100K", "1M", "10M"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csv", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.csv:
+        return run_size(args)
+
+    print(f"median of {args.repeat} runs, milliseconds\n")
+    for size in args.sizes:
+        csv = synthetic.ensure(synthetic.parse_rows(size), args.seed)
+        results = run_child("Benchmarks.bench_filters", "--csv", csv, "--repeat", str(args.repeat))
+        print(f"{size}: {results['rows']:,} rows, indexes built in {results['build'] * 1000:.0f} ms "
+              f"({results['bytes'] / 2**20:.1f} MiB)")
+        print(f"{'range':<6} {'filters':<32} {'selected':>10} {'masks':>9} {'slice+masks':>12} {'index':>9} "
+              f"{'speedup':>8}")
+        for case in results["cases"]:
+            print(f"{case['range']:<6} {case['filters']:<32} {case['selected']:>10,} {case['masks'] * 1000:>9.2f} "
+                  f"{case['slice'] * 1000:>12.2f} {case['index'] * 1000:>9.2f} "
+                  f"{case['slice'] / case['index']:>7.1f}x")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Startup benchmark: cold CSV parse vs. warm Parquet cache load.
+
+Run from the project root:
+
+    python -m Benchmarks.bench_load_cache [--csv Data/uber_rides_cleaned.csv] [--repeat 3]
+"""
+import argparse
+import os
+import time
+
+from Utils.preprocessing import DATA_PATH, cache_path, load_data, parse_csv, write_cache
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--csv", default=DATA_PATH)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    cold, df = best_of(args.repeat, lambda: parse_csv(args.csv))
+    write_cache(args.csv, df)
+    warm, cached = best_of(args.repeat, lambda: load_data(args.csv))
+
+    target = cache_path(args.csv)
+    if not os.path.exists(target):
+        raise SystemExit("cache was not written (is pyarrow installed?)")
+
+    print(f"rows:             {len(df):,}")
+    print(f"csv size:         {os.path.getsize(args.csv) / 2**20:,.1f} MiB")
+    print(f"cache size:       {os.path.getsize(target) / 2**20:,.1f} MiB")
+    print(f"cold (csv parse): {cold:.3f} s")
+    print(f"warm (cache):     {warm:.3f} s")
+    print(f"speedup:          {cold / warm:.1f}x")
+    print(f"identical:        {cached.equals(df)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark: single-threaded parse_csv vs. chunked parallel load_csv_parallel.
+
+Each variant runs in a fresh subprocess so its wall time and peak RSS
+(the loader process and, for the pool, its largest worker) are measured in
+isolation. Run from the project root:
+
+    python -m Benchmarks.bench_parallel_load [--csv Data/uber_rides_cleaned.csv]
+        [--workers 4] [--chunk-mb 64]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+from Utils.parallel_load import PAGE_COLUMNS, load_csv_parallel
+from Utils.preprocessing import DATA_PATH, parse_csv
+
+
+def run_one(args):
+    usecols = PAGE_COLUMNS if args.pages_only else None
+    start = time.perf_counter()
+    if args.run == "serial":
+        df = parse_csv(args.csv, usecols=usecols)
+    else:
+        df = load_csv_parallel(args.csv, workers=args.workers,
+                               chunk_bytes=args.chunk_mb * 2**20, usecols=usecols)
+    seconds = time.perf_counter() - start
+    print(json.dumps({
+        "seconds": seconds,
+        "rows": len(df),
+        "columns": len(df.columns),
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "peak_worker_rss_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--csv", default=DATA_PATH)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-mb", type=int, default=64)
+    parser.add_argument("--pages-only", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--run", choices=["serial", "parallel"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        return run_one(args)
+
+    print(f"{os.path.getsize(args.csv) / 2**20:,.0f} MiB CSV, {args.workers} workers, "
+          f"{args.chunk_mb} MiB chunks\n")
+    print(f"{'loader':<28} {'seconds':>8} {'rows':>12} {'peak RSS':>10} {'peak worker':>12}")
+    variants = [
+        ("parse_csv", ["--run", "serial"]),
+        ("load_csv_parallel", ["--run", "parallel"]),
+        ("load_csv_parallel (pages)", ["--run", "parallel", "--pages-only"]),
+    ]
+    for name, extra in variants:
+        out = subprocess.run(
+            [sys.executable, "-m", "Benchmarks.bench_parallel_load", "--csv", args.csv,
+             "--workers", str(args.workers), "--chunk-mb", str(args.chunk_mb), *extra],
+            check=True, capture_output=True, text=True,
+        )
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        print(f"{name:<28} {result['seconds']:>8.2f} {result['rows']:>12,} "
+              f"{result['peak_rss_mb']:>7,.0f} MB {result['peak_worker_rss_mb']:>9,.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Benchmark: Ratings aggregates via pandas chains vs. the fused kernel.
+
+Each size's synthetic CSV is loaded in a fresh process, as in
+Benchmarks.suite, then:
+  - the per-day rating tables of the whole frame (what a load or an
+    ingested batch builds) are computed with the pandas groupbys the rollup
+    used before and with Utils.ratings.daily_tables, and compared;
+  - the Ratings KPIs of a month, a quarter and the year are computed from
+    the filtered rows with the pandas calls update_ratings used to make
+    (mean, a `== 5` filter, sum, value_counts, a groupby and a copy with
+    .dt.date for revenue), with the fused kernel, and from the rollup as
+    the page does now.
+Run from the project root:
+
+    python -m Benchmarks.bench_ratings [--sizes 1M 10M] [--repeat 5]
+
+With less than 8 GB of memory, set UBER_LOAD_COLUMNS=pages for 10M rows.
+"""
+import argparse
+import json
+
+import numpy as np
+import pandas as pd
+
+from Benchmarks import synthetic
+from Benchmarks.suite import run_child, timed
+
+RANGES = {
+    "month": ("2024-01-01", "2024-01-31"),
+    "quarter": ("2024-01-01", "2024-03-31"),
+    "year": ("2024-01-01", "2024-12-31"),
+}
+
+
+def pandas_tables(df, day):
+    """The rating tables as Rollup.from_frame grouped them before, for reference."""
+    totals = pd.DataFrame(index=df.index)
+    totals["revenue"] = df["Booking Value"].astype("float64")
+    rating = df["Customer Rating"].astype("float64")
+    totals["rating_sum"] = rating
+    totals["rating_count"] = rating.notna()
+    totals["five_star"] = rating == 5
+    tables = {"totals": totals.groupby(day.to_numpy()).sum()}
+    rating = rating.round(6)
+    tables["Customer Rating"] = df.groupby([day, rating]).size().unstack(fill_value=0)
+    by_vehicle = rating.groupby([day, df["Vehicle Type"]], observed=True)
+    tables["rating_sum_by_vehicle"] = by_vehicle.sum().unstack(fill_value=0)
+    tables["rating_count_by_vehicle"] = by_vehicle.count().unstack(fill_value=0)
+    return tables
+
+
+def pandas_kpis(filtered):
+    """The Ratings KPIs the way update_ratings computed them from raw rows."""
+    avg_rating = filtered["Customer Rating"].mean()
+    five_star_count = len(filtered[filtered["Customer Rating"] == 5])
+    total_revenue = filtered["Booking Value"].sum()
+    rating_dist = filtered["Customer Rating"].value_counts().sort_index()
+    by_vehicle = filtered.groupby("Vehicle Type", observed=True)["Customer Rating"].mean()
+    filtered_copy = filtered.copy()
+    filtered_copy["Date"] = filtered_copy["Datetime"].dt.date
+    revenue = filtered_copy.groupby("Date")["Booking Value"].sum()
+    return avg_rating, five_star_count, total_revenue, rating_dist, by_vehicle, revenue
+
+
+def fused_kpis(filtered):
+    from Utils.ratings import daily_tables
+
+    tables = daily_tables(filtered, filtered["Datetime"].dt.normalize())
+    totals = tables["totals"]
+    sums = tables["rating_sum_by_vehicle"].sum()
+    counts = tables["rating_count_by_vehicle"].sum()
+    return (totals["rating_sum"].sum() / totals["rating_count"].sum(), totals["five_star"].sum(),
+            totals["revenue"].sum(), tables["Customer Rating"].sum(), sums / counts.where(counts > 0),
+            totals["revenue"])
+
+
+def rollup_kpis(data, start, end):
+    summary = data.summary(start, end)
+    return (summary.average_rating(), summary.total("five_star"), summary.total("revenue"),
+            summary.counts("Customer Rating"), summary.average_rating_by_vehicle(), summary.daily("revenue"))
+
+
+def check(reference, fused):
+    for name, table in reference.items():
+        other = fused[name].reindex(index=table.index, columns=table.columns)
+        assert np.allclose(table.to_numpy(dtype="float64"), other.to_numpy(dtype="float64")), name
+
+
+def run_size(args):
+    from Utils.dataset import Dataset
+    from Utils.ratings import daily_tables
+
+    data = Dataset(args.csv).load()
+    df = data.df
+    day = df["Datetime"].dt.normalize().rename("Day")
+    check(pandas_tables(df, day), daily_tables(df, day))
+    results = {"rows": len(df), "tables": {
+        "pandas": timed(args.repeat, lambda: pandas_tables(df, day))[1],
+        "fused": timed(args.repeat, lambda: daily_tables(df, day))[1],
+    }}
+    for name, (start, end) in RANGES.items():
+        filtered = data.rows(start, end)
+        reference, fused = pandas_kpis(filtered), fused_kpis(filtered)
+        assert np.isclose(reference[0], fused[0]) and reference[1] == fused[1], name
+        results[name] = {
+            "rows": len(filtered),
+            "pandas": timed(args.repeat, lambda: pandas_kpis(filtered))[1],
+            "fused": timed(args.repeat, lambda: fused_kpis(filtered))[1],
+            "rollup": timed(args.repeat, lambda: rollup_kpis(data, start, end))[1],
+        }
+    print(json.dumps(results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=["1M", "10M"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csv", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.csv:
+        return run_size(args)
+
+    print(f"median of {args.repeat} runs, milliseconds\n")
+    print(f"{'size':<6} {'work':<20} {'rows':>11} {'pandas':>9} {'fused':>9} {'speedup':>8} {'rollup':>8}")
+    for size in args.sizes:
+        csv = synthetic.ensure(synthetic.parse_rows(size), args.seed)
+        results = run_child("Benchmarks.bench_ratings", "--csv", csv, "--repeat", str(args.repeat))
+        tables = results.pop("tables")
+        print(f"{size:<6} {'tables, all days':<20} {results.pop('rows'):>11,} {tables['pandas'] * 1000:>9.1f} "
+              f"{tables['fused'] * 1000:>9.1f} {tables['pandas'] / tables['fused']:>7.1f}x {'':>8}")
+        for name, r in results.items():
+            print(f"{size:<6} {'KPIs, ' + name:<20} {r['rows']:>11,} {r['pandas'] * 1000:>9.1f} "
+                  f"{r['fused'] * 1000:>9.1f} {r['pandas'] / r['fused']:>7.1f}x {r['rollup'] * 1000:>8.1f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Cold start benchmark: startup time and each page's first request.
+
+Every measurement runs in a fresh `python` process with the warm-up and the
+result cache off, once with the data read in a background thread while the
+app is built (the default) and once read up front (UBER_LOAD_ASYNC=0).
+Reports how long `import app` takes, when the data is ready, and per page
+the latency of its first request (sent as soon as the app is importable,
+so it may wait for the data, and again once the data is loaded, when only
+the page's own first-use costs remain) and of a second request. Run from
+the project root:
+
+    python -m Benchmarks.cold_start [--repeat 3]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from Benchmarks.concurrency import EXTRA_INPUTS, PAGES
+from Benchmarks.load_test import page_request
+from Layouts.layout import DEFAULT_END_DATE, DEFAULT_START_DATE, RAW_DATA_DEFAULT_END_DATE
+
+# Runs in the fresh process: argv[1] is the page, argv[2] its request body,
+# argv[3] "now" to send it right after the import instead of once loaded
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter() - started
+client = app.server.test_client()
+
+def request():
+    begin = time.perf_counter()
+    response = client.post("/_dash-update-component", data=sys.argv[2],
+                           content_type="application/json")
+    assert response.status_code == 200, response.status_code
+    return time.perf_counter() - begin
+
+if sys.argv[3] == "now":
+    first = request()
+    ready = time.perf_counter() - started - first
+else:
+    app.data.wait()
+    ready = time.perf_counter() - started
+    first = request()
+print(json.dumps({"import_s": imported, "ready_s": ready, "load_s": app.data.load_seconds,
+                  "first_s": first, "second_s": request()}))
+"""
+
+
+def measure(page, body, when, env):
+    out = subprocess.run([sys.executable, "-c", CHILD, page, body, when],
+                         check=True, capture_output=True, text=True, env=env)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def median(runs, key):
+    return statistics.median(run[key] for run in runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    bodies = {}
+    for page in PAGES:
+        end_date = RAW_DATA_DEFAULT_END_DATE if page == "raw-data" else DEFAULT_END_DATE
+        bodies[page] = page_request(page, DEFAULT_START_DATE, end_date, pages=PAGES,
+                                    extra_inputs=EXTRA_INPUTS.get(page, ())).decode()
+
+    print(f"median of {args.repeat} fresh processes, warm-up and result cache off\n")
+    for variant, load_async in (("async load", "1"), ("sync load", "0")):
+        env = dict(os.environ, UBER_WARMUP="off", UBER_RESULT_CACHE="off", UBER_BACKGROUND="0",
+                   UBER_LOAD_ASYNC=load_async)
+        env.pop("UBER_INGEST_PATH", None)
+        runs = {(page, when): [measure(page, body, when, env) for _ in range(args.repeat)]
+                for page, body in bodies.items() for when in ("now", "loaded")}
+        everything = [run for page_runs in runs.values() for run in page_runs]
+        print(f"{variant}: import app {median(everything, 'import_s'):.2f} s, data ready after "
+              f"{median(everything, 'ready_s'):.2f} s (reading it took {median(everything, 'load_s'):.2f} s)")
+        print(f"  {'page':<15} {'at import ms':>13} {'once loaded ms':>15} {'second ms':>10}")
+        for page in bodies:
+            print(f"  {page:<15} {median(runs[page, 'now'], 'first_s') * 1000:>13.1f} "
+                  f"{median(runs[page, 'loaded'], 'first_s') * 1000:>15.1f} "
+                  f"{median(runs[page, 'loaded'], 'second_s') * 1000:>10.1f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""Concurrency benchmark: many users browsing all pages, per serving mode.
+
+Starts gunicorn once per mode (sync workers, threaded gthread workers and
+the ASGI entry point under uvicorn workers) and lets a plain asyncio client
+simulate --users people who keep requesting pages over random date ranges
+for --duration seconds, each on its own keep-alive connection. A probe
+meanwhile fetches /metrics, a request with no computation behind it, to show
+whether cheap requests stay responsive while the pages compute. Reports
+requests per second and p50/p95/p99 latency per page. Run from the project
+root:
+
+    python -m Benchmarks.concurrency [--modes sync gthread asgi] [--users 32]
+        [--duration 20] [--workers 2] [--threads 32] [--cache off]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import pandas as pd
+
+from Benchmarks.load_test import PAGES, page_request, start_server
+
+PAGES = dict(PAGES, **{"raw-data": ("/raw-data", "rawdata-date-filter", [
+    "total-records.children", "raw-data-table.data", "raw-data-table.columns",
+    "raw-data-table.page_count", "raw-data-table.page_current"])})
+EXTRA_INPUTS = {"raw-data": [
+    ("raw-data-table.page_current", 0), ("raw-data-table.page_size", 20),
+    ("raw-data-table.sort_by", []), ("raw-data-table.filter_query", "")]}
+MODES = {
+    # mode -> (gunicorn target, worker class, threads per worker or None)
+    "sync": ("app:server", "sync", 1),
+    "gthread": ("app:server", "gthread", None),
+    "asgi": ("asgi:application", "uvicorn_worker.UvicornWorker", 1),
+}
+PROBE_INTERVAL = 0.1
+
+
+class Connection:
+    """Minimal HTTP/1.1 client connection, reopened when the server closes it."""
+
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body=b""):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        headers = {}
+        while (line := await self.reader.readline()) not in (b"\r\n", b""):
+            name, value = line.decode().split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+        if headers.get("transfer-encoding") == "chunked":
+            data = b""
+            while size := int((await self.reader.readline()).strip(), 16):
+                data += (await self.reader.readexactly(size + 2))[:-2]
+            await self.reader.readline()
+        else:
+            data = await self.reader.readexactly(int(headers.get("content-length", 0)))
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        return status, data
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+async def callback(connection, body, poll_interval):
+    """POST a callback request; background callbacks are polled until done."""
+    status, data = await connection.request("POST", "/_dash-update-component", body)
+    while status == 200 and data.startswith(b"{"):
+        reply = json.loads(data)
+        if "cacheKey" not in reply or "response" in reply:
+            break
+        await asyncio.sleep(poll_interval)
+        query = f"?cacheKey={reply['cacheKey']}&job={reply['job']}"
+        status, data = await connection.request("POST", "/_dash-update-component" + query, body)
+    return status
+
+
+def random_range(rng):
+    start = pd.Timestamp("2024-01-01") + pd.Timedelta(days=rng.randrange(365))
+    end = start + pd.Timedelta(days=rng.randrange(1, 120))
+    return start.strftime("%Y-%m-%d"), min(end, pd.Timestamp("2024-12-31")).strftime("%Y-%m-%d")
+
+
+async def user(index, args, deadline, latencies, errors):
+    rng = random.Random(args.seed * 10_000 + index)
+    connection = Connection(*args.bind.split(":"))
+    pages = list(PAGES)
+    try:
+        while time.perf_counter() < deadline:
+            page = pages[rng.randrange(len(pages))]
+            body = page_request(page, *random_range(rng), pages=PAGES, extra_inputs=EXTRA_INPUTS.get(page, ()))
+            start = time.perf_counter()
+            try:
+                status = await callback(connection, body, args.poll_ms / 1000)
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                connection.close()
+                status = None
+            if status == 200 or status == 204:
+                latencies[page].append(time.perf_counter() - start)
+            else:
+                errors[page] += 1
+    finally:
+        connection.close()
+
+
+async def probe(args, deadline, latencies):
+    connection = Connection(*args.bind.split(":"))
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                await connection.request("GET", "/metrics")
+                latencies.append(time.perf_counter() - start)
+            except (OSError, asyncio.IncompleteReadError):
+                connection.close()
+            await asyncio.sleep(PROBE_INTERVAL)
+    finally:
+        connection.close()
+
+
+async def drive(args):
+    latencies = {page: [] for page in PAGES}
+    errors = dict.fromkeys(PAGES, 0)
+    probes = []
+    deadline = time.perf_counter() + args.duration
+    await asyncio.gather(
+        probe(args, deadline, probes),
+        *(user(i, args, deadline, latencies, errors) for i in range(args.users)),
+    )
+    return latencies, errors, probes
+
+
+def percentile(values, q):
+    return values[min(int(q * len(values)), len(values) - 1)] * 1000 if values else float("nan")
+
+
+def summarize(latencies, duration, errors=0):
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / duration,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else float("nan"),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+    }
+
+
+def run_mode(args, mode):
+    target, worker_class, threads = MODES[mode]
+    threads = threads or args.threads
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = dict(
+            os.environ,
+            GUNICORN_WORKERS=str(args.workers),
+            GUNICORN_BIND=args.bind,
+            GUNICORN_THREADS=str(threads),
+            GUNICORN_WORKER_CLASS=worker_class,
+            UBER_WARMUP="off",
+            UBER_RESULT_CACHE=args.cache,
+            UBER_RESULT_CACHE_DIR=cache_dir,
+            UBER_BACKGROUND="1" if args.background else "0",
+            UBER_BACKGROUND_DIR=os.path.join(cache_dir, "background"),
+        )
+        proc = start_server(args.workers, threads, env, target)
+        try:
+            latencies, errors, probes = asyncio.run(drive(args))
+        finally:
+            proc.terminate()
+            proc.wait()
+
+    report = {page: summarize(values, args.duration, errors[page]) for page, values in latencies.items()}
+    report["all pages"] = summarize([v for values in latencies.values() for v in values],
+                                    args.duration, sum(errors.values()))
+    report["/metrics probe"] = summarize(probes, args.duration)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    parser.add_argument("--users", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20, help="seconds per mode")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=32, help="threads per gthread worker")
+    parser.add_argument("--cache", choices=["off", "memory", "disk"], default="off",
+                        help="result cache; off makes every request compute")
+    parser.add_argument("--background", action="store_true",
+                        help="run the heavy pages as background callbacks (polled)")
+    parser.add_argument("--poll-ms", type=int, default=250)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bind", default="127.0.0.1:8053")
+    args = parser.parse_args()
+
+    print(f"{args.users} users for {args.duration:.0f}s per mode, {args.workers} workers, "
+          f"{args.cache} result cache, compute pool {os.environ.get('UBER_COMPUTE_THREADS') or 'CPU count'}\n")
+    print(f"{'mode':<8} {'page':<15} {'requests':>9} {'errors':>7} {'req/s':>7} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for mode in args.modes:
+        for page, r in run_mode(args, mode).items():
+            print(f"{mode:<8} {page:<15} {r['requests']:>9} {r['errors']:>7} {r['rps']:>7.1f} "
+                  f"{r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""Load test: a storm of identical date-range requests, with and without coalescing.
+
+Starts `gunicorn app:server` once per variant (warm-up off, fresh result
+cache), then runs rounds in which every simulated user asks for the same
+new date range on each page at the same moment, as when many people open
+the default view after a deploy or a data update. Reports request latency
+and the server's CPU time and peak CPU use (Linux only). Run from the
+project root:
+
+    python -m Benchmarks.load_test [--users 20] [--rounds 5] [--workers 4]
+        [--threads 1] [--cache disk]
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+BOOTED = re.compile(r"Worker (\d+) booted in ([\d.]+)s")
+TICKS = os.sysconf("SC_CLK_TCK")
+
+PAGES = {
+    "overview": ("/", "date-filter", [
+        "total-bookings.children", "booking-status-pie.figure", "rides-over-time.figure",
+        "vehicle-type-bar.figure", "payment-method-bar.figure"]),
+    "cancellations": ("/cancellations", "cancellation-date-filter", [
+        "cancellation-total-bookings.children", "total-cancellations.children",
+        "cancellation-rate.children", "customer-cancellations-kpi.children",
+        "driver-cancellations-kpi.children", "cancelled-by-customers-pie.figure",
+        "cancelled-by-drivers-pie.figure", "cancellation-reasons.figure",
+        "cancellations-over-time.figure", "cancellations-by-vehicle.figure",
+        "cancellations-by-hour.figure"]),
+    "ratings": ("/ratings", "ratings-date-filter", [
+        "avg-rating.children", "five-star-count.children", "total-revenue.children",
+        "rating-distribution.figure", "ratings-by-vehicle-type.figure",
+        "revenue-over-time.figure", "top-customers-table.data", "top-customers-table.columns"]),
+}
+
+
+def _prop(spec):
+    component, prop = spec.rsplit(".", 1)
+    return {"id": component, "property": prop}
+
+
+def page_request(page, start_date, end_date, pages=PAGES, extra_inputs=(), filters=None):
+    """JSON body of the Dash callback request a page sends for a date range.
+
+    filters is the filter-state store's {column: [values]} (None: unfiltered).
+    """
+    pathname, picker, outputs = pages[page]
+    return json.dumps({
+        "output": ".." + "...".join(outputs) + "..",
+        "outputs": [_prop(o) for o in outputs],
+        "inputs": [
+            dict(_prop(f"{picker}.start_date"), value=start_date),
+            dict(_prop(f"{picker}.end_date"), value=end_date),
+            dict(_prop("url.pathname"), value=pathname),
+            dict(_prop("filter-state.data"), value=filters),
+        ] + [dict(_prop(spec), value=value) for spec, value in extra_inputs],
+        "changedPropIds": [f"{picker}.start_date"],
+        "state": [],
+    }).encode()
+
+
+def post(url, body):
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=300) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def cpu_seconds(pid):
+    """User + system CPU time of a process and all of its descendants."""
+    total = 0.0
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        total += (int(fields[11]) + int(fields[12])) / TICKS
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            children = [int(c) for c in f.read().split()]
+    except (OSError, IndexError):
+        return total
+    return total + sum(cpu_seconds(child) for child in children)
+
+
+class CpuSampler(threading.Thread):
+    """Samples a process tree's CPU use to find its peak."""
+
+    def __init__(self, pid, interval=0.1):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.peak = 0.0
+        self.stopped = threading.Event()
+
+    def run(self):
+        last, last_time = cpu_seconds(self.pid), time.monotonic()
+        while not self.stopped.wait(self.interval):
+            now, now_time = cpu_seconds(self.pid), time.monotonic()
+            self.peak = max(self.peak, (now - last) / (now_time - last_time) * 100)
+            last, last_time = now, now_time
+
+
+def start_server(workers, threads, env, target="app:server"):
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py",
+         "--threads", str(threads), "--timeout", "300", target],
+        env=env, stderr=subprocess.PIPE, text=True,
+    )
+    booted = 0
+    for line in proc.stderr:
+        if BOOTED.search(line):
+            booted += 1
+            if booted == workers:
+                break
+    else:
+        raise SystemExit("gunicorn exited before its workers booted")
+    # Keep draining the log so the server never blocks on a full pipe
+    threading.Thread(target=lambda: proc.stderr.read(), daemon=True).start()
+    return proc
+
+
+def run_variant(args, coalesce):
+    url = f"http://{args.bind}/_dash-update-component"
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = dict(
+            os.environ,
+            GUNICORN_WORKERS=str(args.workers),
+            GUNICORN_BIND=args.bind,
+            UBER_WARMUP="off",
+            UBER_RESULT_CACHE=args.cache,
+            UBER_RESULT_CACHE_DIR=cache_dir,
+            UBER_COALESCE="1" if coalesce else "0",
+        )
+        proc = start_server(args.workers, args.threads, env)
+        try:
+            sampler = CpuSampler(proc.pid)
+            cpu_before = cpu_seconds(proc.pid)
+            sampler.start()
+            latencies = []
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.users) as pool:
+                for round_index in range(args.rounds):
+                    # A range nobody asked for yet, so each round starts cold
+                    start_date = (pd.Timestamp("2024-01-01") + pd.Timedelta(days=round_index)).strftime("%Y-%m-%d")
+                    for page in PAGES:
+                        body = page_request(page, start_date, "2024-12-31")
+                        latencies += pool.map(lambda _: post(url, body), range(args.users))
+            wall = time.perf_counter() - started
+            sampler.stopped.set()
+            sampler.join()
+            cpu = cpu_seconds(proc.pid) - cpu_before
+        finally:
+            proc.terminate()
+            proc.wait()
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "wall_s": wall,
+        "cpu_s": cpu,
+        "peak_cpu_pct": sampler.peak,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--cache", choices=["memory", "disk"], default="disk",
+                        help="disk lets workers coalesce with each other")
+    parser.add_argument("--bind", default="127.0.0.1:8052")
+    args = parser.parse_args()
+
+    print(f"{args.users} users x {len(PAGES)} pages x {args.rounds} rounds, {args.workers} workers "
+          f"x {args.threads} threads, {args.cache} cache\n")
+    print(f"{'variant':<14} {'requests':>9} {'wall s':>8} {'cpu s':>8} {'peak cpu':>9} "
+          f"{'p50 ms':>8} {'p95 ms':>8}")
+    for name, coalesce in (("independent", False), ("coalesced", True)):
+        r = run_variant(args, coalesce)
+        print(f"{name:<14} {r['requests']:>9} {r['wall_s']:>8.2f} {r['cpu_s']:>8.2f} "
+              f"{r['peak_cpu_pct']:>8.0f}% {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
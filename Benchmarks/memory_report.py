@@ -0,0 +1,38 @@
+"""Per-column memory of the ride frame, before and after the dtype schema.
+
+Run from the project root:
+
+    python -m Benchmarks.memory_report [--csv Data/uber_rides_cleaned.csv]
+"""
+import argparse
+
+import pandas as pd
+
+from Utils.preprocessing import DATA_PATH, memory_report, parse_csv
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--csv", default=DATA_PATH)
+    args = parser.parse_args()
+
+    before = memory_report(parse_csv(args.csv, schema=False))
+    after = memory_report(parse_csv(args.csv))
+
+    report = pd.DataFrame({
+        "dtype (before)": before["dtype"],
+        "MiB (before)": before["MiB"],
+        "dtype (after)": after["dtype"],
+        "MiB (after)": after["MiB"],
+    }).sort_values("MiB (before)", ascending=False)
+
+    with pd.option_context("display.width", 160, "display.max_columns", None, "display.float_format", "{:,.2f}".format):
+        print(report)
+    total_before = before["MiB"].sum()
+    total_after = after["MiB"].sum()
+    print(f"\ntotal: {total_before:,.1f} MiB -> {total_after:,.1f} MiB "
+          f"({total_before / total_after:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""Benchmark suite: loading, filtering, charts and page bodies on synthetic data.
+
+For each size a synthetic CSV is generated once (see Benchmarks.synthetic)
+and measured in a fresh subprocess with the result cache off. Results are
+written as JSON tagged with the commit, so two runs can be compared. Run
+from the project root:
+
+    python -m Benchmarks.suite [--sizes 100K 1M 10M 50M] [--repeat 5]
+        [--out Benchmarks/results/<commit>.json]
+    python -m Benchmarks.suite --compare OLD.json NEW.json [--threshold 1.2]
+"""
+import argparse
+import datetime
+import inspect
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from Benchmarks import synthetic
+
+RESULTS_DIR = "Benchmarks/results"
+RANGES = {
+    "day": ("2024-06-15", "2024-06-15 23:59:59"),
+    "month": ("2024-06-01", "2024-06-30"),
+    "quarter": ("2024-04-01", "2024-06-30"),
+    "year": ("2024-01-01", "2024-12-31"),
+}
+
+
+def timed(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), statistics.median(timings)
+
+
+def run_child(module, *args, env=None):
+    """Run `python -m module *args` and return the JSON it printed last.
+
+    Each size is measured in a fresh process like this, so one size's
+    memory and caches do not carry over into the next.
+    """
+    out = subprocess.run([sys.executable, "-m", module, *args],
+                         check=True, capture_output=True, text=True, env=env)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def run_size(path, repeat):
+    """Every measurement for one CSV; runs inside the per-size subprocess."""
+    from Utils.preprocessing import filter_data, load_data
+
+    results = []
+
+    def bench(group, name, fn, range_name=None, runs=repeat):
+        best, median = timed(runs, fn)
+        results.append({"group": group, "name": name, "range": range_name,
+                        "best_s": best, "median_s": median, "repeat": runs})
+
+    # A cold parse is slow on the large sizes, so it runs once
+    bench("load", "load_data (csv)", lambda: load_data(path, use_cache=False), runs=1)
+    load_data(path)
+    bench("load", "load_data (cache)", lambda: load_data(path))
+
+    # Imported only now: the dataset follows UBER_DATA_PATH
+    from Benchmarks.bench_figures import lean_figures
+    from Callbacks import callbacks
+    from Figures.charts import total_bookings
+
+    callbacks.data.load()
+    df = callbacks.data.df
+    for range_name, (start, end) in RANGES.items():
+        bench("filter", "filter_data", lambda: filter_data(df, start, end), range_name)
+
+    # Cross-filters on two dimensions, resolved through the row-id indexes
+    from Utils.query import FrameIndex, normalize
+    index = FrameIndex(df)
+    filters = normalize({"Vehicle Type": ["Bike"], "Payment Method": ["UPI"]})
+    for range_name, (start, end) in RANGES.items():
+        bench("filter", "filter_data (2 filters)", lambda: filter_data(df, start, end, filters, index), range_name)
+
+    # Building the per-day tables, as on load and for every ingested batch
+    from Utils import ratings
+    from Utils.rollup import Rollup
+    day = df["Datetime"].dt.normalize().rename("Day")
+    bench("rollup", "Rollup.from_frame", lambda: Rollup.from_frame(df))
+    bench("rollup", "ratings.daily_tables", lambda: ratings.daily_tables(df, day))
+
+    summary = callbacks.data.summary(*RANGES["year"])
+    bench("charts", "total_bookings", lambda: total_bookings(summary.total("bookings")), "year")
+    for name, build in lean_figures(summary).items():
+        bench("charts", name, build, "year")
+
+    # Top 5 customers: hashing the range's IDs vs. the per-day top-k counts
+    data = callbacks.data
+    for range_name in ("month", "year"):
+        start, end = RANGES[range_name]
+        bench("topk", "value_counts",
+              lambda: data.rows(start, end)["Customer ID"].value_counts().head(5), range_name)
+        for mode in ("exact", "approx"):
+            bench("topk", mode, lambda: data.top_customers(start, end, 5, mode), range_name)
+
+    # The bare page bodies: no result cache, no compute pool
+    pages = {
+        "overall_analysis": inspect.unwrap(callbacks.page("overview").overall_analysis),
+        "cancellations": inspect.unwrap(callbacks.page("cancellations").cancellations),
+        "ratings": inspect.unwrap(callbacks.page("ratings").ratings),
+        "raw_data": inspect.unwrap(callbacks.page("raw_data").raw_data),
+    }
+    for range_name in ("month", "year"):
+        for name, page in pages.items():
+            bench("pages", name, lambda: page(*RANGES[range_name]), range_name)
+
+    return {"rows": len(df), "csv_bytes": os.path.getsize(path), "results": results}
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], check=True,
+                                capture_output=True, text=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                    check=True, capture_output=True, text=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, dirty
+
+
+def environment():
+    import numpy
+    import pandas
+    return {
+        "python": platform.python_version(),
+        "pandas": pandas.__version__,
+        "numpy": numpy.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(old_path, new_path, threshold):
+    """Print new/old best-time ratios; returns the number of regressions."""
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+
+    def index(run):
+        return {(size["rows"], r["group"], r["name"], r["range"]): r["best_s"]
+                for size in run["sizes"] for r in size["results"]}
+
+    before, after = index(old), index(new)
+    print(f"{old.get('commit') or old_path} -> {new.get('commit') or new_path}\n")
+    print(f"{'rows':>12} {'benchmark':<40} {'old ms':>10} {'new ms':>10} {'ratio':>7}")
+    regressions = 0
+    for key in sorted(before.keys() & after.keys(), key=lambda k: (k[0], k[1], k[2], k[3] or "")):
+        rows, group, name, range_name = key
+        ratio = after[key] / before[key] if before[key] else float("inf")
+        flag = ""
+        if ratio > threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        label = f"{group}/{name}" + (f" [{range_name}]" if range_name else "")
+        print(f"{rows:>12,} {label:<40} {before[key] * 1000:>10.2f} {after[key] * 1000:>10.2f} "
+              f"{ratio:>6.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=["100K", "1M"],
+                        help="100K, 1M, 10M, 50M or any row count")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="new/old ratio reported as a regression")
+    parser.add_argument("--run-size", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare, args.threshold) else 0)
+    if args.run_size:
+        print(json.dumps(run_size(args.run_size, args.repeat)))
+        return
+
+    commit, dirty = git_commit()
+    run = {
+        "commit": commit,
+        "dirty": dirty,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "environment": environment(),
+        "sizes": [],
+    }
+    for size in args.sizes:
+        rows = synthetic.parse_rows(size)
+        path = synthetic.ensure(rows, args.seed)
+        print(f"{rows:,} rows ({path})", flush=True)
+        env = dict(os.environ, UBER_DATA_PATH=path, UBER_RESULT_CACHE="off")
+        env.pop("UBER_INGEST_PATH", None)
+        result = run_child("Benchmarks.suite", "--run-size", path, "--repeat", str(args.repeat), env=env)
+        run["sizes"].append(result)
+        for r in result["results"]:
+            label = f"{r['group']}/{r['name']}" + (f" [{r['range']}]" if r["range"] else "")
+            print(f"  {label:<40} {r['best_s'] * 1000:>10.2f} ms")
+
+    out_path = args.out or os.path.join(RESULTS_DIR, f"{(commit or 'nocommit')[:10]}.json")
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    with open(out_path, "w") as f:
+        json.dump(run, f, indent=2)
+    print(f"\nResults written to {out_path}")
+
+
+if __name__ == "__main__":
+    main()
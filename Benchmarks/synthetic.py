@@ -0,0 +1,139 @@
+"""Synthetic ride data with the same columns and value domains as the real CSV.
+
+Rows are written in fixed-size chunks, each from its own seeded generator,
+so a given (rows, seed) always produces the same file and memory use stays
+flat however many rows are requested. Run from the project root:
+
+    python -m Benchmarks.synthetic --rows 1M [--out Data/synthetic/rides_1M.csv]
+        [--seed 0]
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+SIZES = {"100K": 100_000, "1M": 1_000_000, "10M": 10_000_000, "50M": 50_000_000}
+SYNTHETIC_DIR = "Data/synthetic"
+CHUNK_ROWS = 500_000
+YEAR = 2024
+
+STATUSES = ["Completed", "Cancelled by Driver", "No Driver Found", "Cancelled by Customer", "Incomplete"]
+STATUS_WEIGHTS = [0.62, 0.18, 0.07, 0.07, 0.06]
+VEHICLE_TYPES = ["Auto", "Go Mini", "Go Sedan", "Bike", "Premier Sedan", "eBike", "Uber XL"]
+PAYMENT_METHODS = ["UPI", "Cash", "Uber Wallet", "Credit Card", "Debit Card"]
+LOCATIONS = [f"Location {i}" for i in range(176)]
+CUSTOMER_REASONS = [
+    "Wrong Address",
+    "Change of plans",
+    "Driver is not moving towards pickup location",
+    "Driver asked to cancel",
+    "AC is not working",
+]
+DRIVER_REASONS = [
+    "Customer related issue",
+    "The customer was coughing/sick",
+    "Personal & Car related issues",
+    "More than permitted people in there",
+]
+INCOMPLETE_REASONS = ["Customer Demand", "Vehicle Breakdown", "Other Issue"]
+
+
+def default_path(rows, seed=0):
+    return os.path.join(SYNTHETIC_DIR, f"rides_{rows}_seed{seed}.csv")
+
+
+def parse_rows(text):
+    """Row count from "1M", "250K" or a plain integer."""
+    text = text.upper()
+    scale = {"K": 1_000, "M": 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip("KM")) * scale)
+
+
+def _pick(rng, values, mask):
+    # values[i] where mask holds, missing elsewhere
+    return np.where(mask, np.asarray(values, dtype=object)[rng.integers(0, len(values), len(mask))], None)
+
+
+def make_chunk(rng, start, rows, customers):
+    """One chunk of rows: booking IDs start at `start`."""
+    start_ts = pd.Timestamp(f"{YEAR}-01-01").value // 10**9
+    seconds = 366 * 86_400 if YEAR % 4 == 0 else 365 * 86_400
+    times = pd.to_datetime(start_ts + rng.integers(0, seconds, rows), unit="s")
+
+    status = np.asarray(STATUSES, dtype=object)[rng.choice(len(STATUSES), rows, p=STATUS_WEIGHTS)]
+    completed = status == "Completed"
+    by_customer = status == "Cancelled by Customer"
+    by_driver = status == "Cancelled by Driver"
+    incomplete = status == "Incomplete"
+    rode = completed | incomplete
+    assigned = rode | by_customer | by_driver
+
+    # A few frequent riders on top of a long tail, like the real data
+    frequent = rng.random(rows) < 0.1
+    customer = np.where(frequent, rng.integers(0, max(customers // 100, 1), rows),
+                        rng.integers(0, customers, rows))
+
+    def measure(mask, low, high, decimals=1):
+        return np.where(mask, np.round(rng.uniform(low, high, rows), decimals), np.nan)
+
+    return pd.DataFrame({
+        "Date_Time": times.strftime("%Y-%m-%d %H:%M:%S"),
+        "Booking ID": [f"CNR{i:08d}" for i in range(start, start + rows)],
+        "Booking Status": status,
+        "Customer ID": [f"CID{c:08d}" for c in customer],
+        "Vehicle Type": _pick(rng, VEHICLE_TYPES, np.ones(rows, bool)),
+        "Pickup Location": _pick(rng, LOCATIONS, np.ones(rows, bool)),
+        "Drop Location": _pick(rng, LOCATIONS, np.ones(rows, bool)),
+        "Avg VTAT": measure(assigned, 2, 20),
+        "Avg CTAT": measure(rode, 10, 45),
+        "Cancelled Rides by Customer": by_customer.astype(int),
+        "Reason for cancelling by Customer": _pick(rng, CUSTOMER_REASONS, by_customer),
+        "Cancelled Rides by Driver": by_driver.astype(int),
+        "Driver Cancellation Reason": _pick(rng, DRIVER_REASONS, by_driver),
+        "Incomplete Rides": incomplete.astype(int),
+        "Incomplete Rides Reason": _pick(rng, INCOMPLETE_REASONS, incomplete),
+        "Booking Value": np.where(rode, rng.integers(50, 4_000, rows), np.nan),
+        "Ride Distance": measure(rode, 1, 50, 2),
+        "Driver Ratings": measure(completed, 3, 5),
+        "Customer Rating": measure(completed, 3, 5),
+        "Payment Method": _pick(rng, PAYMENT_METHODS, rode),
+    })
+
+
+def generate(path, rows, seed=0, chunk_rows=CHUNK_ROWS):
+    """Write `rows` synthetic rides to `path` (unsorted, like the source)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    customers = max(rows // 2, 1)
+    tmp = path + ".tmp"
+    with open(tmp, "w", newline="") as f:
+        for index, start in enumerate(range(0, rows, chunk_rows)):
+            rng = np.random.default_rng([seed, index])
+            chunk = make_chunk(rng, start, min(chunk_rows, rows - start), customers)
+            chunk.to_csv(f, index=False, header=index == 0)
+    os.replace(tmp, path)
+    return path
+
+
+def ensure(rows, seed=0, path=None):
+    """Path of the synthetic file for (rows, seed), generating it if missing."""
+    path = path or default_path(rows, seed)
+    if not os.path.exists(path):
+        generate(path, rows, seed)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", default="100K", help="100K, 1M, 10M, 50M or any count")
+    parser.add_argument("--out")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rows = parse_rows(args.rows)
+    path = generate(args.out or default_path(rows, args.seed), rows, args.seed)
+    print(f"{rows:,} rows -> {path} ({os.path.getsize(path) / 2**20:,.1f} MiB)")
+
+
+if __name__ == "__main__":
+    main()
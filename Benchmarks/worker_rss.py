@@ -0,0 +1,81 @@
+"""Per-worker memory and boot time of the app under gunicorn (Linux only).
+
+Starts `gunicorn app:server` with gunicorn.conf.py, waits until every worker
+has booted, then reads /proc/<pid>/smaps_rollup of each worker. Private_Dirty
+is the memory a worker does not share with the master; with preloading it
+should stay flat however large the dataset is.
+
+Run from the project root:
+
+    python -m Benchmarks.worker_rss [--workers 4] [--no-preload]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+BOOTED = re.compile(r"Worker (\d+) booted in ([\d.]+)s")
+FIELDS = ["Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty"]
+
+
+def smaps_rollup(pid):
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            if name in FIELDS:
+                values[name] = int(rest.split()[0]) / 1024
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--bind", default="127.0.0.1:8051")
+    parser.add_argument("--no-preload", action="store_true")
+    parser.add_argument("--timeout", type=float, default=600)
+    args = parser.parse_args()
+
+    env = dict(
+        os.environ,
+        GUNICORN_WORKERS=str(args.workers),
+        GUNICORN_BIND=args.bind,
+        GUNICORN_PRELOAD="0" if args.no_preload else "1",
+    )
+    started = time.monotonic()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app:server"],
+        env=env,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+
+    boots = {}
+    try:
+        for line in proc.stderr:
+            match = BOOTED.search(line)
+            if match:
+                boots[int(match.group(1))] = float(match.group(2))
+                if len(boots) == args.workers:
+                    break
+            if time.monotonic() - started > args.timeout:
+                raise SystemExit("timed out waiting for workers")
+        ready = time.monotonic() - started
+
+        master = smaps_rollup(proc.pid)
+        print(f"mode: {'no preload' if args.no_preload else 'preload'}, "
+              f"{args.workers} workers, all ready after {ready:.2f}s\n")
+        print(f"{'pid':>8} {'boot s':>7} " + " ".join(f"{f:>14}" for f in FIELDS))
+        print(f"{'master':>8} {'':>7} " + " ".join(f"{master[f]:>11.1f} MB" for f in FIELDS))
+        for pid, boot in sorted(boots.items()):
+            mem = smaps_rollup(pid)
+            print(f"{pid:>8} {boot:>7.3f} " + " ".join(f"{mem[f]:>11.1f} MB" for f in FIELDS))
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+if __name__ == "__main__":
+    main()
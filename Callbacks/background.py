@@ -0,0 +1,124 @@
+import contextvars
+import functools
+import importlib.util
+import os
+from contextlib import contextmanager
+
+# Heavy page callbacks (ratings, raw data) run as Dash background callbacks:
+# each request starts a job process and the browser polls for its result, so
+# a long computation never holds a gunicorn worker. Configured through the
+# environment:
+#   UBER_BACKGROUND          0 runs them synchronously in the request
+#   UBER_BACKGROUND_DIR      diskcache directory for job results and progress
+#                            (default Data/.cache/background)
+#   UBER_BACKGROUND_POLL_MS  how often the browser polls a job (default 250)
+#
+# A job still running when the same callback fires again (the user picked
+# another range) is killed by Dash, so stale ranges do not keep computing.
+DEFAULT_DIR = "Data/.cache/background"
+DEFAULT_POLL_MS = 250
+
+_progress = contextvars.ContextVar("progress", default=None)
+# Called with the manager's cache first thing in every job process
+_job_hooks = []
+
+
+def enabled():
+    """Whether heavy callbacks will run as background jobs (without importing Dash)."""
+    if os.environ.get("UBER_BACKGROUND", "1") == "0":
+        return False
+    return all(importlib.util.find_spec(name) for name in ("diskcache", "multiprocess", "psutil"))
+
+
+def manager_from_env():
+    """A DiskcacheManager, or None to run heavy callbacks synchronously."""
+    if os.environ.get("UBER_BACKGROUND", "1") == "0":
+        return None
+    try:
+        import diskcache
+        import psutil
+        from dash import DiskcacheManager
+    except ImportError as exc:  # needs diskcache, multiprocess and psutil
+        print(f"Background callbacks disabled: {exc}", flush=True)
+        return None
+
+    class Manager(DiskcacheManager):
+        def call_job_fn(self, key, job_fn, args, context):
+            return super().call_job_fn(key, functools.partial(_run_job, job_fn, self.handle), args, context)
+
+        def terminate_job(self, job):
+            # Dash kills a job after reading its result; one that exits on
+            # its own in between is already gone, which is not an error
+            try:
+                super().terminate_job(job)
+            except psutil.NoSuchProcess:
+                pass
+
+    return Manager(diskcache.Cache(os.environ.get("UBER_BACKGROUND_DIR", DEFAULT_DIR)))
+
+
+def on_job_start(fn):
+    """Register fn(cache) to run at the start of every job process."""
+    _job_hooks.append(fn)
+    return fn
+
+
+def _run_job(job_fn, cache, *args):
+    for hook in _job_hooks:
+        hook(cache)
+    return job_fn(*args)
+
+
+def options(manager, progress_bar):
+    """Keyword arguments making a callback a background one with a progress bar."""
+    if manager is None:
+        return {}
+    from dash import Output
+
+    return dict(
+        background=True,
+        manager=manager,
+        interval=int(os.environ.get("UBER_BACKGROUND_POLL_MS", DEFAULT_POLL_MS)),
+        progress=[Output(progress_bar, "value"), Output(progress_bar, "max")],
+        running=[(Output(progress_bar, "style"), {"display": "block"}, {"display": "none"})],
+    )
+
+
+def progress_arg(manager):
+    """Background callbacks take set_progress first; pass None when synchronous."""
+    def decorator(fn):
+        if manager is not None:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args):
+            return fn(None, *args)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def reporting(set_progress, steps):
+    """Let advance() move the progress bar while the block runs."""
+    if set_progress is None:
+        yield
+        return
+    state = {"done": 0}
+
+    def advance():
+        state["done"] = min(state["done"] + 1, steps)
+        set_progress((str(state["done"]), str(steps)))
+
+    set_progress(("0", str(steps)))
+    token = _progress.set(advance)
+    try:
+        yield
+    finally:
+        _progress.reset(token)
+
+
+def advance():
+    """Mark one step of the running background job done (no-op otherwise)."""
+    step = _progress.get()
+    if step is not None:
+        step()
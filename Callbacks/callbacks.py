@@ -1,16 +1,65 @@
-from dash import Input, Output, State
-from Utils.preprocessing import load_data, filter_data
-from Figures.charts import (
-    total_bookings,
-    booking_status_pie,
-    rides_over_time,
-    vehicle_type_bar,
-    payment_method_bar
+import importlib
+
+from Callbacks import background
+from Utils import metrics
+from Utils.dataset import Dataset
+from Utils.ingest import ingestor_from_env
+from Utils.memo import ResultCache, backend_from_env, source_version
+
+# Cold start comes in three steps: importing this module is cheap (Dash and
+# the charts are imported only when callbacks are registered), the data is
+# read by an explicit data.load() or data.load_async() (app.py starts it
+# first thing, so it overlaps with the remaining imports), and each page's
+# computations (Pages/<page>.py) are imported on the page's first request.
+
+# The ride data; everything that reads it waits until it is loaded. Its
+# indexes are built on load when background jobs will fork from this process,
+# instead of once per job
+data = Dataset(eager_indexes=background.enabled())
+
+# Optional tailing of new ride records (UBER_INGEST_PATH)
+ingest = ingestor_from_env(data)
+
+# Page results are memoized per (page, date range, filters, code, data version);
+# results computed in background job processes only survive in the disk
+# backend, which also outlives deploys: the code version keeps a new release
+# from reading what an older one stored
+results = ResultCache(
+    backend_from_env("disk" if background.enabled() else "memory"), data.loaded_version,
+    code_version=source_version("Callbacks", "Figures", "Pages", "Utils"),
 )
 
-df = load_data()
+
+@background.on_job_start
+def _in_job(cache):
+    # Dash SIGKILLs a job when the same callback fires again, so a job must
+    # not hold the disk backend's compute lock: it would stay held until it
+    # expires and stall the next request for that key
+    results.cross_process_locks = False
+    # Its callback timings go back to the server through the job cache
+    metrics.spool_to(cache)
+
+
+def page(name):
+    """A page's compute module, Pages/<name>.py, imported on first use.
+
+    Page computations are plain functions of the date range and the
+    cross-filters, so they can be cached, warmed up and benchmarked outside
+    of a Dash request; cache misses run on the bounded compute pool (see
+    Utils.compute).
+    """
+    return importlib.import_module(f"Pages.{name}")
+
 
 def register_callbacks(app):
+    from dash import Input, Output, State, ctx
+    from Figures.charts import patched
+    from Utils import export, query
+
+    # Job manager for the heavy pages (None: they run inside the request)
+    manager = background.manager_from_env()
+    if manager is not None:
+        metrics.collect_from(manager.handle)
 
     @app.callback(
         Output("sidebar", "className"),
@@ -32,6 +81,23 @@ def register_callbacks(app):
             # Sidebar is closed, show floating button
             return "sidebar", {"display": "block"}
 
+    @app.callback(
+        *[Output(query.filter_id(col), "options") for col in query.FILTER_COLUMNS],
+        Input("url", "pathname")
+    )
+    def update_filter_options(pathname):
+        values = data.filter_values()
+        return tuple(values.get(col, []) for col in query.FILTER_COLUMNS)
+
+    @app.callback(
+        Output("filter-state", "data"),
+        *[Input(query.filter_id(col), "value") for col in query.FILTER_COLUMNS],
+        prevent_initial_call=True
+    )
+    def update_filter_state(*selected):
+        # One store holds the cross-filters every page reads
+        return query.as_dict(query.normalize(zip(query.FILTER_COLUMNS, selected)))
+
     @app.callback(
         Output("total-bookings", "children"),
         Output("booking-status-pie", "figure"),
@@ -40,22 +106,16 @@ def register_callbacks(app):
         Output("payment-method-bar", "figure"),
         Input("date-filter", "start_date"),
         Input("date-filter", "end_date"),
-        Input("url", "pathname")
+        Input("url", "pathname"),
+        Input("filter-state", "data")
     )
-    def update_dashboard(start_date, end_date, pathname):
+    @metrics.instrument
+    def update_dashboard(start_date, end_date, pathname, filter_state):
         # Only update when on the Overall Analysis page
         if pathname != "/" and pathname != "":
             return tuple([None] * 5)
 
-        filtered = filter_data(df, start_date, end_date)
-
-        return (
-            total_bookings(filtered),
-            booking_status_pie(filtered),
-            rides_over_time(filtered),
-            vehicle_type_bar(filtered),
-            payment_method_bar(filtered)
-        )
+        return patched(page("overview").overall_analysis(start_date, end_date, query.normalize(filter_state)))
 
     @app.callback(
         Output("cancellation-total-bookings", "children"),
@@ -65,82 +125,73 @@ def register_callbacks(app):
         Output("driver-cancellations-kpi", "children"),
         Output("cancelled-by-customers-pie", "figure"),
         Output("cancelled-by-drivers-pie", "figure"),
+        Output("cancellation-reasons", "figure"),
+        Output("cancellations-over-time", "figure"),
+        Output("cancellations-by-vehicle", "figure"),
+        Output("cancellations-by-hour", "figure"),
         Input("cancellation-date-filter", "start_date"),
         Input("cancellation-date-filter", "end_date"),
-        Input("url", "pathname")
+        Input("url", "pathname"),
+        Input("filter-state", "data")
     )
-    def update_cancellations(start_date, end_date, pathname):
-        import plotly.express as px
-        
+    @metrics.instrument
+    def update_cancellations(start_date, end_date, pathname, filter_state):
         # Only update when on the Cancellations page
         if pathname != "/cancellations":
-            return tuple([None] * 7)
+            return tuple([None] * 11)
 
-        filtered = filter_data(df, start_date, end_date)
-        
-        total_bookings_count = len(filtered)
-        
-        # Count cancellations
-        customer_cancelled = filtered["Cancelled Rides by Customer"].sum() if "Cancelled Rides by Customer" in filtered.columns else 0
-        driver_cancelled = filtered["Cancelled Rides by Driver"].sum() if "Cancelled Rides by Driver" in filtered.columns else 0
-        total_cancelled = customer_cancelled + driver_cancelled
-        
-        cancellation_rate = (total_cancelled / total_bookings_count * 100) if total_bookings_count > 0 else 0
-        
-        # Pie chart for customer cancellations
-        customer_cancel_count = int(customer_cancelled)
-        customer_complete = total_bookings_count - customer_cancel_count
-        fig_customer = px.pie(
-            values=[customer_complete, customer_cancel_count],
-            names=["Completed", "Cancelled by Customer"],
-            title="Cancelled Rides by Customers",
-            color_discrete_sequence=["#4CAF50", "#FF6B6B"]
-        )
-        
-        # Pie chart for driver cancellations
-        driver_cancel_count = int(driver_cancelled)
-        driver_complete = total_bookings_count - driver_cancel_count
-        fig_driver = px.pie(
-            values=[driver_complete, driver_cancel_count],
-            names=["Completed", "Cancelled by Driver"],
-            title="Cancelled Rides by Drivers",
-            color_discrete_sequence=["#4CAF50", "#FF9800"]
-        )
-        
-        # Reasons chart (placeholder - will need actual reason data)
-        fig_reasons = {}
-        fig_timeline = {}
-        
-        return (
-            f"{total_bookings_count:,.0f}",
-            f"{int(total_cancelled):,.0f}",
-            f"{cancellation_rate:.1f}%",
-            f"{customer_cancel_count:,.0f}",
-            f"{driver_cancel_count:,.0f}",
-            fig_customer,
-            fig_driver
-        )
+        return page("cancellations").cancellations(start_date, end_date, query.normalize(filter_state))
 
     @app.callback(
         Output("total-records", "children"),
         Output("raw-data-table", "data"),
         Output("raw-data-table", "columns"),
+        Output("raw-data-table", "page_count"),
+        Output("raw-data-table", "page_current"),
         Input("rawdata-date-filter", "start_date"),
         Input("rawdata-date-filter", "end_date"),
-        Input("url", "pathname")
+        Input("url", "pathname"),
+        Input("filter-state", "data"),
+        Input("raw-data-table", "page_current"),
+        Input("raw-data-table", "page_size"),
+        Input("raw-data-table", "sort_by"),
+        Input("raw-data-table", "filter_query"),
+        **background.options(manager, "rawdata-progress")
     )
-    def update_raw_data(start_date, end_date, pathname):
+    @background.progress_arg(manager)
+    @metrics.instrument
+    def update_raw_data(set_progress, start_date, end_date, pathname, filter_state, page_current, page_size,
+                        sort_by, filter_query):
         # Only update when on the Raw Data page
         if pathname != "/raw-data":
-            return None, [], []
+            return None, [], [], 0, 0
 
-        filtered = filter_data(df, start_date, end_date)
-        
-        # Prepare table data
-        table_data = filtered.to_dict('records')
-        columns = [{"name": i, "id": i} for i in filtered.columns]
-        
-        return f"{len(filtered):,.0f}", table_data, columns
+        # A new range, filter or sort order starts again from the first page
+        if "raw-data-table.page_current" not in ctx.triggered_prop_ids:
+            page_current = 0
+        page_current = page_current or 0
+
+        with background.reporting(set_progress, steps=2):
+            return page("raw_data").raw_data(
+                start_date, end_date, query.normalize(filter_state), page_current, page_size or 20, sort_by,
+                filter_query
+            ) + (page_current,)
+
+    @app.callback(
+        Output("rawdata-export-csv", "href"),
+        Output("rawdata-export-csv-gz", "href"),
+        Output("rawdata-export-parquet", "href"),
+        Input("rawdata-date-filter", "start_date"),
+        Input("rawdata-date-filter", "end_date"),
+        Input("filter-state", "data")
+    )
+    def update_export_links(start_date, end_date, filter_state):
+        # The rows are streamed by GET /export (Utils/export.py), not sent
+        # through a callback
+        filters = query.normalize(filter_state)
+        return (export.href(start_date, end_date, "csv", filters=filters),
+                export.href(start_date, end_date, "csv", gzip=True, filters=filters),
+                export.href(start_date, end_date, "parquet", filters=filters))
 
     @app.callback(
         Output("avg-rating", "children"),
@@ -153,78 +204,16 @@ def register_callbacks(app):
         Output("top-customers-table", "columns"),
         Input("ratings-date-filter", "start_date"),
         Input("ratings-date-filter", "end_date"),
-        Input("url", "pathname")
+        Input("url", "pathname"),
+        Input("filter-state", "data"),
+        **background.options(manager, "ratings-progress")
     )
-    def update_ratings(start_date, end_date, pathname):
-        import plotly.express as px
-        
+    @background.progress_arg(manager)
+    @metrics.instrument
+    def update_ratings(set_progress, start_date, end_date, pathname, filter_state):
         # Only update when on the Ratings page
         if pathname != "/ratings":
             return tuple([None] * 8)
 
-        filtered = filter_data(df, start_date, end_date)
-        
-        # Calculate KPIs
-        avg_rating = filtered["Customer Rating"].mean() if "Customer Rating" in filtered.columns else 0
-        five_star_count = len(filtered[filtered["Customer Rating"] == 5]) if "Customer Rating" in filtered.columns else 0
-        total_revenue = filtered["Booking Value"].sum() if "Booking Value" in filtered.columns else 0
-        
-        # Rating distribution chart
-        rating_dist = filtered["Customer Rating"].value_counts().sort_index() if "Customer Rating" in filtered.columns else {}
-        fig_rating_dist = px.bar(
-            x=rating_dist.index,
-            y=rating_dist.values,
-            title="Rating Distribution",
-            labels={"x": "Rating", "y": "Count"},
-            color_discrete_sequence=["#2196F3"]
-        ) if len(rating_dist) > 0 else {}
-        
-        # Ratings by vehicle type
-        if "Vehicle Type" in filtered.columns and "Customer Rating" in filtered.columns:
-            rating_by_vehicle = filtered.groupby("Vehicle Type")["Customer Rating"].mean().reset_index()
-            fig_by_vehicle = px.bar(
-                rating_by_vehicle,
-                x="Vehicle Type",
-                y="Customer Rating",
-                title="Average Ratings by Vehicle Type",
-                color_discrete_sequence=["#4CAF50"]
-            )
-        else:
-            fig_by_vehicle = {}
-        
-        # Revenue over time
-        if "Datetime" in filtered.columns and "Booking Value" in filtered.columns:
-            filtered_copy = filtered.copy()
-            filtered_copy["Date"] = filtered_copy["Datetime"].dt.date
-            revenue_daily = filtered_copy.groupby("Date")["Booking Value"].sum().reset_index()
-            fig_revenue = px.line(
-                revenue_daily,
-                x="Date",
-                y="Booking Value",
-                title="Revenue Over Time",
-                markers=True,
-                color_discrete_sequence=["#FF9800"]
-            )
-        else:
-            fig_revenue = {}
-        
-        # Top 5 customers
-        if "Customer ID" in filtered.columns:
-            top_5_customers = filtered["Customer ID"].value_counts().head(5).reset_index()
-            top_5_customers.columns = ["Customer ID", "Number of Bookings"]
-            table_data = top_5_customers.to_dict('records')
-            columns = [{"name": i, "id": i} for i in top_5_customers.columns]
-        else:
-            table_data = []
-            columns = []
-        
-        return (
-            f"{avg_rating:.2f}",
-            f"{five_star_count:,.0f}",
-            f"${total_revenue:,.0f}",
-            fig_rating_dist,
-            fig_by_vehicle,
-            fig_revenue,
-            table_data,
-            columns
-        )
\ No newline at end of file
+        with background.reporting(set_progress, steps=2):
+            return patched(page("ratings").ratings(start_date, end_date, query.normalize(filter_state)))
@@ -0,0 +1,71 @@
+import os
+import time
+
+import pandas as pd
+
+from Callbacks.callbacks import page
+from Layouts.layout import DEFAULT_END_DATE, DEFAULT_START_DATE, RAW_DATA_DEFAULT_END_DATE
+
+# UBER_WARMUP selects what is precomputed before the server takes traffic:
+#   off       nothing
+#   defaults  the date ranges the pages open with (default)
+#   common    defaults plus every month and quarter inside them
+WARMUP_LEVELS = ("off", "defaults", "common")
+
+
+def common_ranges(start_date=DEFAULT_START_DATE, end_date=DEFAULT_END_DATE):
+    """Every whole month and quarter between start_date and end_date."""
+    start = pd.Timestamp(start_date)
+    end = pd.Timestamp(end_date)
+
+    ranges = []
+    for freq in ("MS", "QS"):
+        for first in pd.date_range(start, end, freq=freq):
+            last = first + (pd.offsets.MonthEnd(1) if freq == "MS" else pd.offsets.QuarterEnd(1))
+            if last <= end:
+                ranges.append((first.strftime("%Y-%m-%d"), last.strftime("%Y-%m-%d")))
+    return ranges
+
+
+def warm_up(level=None):
+    """Precompute page outputs so the first visitor after a deploy hits the cache.
+
+    Returns a list of (page, start_date, end_date, seconds) entries.
+    """
+    level = level or os.environ.get("UBER_WARMUP", "defaults")
+    if level not in WARMUP_LEVELS:
+        raise ValueError(f"UBER_WARMUP must be one of {WARMUP_LEVELS}, got {level!r}")
+    if level == "off":
+        return []
+
+    ranges = [(DEFAULT_START_DATE, DEFAULT_END_DATE)]
+    if level == "common":
+        ranges += [r for r in common_ranges() if r not in ranges]
+
+    # Warming up imports every page's compute module, which would otherwise
+    # happen on the page's first request
+    pages = {
+        "overall": page("overview").overall_analysis,
+        "cancellations": page("cancellations").cancellations,
+        "ratings": page("ratings").ratings,
+    }
+    jobs = [(name, fn, r) for r in ranges for name, fn in pages.items()]
+    # The raw data page is not cached, but its first page warms the same
+    # code paths (index lookups, table serialization) as a real visit
+    jobs.append(("raw-data", page("raw_data").raw_data, (DEFAULT_START_DATE, RAW_DATA_DEFAULT_END_DATE)))
+
+    report = []
+    for name, fn, (start_date, end_date) in jobs:
+        started = time.perf_counter()
+        fn(start_date, end_date)
+        report.append((name, start_date, end_date, time.perf_counter() - started))
+    return report
+
+
+def format_report(report):
+    total = sum(seconds for *_, seconds in report)
+    slowest = max(report, key=lambda entry: entry[-1])
+    return (
+        f"Warm-up: {len(report)} page outputs precomputed in {total:.2f}s "
+        f"(slowest: {slowest[0]} {slowest[1]}..{slowest[2]} in {slowest[3]:.2f}s)"
+    )
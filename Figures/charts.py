@@ -1,70 +1,338 @@
-import plotly.express as px
+# Chart helpers take pre-aggregated values (see Utils.rollup), never raw rows,
+# and return plain figure dicts: only the binned data plus a compact
+# template, instead of plotly.express figures that carry the full ~7 KB
+# "plotly" template and go through per-property validation.
+#
+# Each chart is a static skeleton (layout, titles, styling and an empty
+# trace) that Layouts.layout renders up front, filled with data per request.
+# Callbacks send just the trace data as a Patch (see data_patch).
+import pandas as pd
+from dash import Patch
+
+# The parts of plotly's default "plotly" template these charts rely on
+TEMPLATE = {
+    "layout": {
+        "colorway": ["#636efa", "#EF553B", "#00cc96", "#ab63fa", "#FFA15A",
+                     "#19d3f3", "#FF6692", "#B6E880", "#FF97FF", "#FECB52"],
+        "font": {"color": "#2a3f5f"},
+        "paper_bgcolor": "white",
+        "plot_bgcolor": "#E5ECF6",
+        "xaxis": {"gridcolor": "white", "linecolor": "white", "ticks": "", "title": {"standoff": 15},
+                  "zerolinecolor": "white", "automargin": True, "zerolinewidth": 2},
+        "yaxis": {"gridcolor": "white", "linecolor": "white", "ticks": "", "title": {"standoff": 15},
+                  "zerolinecolor": "white", "automargin": True, "zerolinewidth": 2},
+        "hovermode": "closest",
+        "hoverlabel": {"align": "left"},
+        "title": {"x": 0.05},
+        "autotypenumbers": "strict",
+    }
+}
+DEFAULT_COLOR = "#636efa"
+BAR_OUTLINE = {"color": "#E5ECF6", "width": 0.5}
+
+
+# Trace properties that carry data; everything else is part of the skeleton
+DATA_KEYS = ("labels", "values", "x", "y", "z", "x0", "dx")
+
+
+def _values(values):
+    # JSON-friendly lists from pandas/NumPy values
+    if values is None or isinstance(values, (str, int, float)):
+        return values
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
+
+def _time_x(index):
+    """x data for a time series: x0/dx when the buckets are evenly spaced
+    (hours, days, weeks), which spares sending one date string per point."""
+    if not len(index):
+        return {"x": []}
+    daily = (index == index.normalize()).all()
+    if len(index) > 1:
+        steps = index[1:] - index[:-1]
+        if (steps == steps[0]).all():
+            start = index[0].strftime("%Y-%m-%d" if daily else "%Y-%m-%d %H:%M")
+            return {"x": None, "x0": start, "dx": steps[0] // pd.Timedelta(1, "ms")}
+    return {"x": index.strftime("%Y-%m-%d" if daily else "%Y-%m-%d %H:%M")}
+
+
+def pie_figure(title, label_name=None, hole=None, colors=None, textinfo=None):
+    trace = {
+        "type": "pie",
+        "labels": [],
+        "values": [],
+        "automargin": True,
+        "hovertemplate": (f"{label_name}=%{{label}}" if label_name else "label=%{label}<br>value=%{value}")
+        + "<extra></extra>",
+    }
+    if hole is not None:
+        trace["hole"] = hole
+    if textinfo is not None:
+        trace["textinfo"] = textinfo
+    layout = {"template": TEMPLATE, "title": {"text": title}, "legend": {"tracegroupgap": 0}}
+    if colors is not None:
+        layout["piecolorway"] = colors
+    return {"data": [trace], "layout": layout}
+
+
+def xy_figure(kind, title, x_title, y_title, color=DEFAULT_COLOR):
+    trace = {
+        "x": [],
+        "y": [],
+        "hovertemplate": f"{x_title}=%{{x}}<br>{y_title}=%{{y}}<extra></extra>",
+        "showlegend": False,
+    }
+    if kind == "bar":
+        trace.update(type="bar", marker={"color": color, "line": BAR_OUTLINE})
+    else:
+        trace.update(type="scatter", mode="lines+markers", line={"color": color})
+    layout = {
+        "template": TEMPLATE,
+        "title": {"text": title},
+        "xaxis": {"title": {"text": x_title}},
+        "yaxis": {"title": {"text": y_title}},
+        "legend": {"tracegroupgap": 0},
+    }
+    return {"data": [trace], "layout": layout}
+
+
+def series_figure(kind, title, x_title, y_title, series, orientation=None):
+    """Like xy_figure, with one named trace per entry of series (name -> color)."""
+    figure = xy_figure(kind, title, x_title, y_title)
+    template = figure["data"][0]
+    traces = []
+    for name, color in series.items():
+        trace = dict(template, name=name, showlegend=True)
+        if kind == "bar":
+            trace["marker"] = {"color": color, "line": BAR_OUTLINE}
+        else:
+            trace["line"] = {"color": color}
+        if orientation == "h":
+            trace.update(orientation="h", hovertemplate=f"{y_title}=%{{y}}<br>{x_title}=%{{x}}<extra></extra>")
+        trace["hovertemplate"] = f"{name}<br>" + trace["hovertemplate"]
+        traces.append(trace)
+    figure["data"] = traces
+    if kind == "bar":
+        figure["layout"]["barmode"] = "group"
+    return figure
+
+
+def heatmap_figure(title, x_title, y_title, z_title, colorscale="Reds"):
+    trace = {
+        "type": "heatmap",
+        "x": [],
+        "y": [],
+        "z": [],
+        "colorscale": colorscale,
+        "colorbar": {"title": {"text": z_title}},
+        "hovertemplate": f"{y_title}=%{{y}}<br>{x_title}=%{{x}}<br>{z_title}=%{{z}}<extra></extra>",
+    }
+    layout = {
+        "template": TEMPLATE,
+        "title": {"text": title},
+        "xaxis": {"title": {"text": x_title}, "dtick": 1},
+        "yaxis": {"title": {"text": y_title}, "autorange": "reversed"},
+    }
+    return {"data": [trace], "layout": layout}
+
+
+def with_data(skeleton, **data):
+    """A full figure: the skeleton's single trace filled with data."""
+    trace = dict(skeleton["data"][0])
+    trace.update({key: _values(values) for key, values in data.items()})
+    return {"data": [trace], "layout": skeleton["layout"]}
+
+
+def with_series(skeleton, *data):
+    """A full figure: each of the skeleton's traces filled with its data."""
+    traces = []
+    for trace, values in zip(skeleton["data"], data):
+        trace = dict(trace)
+        trace.update({key: _values(v) for key, v in values.items()})
+        traces.append(trace)
+    return {"data": traces, "layout": skeleton["layout"]}
+
+
+def data_patch(figure):
+    """Patch that swaps just the trace data into a rendered skeleton."""
+    patch = Patch()
+    for i, trace in enumerate(figure["data"]):
+        for key in DATA_KEYS:
+            if key in trace:
+                patch["data"][i][key] = trace[key]
+    return patch
+
+
+def patched(outputs):
+    # The graphs already hold their skeletons (see Layouts.layout), so only
+    # the trace data goes over the wire
+    return tuple(
+        data_patch(value) if isinstance(value, dict) and "data" in value else value
+        for value in outputs
+    )
+
+
+# Skeletons
+BOOKING_STATUS_PIE = pie_figure(
+    title="Booking Status Breakdown",
+    label_name="Booking Status",
+    hole=0.4,
+    textinfo="percent+label"
+)
+RIDES_OVER_TIME = xy_figure(
+    "line",
+    title="Ride Volume Over Time",
+    x_title="Date",
+    y_title="Bookings"
+)
+RIDES_OVER_TIME["layout"]["xaxis"]["type"] = "date"
+VEHICLE_TYPE_BAR = xy_figure(
+    "bar",
+    title="Bookings by Vehicle Type",
+    x_title="Vehicle Type",
+    y_title="Bookings"
+)
+PAYMENT_METHOD_BAR = xy_figure(
+    "bar",
+    title="Payment Method Distribution",
+    x_title="Payment Method",
+    y_title="Count"
+)
+RATING_DISTRIBUTION_BAR = xy_figure(
+    "bar",
+    title="Rating Distribution",
+    x_title="Rating",
+    y_title="Count",
+    color="#2196F3"
+)
+RATINGS_BY_VEHICLE_BAR = xy_figure(
+    "bar",
+    title="Average Ratings by Vehicle Type",
+    x_title="Vehicle Type",
+    y_title="Customer Rating",
+    color="#4CAF50"
+)
+REVENUE_OVER_TIME = xy_figure(
+    "line",
+    title="Revenue Over Time",
+    x_title="Date",
+    y_title="Booking Value",
+    color="#FF9800"
+)
+# Dates may arrive as x0/dx only, so the axis type cannot be inferred from x
+REVENUE_OVER_TIME["layout"]["xaxis"]["type"] = "date"
+
+# One trace per party that cancelled
+CANCELLING_PARTIES = {"customer": ("Customers", "#FF6B6B"), "driver": ("Drivers", "#FF9800")}
+_PARTY_COLORS = dict(CANCELLING_PARTIES.values())
+CANCELLATION_REASONS_BAR = series_figure(
+    "bar",
+    title="Cancellation Reasons",
+    x_title="Cancellations",
+    y_title="Reason",
+    series=_PARTY_COLORS,
+    orientation="h"
+)
+CANCELLATION_REASONS_BAR["layout"]["yaxis"]["autorange"] = "reversed"
+CANCELLATIONS_OVER_TIME = series_figure(
+    "line",
+    title="Cancellations Over Time",
+    x_title="Date",
+    y_title="Cancellations",
+    series=_PARTY_COLORS
+)
+CANCELLATIONS_OVER_TIME["layout"]["xaxis"]["type"] = "date"
+CANCELLATIONS_BY_VEHICLE_BAR = series_figure(
+    "bar",
+    title="Cancellations by Vehicle Type",
+    x_title="Vehicle Type",
+    y_title="Cancellations",
+    series=_PARTY_COLORS
+)
+CANCELLATIONS_BY_HOUR_HEATMAP = heatmap_figure(
+    title="Cancellations by Weekday and Hour",
+    x_title="Hour",
+    y_title="Weekday",
+    z_title="Cancellations"
+)
+
 
 # KPI
-def total_bookings(df):
-    return f"{len(df):,.0f}"
+def total_bookings(count):
+    return f"{count:,.0f}"
 
 # PIE — Booking Status
-def booking_status_pie(df):
-    fig = px.pie(
-        df,
-        names="Booking Status",
-        title="Booking Status Breakdown",
-        hole=0.4
-    )
-    fig.update_traces(textinfo="percent+label")
-    return fig
+def booking_status_pie(counts):
+    return with_data(BOOKING_STATUS_PIE, labels=counts.index, values=counts.values)
 
-# LINE — Ride Volume Over Time
-def rides_over_time(df):
-    grouped = (
-        df.groupby(["Month", "Month_Num"])
-        .size()
-        .reset_index(name="Bookings")
-        .sort_values("Month_Num")
-    )
+# Time series take one value per bucket (hour, day, week, ...; see
+# Utils.buckets), indexed by the bucket's start
 
-    fig = px.line(
-        grouped,
-        x="Month",
-        y="Bookings",
-        markers=True,
-        title="Ride Volume Over Time"
-    )
-    return fig
+# LINE — Ride Volume Over Time
+def rides_over_time(bookings):
+    return with_data(RIDES_OVER_TIME, y=bookings.values, **_time_x(bookings.index))
 
 # BAR — Vehicle Type
-def vehicle_type_bar(df):
-    vc = (
-        df["Vehicle Type"]
-        .value_counts()
-        .reset_index(name="Bookings")
-        .rename(columns={"index": "Vehicle Type"})
+def vehicle_type_bar(counts):
+    vc = counts.sort_values(ascending=False)
+    return with_data(VEHICLE_TYPE_BAR, x=vc.index, y=vc.values)
+
+# BAR — Payment Method
+def payment_method_bar(counts):
+    vc = counts.sort_values(ascending=False)
+    return with_data(PAYMENT_METHOD_BAR, x=vc.index, y=vc.values)
+
+# PIE — Completed vs. cancelled by one party
+def cancellation_pie(completed, cancelled, cancelled_label, title, colors):
+    return with_data(
+        pie_figure(title=title, colors=colors),
+        labels=["Completed", cancelled_label],
+        values=[completed, cancelled]
     )
 
-    fig = px.bar(
-        vc,
-        x="Vehicle Type",
-        y="Bookings",
-        title="Bookings by Vehicle Type"
+# BAR — Rating Distribution
+def rating_distribution_bar(rating_dist):
+    return with_data(RATING_DISTRIBUTION_BAR, x=rating_dist.index, y=rating_dist.values)
+
+# BAR — Average Rating by Vehicle Type
+def ratings_by_vehicle_bar(rating_by_vehicle):
+    return with_data(RATINGS_BY_VEHICLE_BAR, x=rating_by_vehicle.index, y=rating_by_vehicle.values)
+
+# LINE — Revenue Over Time
+def revenue_over_time(revenue):
+    return with_data(REVENUE_OVER_TIME, y=revenue.values, **_time_x(revenue.index))
+
+# BAR — Cancellation reasons, one trace per party (reasons differ by party)
+def cancellation_reasons_bar(reasons):
+    return with_series(
+        CANCELLATION_REASONS_BAR,
+        *({"x": counts.values, "y": counts.index} for counts in _by_party(reasons))
     )
 
-    return fig
+# LINE — Cancellations per time bucket per party
+def cancellations_over_time(timeline):
+    return with_series(
+        CANCELLATIONS_OVER_TIME,
+        *({"y": counts.values, **_time_x(counts.index)} for counts in _by_party(timeline))
+    )
 
-# BAR — Payment Method
-def payment_method_bar(df):
-    vc = (
-        df["Payment Method"]
-        .value_counts()
-        .reset_index(name="Count")
-        .rename(columns={"index": "Payment Method"})
+# BAR — Cancellations by vehicle type per party
+def cancellations_by_vehicle_bar(by_vehicle):
+    return with_series(
+        CANCELLATIONS_BY_VEHICLE_BAR,
+        *({"x": counts.index, "y": counts.values} for counts in _by_party(by_vehicle))
     )
 
-    fig = px.bar(
-        vc,
-        x="Payment Method",
-        y="Count",
-        title="Payment Method Distribution"
+# HEATMAP — Cancellations by weekday x hour
+def cancellations_by_hour_heatmap(weekday_hour):
+    return with_data(
+        CANCELLATIONS_BY_HOUR_HEATMAP,
+        x=weekday_hour.columns,
+        y=weekday_hour.index,
+        z=weekday_hour.values
     )
 
-    return fig
\ No newline at end of file
+def _by_party(breakdown):
+    # One entry per trace of CANCELLING_PARTIES, empty for a missing party
+    empty = pd.Series(dtype="int64")
+    return [breakdown[party] if party in breakdown else empty for party in CANCELLING_PARTIES]
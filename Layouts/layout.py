@@ -1,5 +1,15 @@
 from dash import html, dcc, dash_table
 
+from Figures import charts
+from Utils.query import FILTER_COLUMNS, filter_id
+
+# Date picker defaults and bounds (also used to warm the result cache)
+MIN_DATE = "2024-01-01"
+MAX_DATE = "2024-12-31"
+DEFAULT_START_DATE = "2024-01-01"
+DEFAULT_END_DATE = "2024-12-31"
+RAW_DATA_DEFAULT_END_DATE = "2024-01-31"
+
 def create_overall_analysis_content():
     return html.Div([
         # Top section with header and controls
@@ -20,12 +30,16 @@ def create_overall_analysis_content():
                 html.Div([
                     dcc.DatePickerRange(
                         id="date-filter",
-                        start_date="2024-01-01",
-                        end_date="2024-12-31",
-                        min_date_allowed="2024-01-01",
-                        max_date_allowed="2024-12-31",
+                        start_date=DEFAULT_START_DATE,
+                        end_date=DEFAULT_END_DATE,
+                        min_date_allowed=MIN_DATE,
+                        max_date_allowed=MAX_DATE,
                         start_date_placeholder_text="Start Date",
-                        end_date_placeholder_text="End Date"
+                        end_date_placeholder_text="End Date",
+                        # Send a range only once both ends are picked (as do
+                        # the other pages' pickers), so the half-edited range
+                        # (new start, old end) is never requested on its own
+                        updatemode="bothdates"
                     )
                 ], className="filter-container"),
                 
@@ -40,14 +54,14 @@ def create_overall_analysis_content():
 
         # Charts Row 1
         html.Div([
-            dcc.Graph(id="booking-status-pie"),
-            dcc.Graph(id="rides-over-time")
+            dcc.Graph(id="booking-status-pie", figure=charts.BOOKING_STATUS_PIE),
+            dcc.Graph(id="rides-over-time", figure=charts.RIDES_OVER_TIME)
         ], className="chart-row"),
 
         # Charts Row 2
         html.Div([
-            dcc.Graph(id="vehicle-type-bar"),
-            dcc.Graph(id="payment-method-bar")
+            dcc.Graph(id="vehicle-type-bar", figure=charts.VEHICLE_TYPE_BAR),
+            dcc.Graph(id="payment-method-bar", figure=charts.PAYMENT_METHOD_BAR)
         ], className="chart-row")
     ], className="page-content")
 
@@ -71,12 +85,13 @@ def create_cancellations_content():
                 html.Div([
                     dcc.DatePickerRange(
                         id="cancellation-date-filter",
-                        start_date="2024-01-01",
-                        end_date="2024-12-31",
-                        min_date_allowed="2024-01-01",
-                        max_date_allowed="2024-12-31",
+                        start_date=DEFAULT_START_DATE,
+                        end_date=DEFAULT_END_DATE,
+                        min_date_allowed=MIN_DATE,
+                        max_date_allowed=MAX_DATE,
                         start_date_placeholder_text="Start Date",
-                        end_date_placeholder_text="End Date"
+                        end_date_placeholder_text="End Date",
+                        updatemode="bothdates"
                     )
                 ], className="filter-container"),
                 
@@ -109,6 +124,18 @@ def create_cancellations_content():
         html.Div([
             dcc.Graph(id="cancelled-by-customers-pie"),
             dcc.Graph(id="cancelled-by-drivers-pie")
+        ], className="chart-row"),
+
+        # Charts Row 2
+        html.Div([
+            dcc.Graph(id="cancellation-reasons", figure=charts.CANCELLATION_REASONS_BAR),
+            dcc.Graph(id="cancellations-by-vehicle", figure=charts.CANCELLATIONS_BY_VEHICLE_BAR)
+        ], className="chart-row"),
+
+        # Charts Row 3
+        html.Div([
+            dcc.Graph(id="cancellations-over-time", figure=charts.CANCELLATIONS_OVER_TIME),
+            dcc.Graph(id="cancellations-by-hour", figure=charts.CANCELLATIONS_BY_HOUR_HEATMAP)
         ], className="chart-row")
     ], className="page-content")
 
@@ -132,12 +159,13 @@ def create_ratings_content():
                 html.Div([
                     dcc.DatePickerRange(
                         id="ratings-date-filter",
-                        start_date="2024-01-01",
-                        end_date="2024-12-31",
-                        min_date_allowed="2024-01-01",
-                        max_date_allowed="2024-12-31",
+                        start_date=DEFAULT_START_DATE,
+                        end_date=DEFAULT_END_DATE,
+                        min_date_allowed=MIN_DATE,
+                        max_date_allowed=MAX_DATE,
                         start_date_placeholder_text="Start Date",
-                        end_date_placeholder_text="End Date"
+                        end_date_placeholder_text="End Date",
+                        updatemode="bothdates"
                     )
                 ], className="filter-container"),
                 
@@ -158,15 +186,18 @@ def create_ratings_content():
             ], className="controls-container")
         ], className="top-section"),
 
+        # Shown while the page is computed in the background
+        html.Progress(id="ratings-progress", className="page-progress", style={"display": "none"}),
+
         # Charts Row 1
         html.Div([
-            dcc.Graph(id="rating-distribution"),
-            dcc.Graph(id="ratings-by-vehicle-type")
+            dcc.Graph(id="rating-distribution", figure=charts.RATING_DISTRIBUTION_BAR),
+            dcc.Graph(id="ratings-by-vehicle-type", figure=charts.RATINGS_BY_VEHICLE_BAR)
         ], className="chart-row"),
 
         # Charts Row 2
         html.Div([
-            dcc.Graph(id="revenue-over-time")
+            dcc.Graph(id="revenue-over-time", figure=charts.REVENUE_OVER_TIME)
         ], className="chart-row"),
         
         # Top 5 Customers Table
@@ -201,12 +232,13 @@ def create_raw_data_content():
                 html.Div([
                     dcc.DatePickerRange(
                         id="rawdata-date-filter",
-                        start_date="2024-01-01",
-                        end_date="2024-01-31",
-                        min_date_allowed="2024-01-01",
-                        max_date_allowed="2024-12-31",
+                        start_date=DEFAULT_START_DATE,
+                        end_date=RAW_DATA_DEFAULT_END_DATE,
+                        min_date_allowed=MIN_DATE,
+                        max_date_allowed=MAX_DATE,
                         start_date_placeholder_text="Start Date",
-                        end_date_placeholder_text="End Date"
+                        end_date_placeholder_text="End Date",
+                        updatemode="bothdates"
                     )
                 ], className="filter-container"),
                 
@@ -215,9 +247,20 @@ def create_raw_data_content():
                         html.H4("Total Records"),
                         html.H2(id="total-records")
                     ], className="kpi-card")
-                ], className="kpi-container")
+                ], className="kpi-container"),
+
+                # Downloads of the whole range, streamed by GET /export
+                html.Div([
+                    html.H4("Download"),
+                    html.A("CSV", id="rawdata-export-csv", className="export-link"),
+                    html.A("CSV (gzip)", id="rawdata-export-csv-gz", className="export-link"),
+                    html.A("Parquet", id="rawdata-export-parquet", className="export-link")
+                ], className="export-container")
             ], className="controls-container")
         ], className="top-section"),
+
+        # Shown while the page is computed in the background
+        html.Progress(id="rawdata-progress", className="page-progress", style={"display": "none"}),
         
         # Data Table
         html.Div([
@@ -226,7 +269,16 @@ def create_raw_data_content():
                 style_cell={'textAlign': 'left', 'padding': '10px'},
                 style_header={'backgroundColor': '#2a2a2a', 'color': 'white', 'fontWeight': 'bold'},
                 style_data={'backgroundColor': '#f4f4f4'},
-                page_size=20
+                # Paging, sorting and filtering run on the server, so only
+                # the visible page is ever sent to the browser
+                page_action="custom",
+                page_current=0,
+                page_size=20,
+                sort_action="custom",
+                sort_mode="multi",
+                sort_by=[],
+                filter_action="custom",
+                filter_query=""
             )
         ], className="table-container")
     ], className="page-content")
@@ -247,7 +299,18 @@ def create_layout():
                 dcc.Link(html.Button("Cancellations", className="sidebar-btn"), href="/cancellations"),
                 dcc.Link(html.Button("Ratings", className="sidebar-btn"), href="/ratings"),
                 dcc.Link(html.Button("Raw Data", className="sidebar-btn"), href="/raw-data")
-            ], className="sidebar-buttons")
+            ], className="sidebar-buttons"),
+
+            # Cross-filters shared by every page; the values are filled in
+            # from the data and the selection is kept in one store
+            html.Div([
+                html.H3("Filters", className="sidebar-title"),
+                *[
+                    dcc.Dropdown(id=filter_id(col), multi=True, placeholder=col, className="sidebar-filter")
+                    for col in FILTER_COLUMNS
+                ],
+                dcc.Store(id="filter-state")
+            ], className="sidebar-filters")
         ], id="sidebar", className="sidebar open"),
         
         # Main content
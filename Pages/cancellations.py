@@ -0,0 +1,71 @@
+# Cancellations page: KPIs, pies and the per-party breakdowns
+from Callbacks.callbacks import data, results
+from Figures.charts import (
+    cancellation_pie,
+    cancellation_reasons_bar,
+    cancellations_over_time,
+    cancellations_by_vehicle_bar,
+    cancellations_by_hour_heatmap
+)
+from Utils import cancellations as cancellation_breakdowns
+from Utils import compute, metrics
+
+
+@results.memoize("cancellations")
+@compute.offload
+def cancellations(start_date, end_date, filters=()):
+    with metrics.stage("aggregate"):
+        summary = data.summary(start_date, end_date, filters)
+        # Every breakdown comes from the same per-day cancellation tables
+        breakdown = cancellation_breakdowns.breakdowns(summary, summary.granularity(start_date, end_date))
+
+    total_bookings_count = summary.total("bookings")
+
+    # Count cancellations
+    customer_cancelled = summary.total("customer_cancelled")
+    driver_cancelled = summary.total("driver_cancelled")
+    total_cancelled = customer_cancelled + driver_cancelled
+
+    cancellation_rate = (total_cancelled / total_bookings_count * 100) if total_bookings_count > 0 else 0
+
+    with metrics.stage("figure"):
+        # Pie chart for customer cancellations
+        customer_cancel_count = int(customer_cancelled)
+        customer_complete = total_bookings_count - customer_cancel_count
+        fig_customer = cancellation_pie(
+            customer_complete,
+            customer_cancel_count,
+            "Cancelled by Customer",
+            title="Cancelled Rides by Customers",
+            colors=["#4CAF50", "#FF6B6B"]
+        )
+
+        # Pie chart for driver cancellations
+        driver_cancel_count = int(driver_cancelled)
+        driver_complete = total_bookings_count - driver_cancel_count
+        fig_driver = cancellation_pie(
+            driver_complete,
+            driver_cancel_count,
+            "Cancelled by Driver",
+            title="Cancelled Rides by Drivers",
+            colors=["#4CAF50", "#FF9800"]
+        )
+
+        fig_reasons = cancellation_reasons_bar(breakdown["reason"])
+        fig_timeline = cancellations_over_time(breakdown["timeline"])
+        fig_vehicle = cancellations_by_vehicle_bar(breakdown["vehicle"])
+        fig_hour = cancellations_by_hour_heatmap(breakdown["weekday_hour"])
+
+    return (
+        f"{total_bookings_count:,.0f}",
+        f"{int(total_cancelled):,.0f}",
+        f"{cancellation_rate:.1f}%",
+        f"{customer_cancel_count:,.0f}",
+        f"{driver_cancel_count:,.0f}",
+        fig_customer,
+        fig_driver,
+        fig_reasons,
+        fig_timeline,
+        fig_vehicle,
+        fig_hour
+    )
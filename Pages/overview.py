@@ -0,0 +1,28 @@
+# Overall Analysis page: booking KPIs and charts, from the rollup (or the
+# cross-filtered rows)
+from Callbacks.callbacks import data, results
+from Figures.charts import (
+    total_bookings,
+    booking_status_pie,
+    rides_over_time,
+    vehicle_type_bar,
+    payment_method_bar
+)
+from Utils import compute, metrics
+
+
+@results.memoize("overall")
+@compute.offload
+def overall_analysis(start_date, end_date, filters=()):
+    with metrics.stage("aggregate"):
+        summary = data.summary(start_date, end_date, filters)
+        bookings = summary.over_time("bookings", summary.granularity(start_date, end_date))
+
+    with metrics.stage("figure"):
+        return (
+            total_bookings(summary.total("bookings")),
+            booking_status_pie(summary.counts("Booking Status")),
+            rides_over_time(bookings),
+            vehicle_type_bar(summary.counts("Vehicle Type")),
+            payment_method_bar(summary.counts("Payment Method"))
+        )
@@ -0,0 +1,66 @@
+# Ratings page: rating KPIs and charts, revenue and the top customers
+from Callbacks import background
+from Callbacks.callbacks import data, results
+from Figures.charts import (
+    rating_distribution_bar,
+    ratings_by_vehicle_bar,
+    revenue_over_time,
+    REVENUE_OVER_TIME
+)
+from Utils import compute, metrics
+
+
+@results.memoize("ratings")
+@compute.offload
+def ratings(start_date, end_date, filters=()):
+    with metrics.stage("aggregate"):
+        summary = data.summary(start_date, end_date, filters)
+
+        # Calculate KPIs
+        avg_rating = summary.average_rating()
+        five_star_count = summary.total("five_star")
+        total_revenue = summary.total("revenue")
+
+        # Top 5 customers
+        top_5_customers = data.top_customers(start_date, end_date, 5, filters=filters)
+        if top_5_customers is not None:
+            error = top_5_customers.attrs.get("error", 0)
+            top_5_customers = top_5_customers.reset_index()
+            top_5_customers.columns = ["Customer ID", "Number of Bookings"]
+            table_data = top_5_customers.to_dict('records')
+            columns = [{"name": i, "id": i} for i in top_5_customers.columns]
+            if error:
+                # Approximate counts (UBER_TOPK_MODE) can be this far too low
+                columns[1]["name"] = f"Number of Bookings (approx., up to {error:,} more)"
+        else:
+            table_data = []
+            columns = []
+    background.advance()
+
+    with metrics.stage("figure"):
+        # Rating distribution chart
+        rating_dist = summary.counts("Customer Rating").sort_index()
+        fig_rating_dist = rating_distribution_bar(rating_dist)
+
+        # Ratings by vehicle type
+        rating_by_vehicle = summary.average_rating_by_vehicle()
+        fig_by_vehicle = ratings_by_vehicle_bar(rating_by_vehicle)
+
+        # Revenue over time
+        if "revenue" in summary.tables["totals"].columns:
+            granularity = summary.granularity(start_date, end_date)
+            fig_revenue = revenue_over_time(summary.over_time("revenue", granularity))
+        else:
+            fig_revenue = REVENUE_OVER_TIME
+    background.advance()
+
+    return (
+        f"{avg_rating:.2f}",
+        f"{five_star_count:,.0f}",
+        f"${total_revenue:,.0f}",
+        fig_rating_dist,
+        fig_by_vehicle,
+        fig_revenue,
+        table_data,
+        columns
+    )
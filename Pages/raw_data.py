@@ -0,0 +1,26 @@
+# Raw Data page: one server-side page of the filtered rows
+from Callbacks import background
+from Callbacks.callbacks import data
+from Utils import compute, metrics
+from Utils.table import table_page
+
+
+@compute.offload
+def raw_data(start_date, end_date, filters=(), page_current=0, page_size=20, sort_by=None, filter_query=""):
+    filtered = data.rows(start_date, end_date, filters)
+    background.advance()
+
+    columns = [{"name": i, "id": i} for i in filtered.columns]
+
+    # Filter, sort and cut out just the requested page
+    with metrics.stage("filter"):
+        try:
+            total, table_data, page_count = table_page(
+                filtered, filter_query, sort_by, page_current, page_size
+            )
+        except ValueError as exc:
+            # Shown in place of the record count instead of ignoring the term
+            return str(exc), [], columns, 1
+    background.advance()
+
+    return f"{total:,.0f}", table_data, columns, page_count
@@ -0,0 +1,77 @@
+"""filter_data on the sorted, typed frame against the original row masks.
+
+load_data() sorts rows by time (stable, so ties keep file order), so
+filter_data returns the rows the original masks over the unsorted CSV
+selected, in time order instead of file order.
+
+Run from the project root with `python -m pytest`.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from Benchmarks import synthetic
+from Utils.preprocessing import INT8_COLUMNS, filter_data, load_data
+
+RANGES = {
+    "all rows": (None, None),
+    "year": ("2024-01-01", "2024-12-31"),
+    "whole days": ("2024-03-01", "2024-03-31"),
+    "partial first and last days": ("2024-03-05 10:30", "2024-03-19 14:15"),
+    "to the second": ("2024-06-15 08:00:01", "2024-06-15 17:59:59"),
+    "sub-second bounds": ("2024-06-15 08:00:00.5", "2024-06-15 17:00:00.000000001"),
+    "empty": ("2030-01-01", "2030-01-31"),
+}
+COLUMNS = ["Booking ID", "Datetime", "Booking Status", "Vehicle Type", "Booking Value",
+           "Customer Rating", "Cancelled Rides by Driver", "Hour", "Weekday", "Month_Num"]
+
+
+def original_load(path):
+    """load_data() before the sorted index and the schema: file order."""
+    df = pd.read_csv(path)
+    df.columns = df.columns.str.strip()
+    df["Datetime"] = pd.to_datetime(df["Date_Time"], format="%Y-%m-%d %H:%M:%S", errors="coerce")
+    df = df.dropna(subset=["Datetime"])
+    df["Hour"] = df["Datetime"].dt.hour
+    df["Weekday"] = df["Datetime"].dt.day_name()
+    df["Month_Num"] = df["Datetime"].dt.month
+    return df
+
+
+def original_filter(df, start_date, end_date):
+    if start_date and end_date:
+        start = pd.to_datetime(start_date)
+        end = pd.to_datetime(end_date)
+        return df[(df["Datetime"] >= start) & (df["Datetime"] <= end)]
+    return df
+
+
+@pytest.fixture(scope="module")
+def frames(tmp_path_factory):
+    # Synthetic rows are in random time order, and some share a second
+    path = tmp_path_factory.mktemp("data") / "rides.csv"
+    synthetic.make_chunk(np.random.default_rng(0), 0, 20_000, 2_000).to_csv(path, index=False)
+    original = original_load(path)
+    assert not original["Datetime"].is_monotonic_increasing
+    assert original["Datetime"].duplicated().any()
+    return original, load_data(str(path), use_cache=False)
+
+
+@pytest.mark.parametrize("name", RANGES)
+def test_same_rows_as_the_original_masks(frames, name):
+    original, df = frames
+    expected = original_filter(original, *RANGES[name])
+    actual = filter_data(df, *RANGES[name])
+
+    # The original rows, in time order with ties in file order
+    expected = expected.sort_values("Datetime", kind="stable")
+    assert list(actual["Booking ID"]) == list(expected["Booking ID"])
+    for col in COLUMNS:
+        old, new = expected[col], actual[col]
+        if col in INT8_COLUMNS and old.dtype.kind == "f":
+            old = old.fillna(0)  # the schema stores missing flags as 0
+        if old.dtype.kind in "iuf":
+            np.testing.assert_allclose(new.to_numpy("float64"), old.to_numpy("float64"), rtol=1e-6)
+        else:
+            assert list(new.astype(object).where(new.notna(), None)) == \
+                list(old.astype(object).where(old.notna(), None)), col
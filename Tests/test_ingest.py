@@ -0,0 +1,67 @@
+"""Rows ingested by tailing a CSV against loading the whole file.
+
+Run from the project root with `python -m pytest`.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from Benchmarks import synthetic
+from Utils import dataset, preprocessing
+from Utils.dataset import Dataset
+from Utils.ingest import Ingestor, Tailer
+from Utils.preprocessing import load_data
+
+
+@pytest.fixture
+def lines(tmp_path, monkeypatch):
+    # Parquet caches of the test files go to the test's directory
+    monkeypatch.setattr(preprocessing, "CACHE_DIR", str(tmp_path / "cache"))
+    chunk = synthetic.make_chunk(np.random.default_rng(0), 0, 3_000, 500)
+    return chunk.to_csv(index=False).encode().splitlines(keepends=True)
+
+
+def append(path, data):
+    with open(path, "ab") as f:
+        f.write(data)
+
+
+def test_tailer_leaves_a_split_line_for_the_next_read(tmp_path, lines):
+    path = tmp_path / "rides.csv"
+    path.write_bytes(lines[0] + lines[1])
+    tailer = Tailer(str(path))
+    assert len(tailer.read()) == 1
+
+    half = len(lines[2]) // 2
+    append(path, lines[2][:half])
+    assert tailer.read() is None
+    append(path, lines[2][half:] + lines[3])
+    rows = tailer.read()
+    expected = pd.read_csv(path).iloc[1:3].reset_index(drop=True)
+    pd.testing.assert_frame_equal(rows, expected)
+
+
+def test_ingested_rows_match_a_full_load(tmp_path, lines, monkeypatch):
+    # Small enough that the larger batches get compacted into the main frame
+    monkeypatch.setattr(dataset, "COMPACT_MIN_ROWS", 500)
+    path = tmp_path / "rides.csv"
+    path.write_bytes(b"".join(lines[:1001]))
+    data = Dataset(str(path)).load()
+    ingest = Ingestor(data, str(path))
+
+    # Batches mostly ending mid-line
+    rest = b"".join(lines[1001:])
+    cuts = [0, 1_000, len(rest) // 3 + 7, len(rest) // 2, len(rest)]
+    compacted = False
+    for start, end in zip(cuts, cuts[1:]):
+        append(path, rest[start:end])
+        ingest.poll()
+        compacted |= not len(data.parts[1])
+
+    expected = load_data(str(path), use_cache=False)
+    assert compacted
+    assert data.ingested_rows == len(expected) - 1000
+    actual = data.rows()
+    # Categories come out in order of appearance rather than sorted
+    assert list(actual.dtypes.astype(str)) == list(expected.dtypes.astype(str))
+    pd.testing.assert_frame_equal(actual, expected, check_categorical=False)
@@ -0,0 +1,40 @@
+"""Timings of callbacks run as background jobs reach /metrics.
+
+Run from the project root with `python -m pytest`.
+"""
+import os
+
+from flask import Flask
+
+from Callbacks import background, callbacks  # noqa: F401 (registers the job hook)
+from Utils import metrics
+
+
+@metrics.instrument
+def update_page(start_date, end_date, set_progress=None):
+    with metrics.stage("aggregate"):
+        return start_date, end_date
+
+
+def job(key, progress_key, args, context):
+    update_page("2024-01-01", "2024-01-31", lambda *_: None)
+
+
+def test_background_job_timing_reaches_metrics(tmp_path, monkeypatch):
+    monkeypatch.delenv("UBER_BACKGROUND", raising=False)
+    monkeypatch.setenv("UBER_BACKGROUND_DIR", str(tmp_path))
+    monkeypatch.setattr(metrics, "_sources", [])
+    manager = background.manager_from_env()
+    metrics.collect_from(manager.handle)
+    server = Flask(__name__)
+    metrics.init_app(server)
+
+    # Dash starts jobs while handling a callback request, so the job process
+    # is forked with that request's context
+    with server.test_request_context("/_dash-update-component", method="POST"):
+        pid = manager.call_job_fn("key", job, (), {})
+    os.waitpid(pid, 0)
+
+    body = server.test_client().get("/metrics").get_data(as_text=True)
+    assert 'uber_callback_seconds_count{callback="update_page"} 1' in body
+    assert 'uber_callback_stage_seconds_count{callback="update_page",stage="aggregate"} 1' in body
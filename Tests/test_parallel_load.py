@@ -0,0 +1,30 @@
+"""load_csv_parallel against parse_csv on the same file.
+
+Run from the project root with `python -m pytest`.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from Benchmarks import synthetic
+from Utils.parallel_load import PAGE_COLUMNS, load_csv_parallel
+from Utils.preprocessing import parse_csv
+
+
+def write_csv(path, padded=False):
+    chunk = synthetic.make_chunk(np.random.default_rng(0), 0, 5_000, 1_000)
+    if padded:
+        # Header names with padding, which prepare() strips
+        chunk.columns = [f" {col} " for col in chunk.columns]
+    chunk.to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.mark.parametrize("padded", [False, True], ids=["plain header", "padded header"])
+@pytest.mark.parametrize("usecols", [None, PAGE_COLUMNS], ids=["all columns", "page columns"])
+def test_parallel_matches_serial(tmp_path, padded, usecols):
+    path = write_csv(tmp_path / "rides.csv", padded)
+    expected = parse_csv(path, usecols=usecols)
+    # Small chunks, so the file is split into many byte ranges
+    actual = load_csv_parallel(path, workers=2, chunk_bytes=64 * 1024, usecols=usecols)
+    pd.testing.assert_frame_equal(actual, expected)
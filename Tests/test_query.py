@@ -0,0 +1,95 @@
+"""Cross-filtered selection, with and without row-id indexes, against masks.
+
+Run from the project root with `python -m pytest`.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from Benchmarks import synthetic
+from Utils import dataset, preprocessing
+from Utils.dataset import Dataset
+from Utils.preprocessing import filter_data, prepare
+from Utils.query import FrameIndex, normalize
+
+RANGES = {
+    "all rows": (None, None),
+    "month": ("2024-06-01", "2024-06-30"),
+    "partial days": ("2024-03-05 10:30", "2024-03-19 14:15"),
+    "empty": ("2030-01-01", "2030-01-31"),
+    "reversed": ("2024-06-30", "2024-06-01"),
+}
+FILTERS = {
+    "one value": {"Vehicle Type": ["Bike"]},
+    "several values": {"Vehicle Type": ["Bike", "Auto", "Uber XL"]},
+    "several columns": {"Vehicle Type": ["Bike", "Auto"], "Payment Method": ["UPI", "Cash"],
+                        "Booking Status": ["Completed"]},
+    "no such value": {"Vehicle Type": ["Rickshaw"], "Payment Method": ["UPI"]},
+}
+
+
+def chunk(seed, start, rows):
+    return synthetic.make_chunk(np.random.default_rng(seed), start, rows, 2_000)
+
+
+def masked(df, start, end, filters):
+    """The plain boolean-mask selection, for reference."""
+    mask = np.ones(len(df), bool)
+    if start and end:
+        mask &= ((df["Datetime"] >= pd.to_datetime(start)) & (df["Datetime"] <= pd.to_datetime(end))).to_numpy()
+    for col, values in filters:
+        mask &= df[col].isin(values).to_numpy() if col in df.columns else False
+    return df[mask]
+
+
+def assert_same_rows(actual, expected):
+    assert list(actual["Booking ID"]) == list(expected["Booking ID"])
+
+
+@pytest.fixture(scope="module")
+def frame():
+    return prepare(chunk(0, 0, 20_000))
+
+
+@pytest.fixture(scope="module")
+def index(frame):
+    return FrameIndex(frame)
+
+
+@pytest.mark.parametrize("range_name", RANGES)
+@pytest.mark.parametrize("filter_name", FILTERS)
+def test_selection_matches_masks(frame, index, range_name, filter_name):
+    start, end = RANGES[range_name]
+    filters = normalize(FILTERS[filter_name])
+    expected = masked(frame, start, end, filters)
+    assert_same_rows(filter_data(frame, start, end, filters), expected)
+    assert_same_rows(filter_data(frame, start, end, filters, index), expected)
+
+
+def test_column_missing_from_the_frame_matches_nothing(frame):
+    without = frame.drop(columns="Payment Method")
+    filters = normalize({"Vehicle Type": ["Bike"], "Payment Method": ["UPI"]})
+    assert filter_data(without, *RANGES["month"], filters).empty
+    assert filter_data(without, *RANGES["month"], filters, FrameIndex(without)).empty
+
+
+def test_appended_rows_are_selected(tmp_path, monkeypatch):
+    monkeypatch.setattr(preprocessing, "CACHE_DIR", str(tmp_path / "cache"))
+    # Small enough that the second batch is compacted into the main frame
+    monkeypatch.setattr(dataset, "COMPACT_MIN_ROWS", 3_000)
+    path = tmp_path / "rides.csv"
+    chunk(0, 0, 10_000).to_csv(path, index=False)
+    data = Dataset(str(path)).load()
+    filters = normalize(FILTERS["several columns"])
+    data.rows(*RANGES["month"], filters)  # builds the index of the loaded frame
+
+    batches = [prepare(chunk(1, 10_000, 1_000)), prepare(chunk(2, 11_000, 3_000))]
+    rows = 10_000
+    for batch, compacted in zip(batches, (False, True)):
+        data.append(batch)
+        rows += len(batch)
+        assert (len(data.parts[1]) == 0) == compacted
+        everything = data.rows()
+        assert len(everything) == rows
+        for start, end in RANGES.values():
+            assert_same_rows(data.rows(start, end, filters), masked(everything, start, end, filters))
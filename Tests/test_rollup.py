@@ -0,0 +1,74 @@
+"""Rollup.query against the same aggregates computed from the raw rows.
+
+Run from the project root with `python -m pytest`.
+"""
+import numpy as np
+import pytest
+
+from Benchmarks import synthetic
+from Utils.preprocessing import filter_data, prepare
+from Utils.rollup import Rollup
+
+RANGES = {
+    "year": ("2024-01-01", "2024-12-31"),
+    "whole days": ("2024-03-01", "2024-03-31"),
+    "partial first and last days": ("2024-03-05 10:30", "2024-03-19 14:15"),
+    "within one day": ("2024-06-15 08:00", "2024-06-15 17:00"),
+    "empty": ("2030-01-01", "2030-01-31"),
+}
+
+
+@pytest.fixture(scope="module")
+def frame():
+    chunk = synthetic.make_chunk(np.random.default_rng(0), 0, 20_000, 10_000)
+    return prepare(chunk)
+
+
+@pytest.fixture(scope="module")
+def rollup(frame):
+    return Rollup.from_frame(frame)
+
+
+def rows_between(frame):
+    return lambda start, end: filter_data(frame, start, end)
+
+
+def assert_counts(summary, rows, col):
+    expected = rows[col].value_counts()
+    expected = expected[expected > 0].sort_index()
+    actual = summary.counts(col).sort_index()
+    assert list(actual.index) == list(expected.index)
+    assert np.array_equal(actual.to_numpy(), expected.to_numpy())
+
+
+@pytest.mark.parametrize("name", RANGES)
+def test_query_matches_raw_rows(frame, rollup, name):
+    start, end = RANGES[name]
+    summary = rollup.query(rows_between(frame), start, end)
+    rows = filter_data(frame, start, end)
+
+    assert summary.total("bookings") == len(rows)
+    assert summary.total("customer_cancelled") == rows["Cancelled Rides by Customer"].sum()
+    assert summary.total("driver_cancelled") == rows["Cancelled Rides by Driver"].sum()
+    assert np.isclose(summary.total("revenue"), rows["Booking Value"].astype("float64").sum())
+    for col in ("Booking Status", "Vehicle Type", "Payment Method"):
+        assert_counts(summary, rows, col)
+
+    rating = rows["Customer Rating"].astype("float64")
+    assert summary.total("five_star") == (rating == 5).sum()
+    np.testing.assert_allclose(summary.average_rating(), rating.mean())
+    by_vehicle = rating.groupby(rows["Vehicle Type"], observed=True).mean().sort_index()
+    np.testing.assert_allclose(
+        summary.average_rating_by_vehicle().reindex(by_vehicle.index).to_numpy(), by_vehicle.to_numpy()
+    )
+
+    daily = rows["Booking Value"].astype("float64").groupby(rows["Datetime"].dt.normalize()).sum()
+    revenue = summary.daily("revenue").reindex(daily.index) if len(daily) else summary.daily("revenue")
+    np.testing.assert_allclose(revenue.to_numpy(), daily.to_numpy())
+
+
+def test_empty_range_is_empty(frame, rollup):
+    summary = rollup.query(rows_between(frame), *RANGES["empty"])
+    assert summary.total("bookings") == 0
+    assert summary.counts("Booking Status").empty
+    assert np.isnan(summary.average_rating())
@@ -0,0 +1,86 @@
+"""The raw data table's filter_query parsing and evaluation.
+
+Run from the project root with `python -m pytest`.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from Benchmarks import synthetic
+from Utils.preprocessing import prepare
+from Utils.table import apply_filter, parse_filter_query
+
+
+@pytest.fixture(scope="module")
+def frame():
+    return prepare(synthetic.make_chunk(np.random.default_rng(0), 0, 5_000, 1_000))
+
+
+def select(frame, filter_query):
+    return apply_filter(frame, parse_filter_query(filter_query))
+
+
+def test_parse_terms():
+    assert parse_filter_query("") == []
+    assert parse_filter_query(
+        '{Vehicle Type} scontains Auto && {Booking Value} s> 100 && {Payment Method} i= "upi"'
+        " && {Customer Rating} is blank"
+    ) == [
+        ("Vehicle Type", "contains", "Auto", True),
+        ("Booking Value", "gt", "100", True),
+        ("Payment Method", "eq", "upi", False),
+        ("Customer Rating", "blank", None, True),
+    ]
+
+
+def test_case_prefixes(frame):
+    autos = frame[frame["Vehicle Type"] == "Auto"]
+    assert len(autos)
+    assert select(frame, "{Vehicle Type} scontains auto").empty
+    assert select(frame, "{Vehicle Type} icontains auto").equals(autos)
+    assert select(frame, "{Vehicle Type} s= Auto").equals(autos)
+    assert select(frame, "{Vehicle Type} s= auto").empty
+    assert select(frame, "{Vehicle Type} i= auto").equals(autos)
+
+
+def test_float32_equality(frame):
+    value = frame["Booking Value"].dropna().iloc[0]
+    assert frame["Booking Value"].dtype == "float32"
+    # The value as the table shows it, e.g. 38.31, not its float64 widening
+    text = str(value)
+    equal = frame["Booking Value"] == value
+    assert select(frame, f"{{Booking Value}} = {text}").equals(frame[equal])
+    assert select(frame, f"{{Booking Value}} != {text}").equals(frame[~equal])
+
+
+@pytest.mark.parametrize("op", [">=", ">", "<=", "<"])
+def test_datetime_range_narrowing(frame, op):
+    # A time some rows have exactly, so each bound's side matters
+    when = frame["Datetime"].iloc[len(frame) // 2]
+    compare = {">=": frame["Datetime"] >= when, ">": frame["Datetime"] > when,
+               "<=": frame["Datetime"] <= when, "<": frame["Datetime"] < when}[op]
+    assert select(frame, f"{{Datetime}} {op} {when}").equals(frame[compare])
+
+
+def test_datetime_range_with_other_terms(frame):
+    query = "{Datetime} >= 2024-03-01 && {Datetime} < 2024-04-01 && {Booking Status} = Completed"
+    expected = frame[(frame["Datetime"] >= "2024-03-01") & (frame["Datetime"] < "2024-04-01")
+                     & (frame["Booking Status"] == "Completed")]
+    assert len(expected)
+    assert select(frame, query).equals(expected)
+
+
+@pytest.mark.parametrize("filter_query", [
+    "{Vehicle Type} resembles Auto",
+    "Vehicle Type = Auto",
+    "{Vehicle Type} is something",
+    "{Vehicle Type} = Auto && {Booking Value}",
+])
+def test_unsupported_terms_are_rejected(frame, filter_query):
+    with pytest.raises(ValueError, match="Unsupported filter"):
+        parse_filter_query(filter_query)
+
+
+def test_unknown_column_is_rejected(frame):
+    with pytest.raises(ValueError, match="Unknown column"):
+        select(frame, "{No Such Column} = 1")
@@ -0,0 +1,75 @@
+"""TopK queries against value_counts() over the raw rows.
+
+Run from the project root with `python -m pytest`.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from Benchmarks import synthetic
+from Utils.preprocessing import filter_data, prepare
+from Utils.topk import TopK
+
+RANGES = {
+    "all rows": (None, None),
+    "year": ("2024-01-01", "2024-12-31 23:59:59"),
+    "whole months": ("2024-03-01", "2024-05-31 23:59:59"),
+    "partial first and last days": ("2024-02-10 10:30", "2024-07-19 14:15"),
+    "within one day": ("2024-06-15 08:00", "2024-06-15 17:00"),
+}
+K = 5
+
+
+@pytest.fixture(scope="module")
+def frame():
+    return prepare(synthetic.make_chunk(np.random.default_rng(0), 0, 30_000, 3_000))
+
+
+def rows_between(frame):
+    return lambda start, end: filter_data(frame, start, end)
+
+
+def true_counts(frame, start, end):
+    return filter_data(frame, start, end)["Customer ID"].value_counts()
+
+
+@pytest.mark.parametrize("name", RANGES)
+def test_exact_matches_value_counts(frame, name):
+    start, end = RANGES[name]
+    top = TopK.from_frame(frame, "Customer ID").query(rows_between(frame), start, end, K, "exact")
+    expected = true_counts(frame, start, end)
+    # Equal counts may be listed in either order, so compare counts per label
+    assert list(top.to_numpy()) == list(expected.head(K).to_numpy())
+    assert all(expected[label] == count for label, count in top.items())
+    assert top.attrs["error"] == 0
+
+
+@pytest.mark.parametrize("name", RANGES)
+def test_approximate_counts_are_within_the_error(frame, name):
+    start, end = RANGES[name]
+    # Few values kept per month, so the summaries do drop some
+    index = TopK.from_frame(frame, "Customer ID", capacity=20)
+    top = index.query(rows_between(frame), start, end, K, "approx")
+    expected = true_counts(frame, start, end)
+    error = index.error(start, end)
+    assert top.attrs["error"] == error
+    if name in ("year", "whole months"):
+        assert error > 0
+    for label, count in top.items():
+        assert 0 <= expected[label] - count <= error
+
+
+def test_add_matches_a_full_rebuild(frame):
+    # Split mid-month, so both sides touch the same days and months
+    cut = frame.index.searchsorted(pd.Timestamp("2024-06-15 12:00"))
+    full = TopK.from_frame(frame, "Customer ID", capacity=20)
+    added = TopK.from_frame(frame.iloc[:cut], "Customer ID", capacity=20)
+    # Month summaries built before the add must not survive it
+    added.query(rows_between(frame), *RANGES["year"], K, "approx")
+    added = added.add(TopK.from_frame(frame.iloc[cut:], "Customer ID", capacity=20))
+    for start, end in RANGES.values():
+        for mode in ("exact", "approx"):
+            expected = full.query(rows_between(frame), start, end, K, mode)
+            actual = added.query(rows_between(frame), start, end, K, mode)
+            pd.testing.assert_series_equal(actual, expected)
+            assert actual.attrs == expected.attrs
@@ -0,0 +1,59 @@
+import os
+
+import pandas as pd
+
+# Time-series charts pick their bucket size from the selected range: the
+# finest granularity that keeps a trace within UBER_CHART_MAX_POINTS points
+# (default 400), so a two-week range plots hours, a year days and a decade
+# months, and a figure's size stays bounded whatever the range.
+#
+# Granularity -> pandas period frequency. Hours come from the rollup's
+# day x hour tables, days from its per-day totals, and coarser buckets are
+# sums of whole days, so no bucket ever re-reads raw rows.
+GRANULARITIES = {
+    "hour": "h",
+    "day": "D",
+    "week": "W",
+    "month": "M",
+    "quarter": "Q",
+    "year": "Y",
+}
+HOURS = 24
+
+
+def max_points():
+    return int(os.environ.get("UBER_CHART_MAX_POINTS") or 400)
+
+
+def count(start, end, granularity):
+    """Number of buckets of the granularity touched by [start, end]."""
+    freq = GRANULARITIES[granularity]
+    return pd.Period(end, freq).ordinal - pd.Period(start, freq).ordinal + 1
+
+
+def choose(start, end, limit=None):
+    """The finest granularity with at most `limit` buckets in the range."""
+    limit = limit or max_points()
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    # A picked end date means the whole day
+    if end == end.normalize():
+        end += pd.Timedelta(days=1) - pd.Timedelta(1, "ns")
+    for granularity in GRANULARITIES:
+        if count(start, end, granularity) <= limit:
+            return granularity
+    return granularity
+
+
+def hourly(table):
+    """Flatten a day x hour table into one value per hour."""
+    table = table.reindex(columns=range(HOURS), fill_value=0)
+    index = (table.index.to_numpy()[:, None] + pd.to_timedelta(range(HOURS), "h").to_numpy()).ravel()
+    return pd.Series(table.to_numpy().ravel(), index=pd.DatetimeIndex(index, name="Time"))
+
+
+def bucketed(daily, granularity):
+    """Sum a per-day series into buckets labelled by their first day."""
+    if granularity == "day" or not len(daily):
+        return daily
+    start = daily.index.to_period(GRANULARITIES[granularity]).to_timestamp()
+    return daily.groupby(start).sum().rename_axis(daily.index.name)
@@ -0,0 +1,125 @@
+import calendar
+
+import numpy as np
+import pandas as pd
+
+# Who cancelled: flag column and reason column
+PARTIES = {
+    "customer": ("Cancelled Rides by Customer", "Reason for cancelling by Customer"),
+    "driver": ("Cancelled Rides by Driver", "Driver Cancellation Reason"),
+}
+HOURS = 24
+
+
+def table_name(party, dimension):
+    return f"{party}_cancelled_by_{dimension}"
+
+
+def category_codes(values):
+    # Integer codes and labels; missing values get code len(labels)
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes = values.cat.codes.to_numpy().astype(np.int64)
+        labels = np.asarray(values.cat.categories)
+    else:
+        codes, labels = pd.factorize(values)
+        codes = codes.astype(np.int64)
+    codes[codes < 0] = len(labels)
+    return codes, labels
+
+
+def daily_tables(df, day):
+    """Per-day cancellation counts by hour, vehicle type and reason.
+
+    Every cancelled row is encoded once as (day, party, hour, vehicle,
+    reason) and counted with a single np.bincount; the per-dimension tables
+    are sums over the axes of that one cube, so adding breakdowns costs no
+    further passes over the rows. Weekdays and the timeline follow from the
+    day index.
+    """
+    parties = [p for p, (flag, _) in PARTIES.items() if flag in df.columns]
+    if not parties or not len(df):
+        return {}
+
+    day_codes, days = pd.factorize(day.to_numpy(), sort=True)
+    hour = df["Datetime"].dt.hour.to_numpy().astype(np.int64)
+    if "Vehicle Type" in df.columns:
+        vehicle, vehicles = category_codes(df["Vehicle Type"])
+    else:
+        vehicle, vehicles = np.zeros(len(df), np.int64), np.array([])
+
+    # Reasons of both parties share one axis: each party's codes are offset
+    # past the other's, and each has its own "missing" slot
+    keys, reason_labels, offset = [], {}, 0
+    for party_index, party in enumerate(parties):
+        flag, reason_col = PARTIES[party]
+        rows = np.flatnonzero(df[flag].to_numpy() > 0)
+        if reason_col in df.columns:
+            reason, labels = category_codes(df[reason_col])
+            reason = reason[rows]
+        else:
+            reason, labels = np.zeros(len(rows), np.int64), np.array([])
+        reason_labels[party] = (offset, labels)
+        keys.append((day_codes[rows], np.full(len(rows), party_index), hour[rows], vehicle[rows], reason + offset))
+        offset += len(labels) + 1
+
+    shape = (len(days), len(parties), HOURS, len(vehicles) + 1, offset)
+    d, p, h, v, r = (np.concatenate(axis) for axis in zip(*keys))
+    cube = np.bincount(np.ravel_multi_index((d, p, h, v, r), shape), minlength=int(np.prod(shape)))
+    cube = cube.reshape(shape)
+
+    index = pd.DatetimeIndex(days, name="Day")
+    tables = {}
+    for party_index, party in enumerate(parties):
+        counts = cube[:, party_index]
+        by_hour = counts.sum(axis=(2, 3))
+        by_vehicle = counts.sum(axis=(1, 3))[:, :len(vehicles)]
+        start, labels = reason_labels[party]
+        by_reason = counts.sum(axis=(1, 2))[:, start:start + len(labels)]
+        tables[table_name(party, "hour")] = pd.DataFrame(by_hour, index=index, columns=np.arange(HOURS))
+        tables[table_name(party, "vehicle")] = pd.DataFrame(by_vehicle, index=index, columns=vehicles)
+        tables[table_name(party, "reason")] = pd.DataFrame(by_reason, index=index, columns=labels)
+    return tables
+
+
+def breakdowns(summary, granularity="day"):
+    """All cancellation breakdowns of a Rollup (e.g. Dataset.summary()) at once.
+
+    Returns DataFrames with one column per party for "timeline" (per time
+    bucket of the granularity, see Utils.buckets),
+    "hour", "weekday" and "vehicle"; "weekday_hour" (weekday x hour, both
+    parties together); and "reason", a Series of counts per party.
+    """
+    tables = summary.tables
+    parties = [p for p in PARTIES if table_name(p, "hour") in tables]
+
+    def per_party(dimension, reduce):
+        return pd.DataFrame({p: reduce(tables[table_name(p, dimension)]) for p in parties}).astype("int64")
+
+    def by_weekday(table):
+        return table.sum(axis=1).groupby(table.index.dayofweek).sum()
+
+    weekday = per_party("hour", by_weekday).reindex(range(7), fill_value=0)
+    weekday.index = list(calendar.day_name)
+
+    if parties:
+        hourly = sum(tables[table_name(p, "hour")] for p in parties)
+    else:
+        hourly = pd.DataFrame(0, index=pd.DatetimeIndex([], name="Day"), columns=range(HOURS))
+    weekday_hour = hourly.groupby(hourly.index.dayofweek).sum().reindex(range(7), fill_value=0)
+    weekday_hour.index = list(calendar.day_name)
+    weekday_hour = weekday_hour.astype("int64")
+
+    return {
+        "timeline": pd.DataFrame(
+            {p: summary.over_time(f"{p}_cancelled", granularity) for p in parties}
+        ).fillna(0).astype("int64"),
+        "hour": per_party("hour", lambda t: t.sum()).reindex(range(HOURS), fill_value=0),
+        "weekday": weekday,
+        "weekday_hour": weekday_hour,
+        "vehicle": per_party("vehicle", lambda t: t.sum()).fillna(0),
+        "reason": {p: _present(tables[table_name(p, "reason")].sum()) for p in parties},
+    }
+
+
+def _present(counts):
+    return counts[counts > 0].astype("int64").sort_values(ascending=False)
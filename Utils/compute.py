@@ -0,0 +1,63 @@
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from Utils import metrics
+
+# Page computations (the pandas/NumPy aggregation behind each page) run on a
+# bounded per-process thread pool. However many requests a worker accepts
+# (gthread threads, or the ASGI event loop's thread pool), at most this many
+# aggregate at once; the others wait for a slot, recorded as the "queue"
+# stage in /metrics, while cheap requests (assets, background job polls,
+# /metrics) are answered without waiting behind them:
+#   UBER_COMPUTE_THREADS  concurrent page computations per process (default:
+#                         the CPU count; 0 computes in the request thread)
+
+_pool = None
+_lock = threading.Lock()
+_on_pool = threading.local()
+
+
+def pool_size():
+    return int(os.environ.get("UBER_COMPUTE_THREADS") or os.cpu_count() or 1)
+
+
+def _pool_thread():
+    _on_pool.active = True
+
+
+def pool():
+    """The process's compute pool, or None when disabled."""
+    global _pool
+    if _pool is None and pool_size() > 0:
+        with _lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(pool_size(), "compute", initializer=_pool_thread)
+    return _pool
+
+
+def _reset():
+    # Pool threads do not survive a fork (gunicorn workers, background jobs);
+    # the child starts its own pool on first use
+    global _pool, _lock
+    _pool = None
+    _lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset)
+
+
+def offload(fn):
+    """Run fn on the compute pool, waiting for a free slot."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        executor = pool()
+        if executor is None or getattr(_on_pool, "active", False):
+            return fn(*args, **kwargs)
+        # The context carries the callback's metrics and progress reporting
+        context = contextvars.copy_context()
+        with metrics.stage("queue"):
+            return executor.submit(context.run, fn, *args, **kwargs).result()
+    return wrapper
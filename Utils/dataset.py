@@ -0,0 +1,222 @@
+import os
+import threading
+import time
+
+import pandas as pd
+
+from Utils import metrics
+from Utils.preprocessing import (
+    DATA_PATH, combine_chunks, concat_frames, filter_data, load_data, source_fingerprint
+)
+from Utils.query import FILTER_COLUMNS, FrameIndex
+from Utils.rollup import Rollup
+from Utils.topk import TopK, mode_from_env
+
+# Ingested rows collect in a small "delta" frame next to the main one and are
+# merged into it only once the delta outgrows this share of the main frame,
+# so appending a batch costs time proportional to the batch, not the history
+COMPACT_RATIO = 8
+COMPACT_MIN_ROWS = 100_000
+
+
+class Dataset:
+    """The loaded ride frame, its rollup and a version tag.
+
+    The version changes whenever the underlying data does, so anything
+    cached against it (see Utils.memo) is invalidated by loading changed
+    data or by newly ingested rows.
+
+    Nothing is read on construction: load() reads the data, load_async()
+    does so in a background thread, and every accessor waits for it.
+
+    The top customers and row-id indexes are built on first use, or with
+    eager_indexes along with the data, so that processes forked afterwards
+    (background jobs) share them instead of each building its own.
+    """
+
+    def __init__(self, path=DATA_PATH, eager_indexes=False):
+        self.path = path
+        self.eager_indexes = eager_indexes
+        self.parts = (None, None)
+        self.rollup = None
+        self.customers = None
+        self.has_customers = False
+        self.indexes = None
+        self.source_size = 0
+        self.fingerprint = None
+        self.ingested_rows = 0
+        self.version = None
+        self.load_seconds = None
+        self.lock = threading.Lock()
+        self.loaded = threading.Event()
+        self.starting = threading.Lock()
+        self.loader = None
+        self.error = None
+
+    def load(self):
+        started = time.perf_counter()
+        with self.lock:
+            # Size before reading: rows appended after this are ingested
+            self.source_size = os.path.getsize(self.path)
+            df = load_data(self.path)
+            self.parts = (df, df.iloc[:0])
+            self.rollup = Rollup.from_frame(df)
+            # The top-k index only serves the Ratings page, and the row-id
+            # indexes only cross-filtered queries
+            self.has_customers = "Customer ID" in df.columns
+            eager = self.eager_indexes
+            self.customers = self.build_customers() if eager and self.has_customers else None
+            self.indexes = (df, FrameIndex(df)) if eager else None
+            self.fingerprint = source_fingerprint(self.path)
+            self.ingested_rows = 0
+            self.version = self.fingerprint
+        self.load_seconds = time.perf_counter() - started
+        self.loaded.set()
+        return self
+
+    def load_async(self):
+        """Start load() in a background thread; accessors wait for it."""
+        def run():
+            try:
+                self.load()
+            except BaseException as exc:
+                self.error = exc
+                print(f"Loading {self.path} failed: {exc!r}", flush=True)
+                self.loaded.set()
+
+        self.loader = threading.Thread(target=run, name="load-data", daemon=True)
+        self.loader.start()
+        return self
+
+    def wait(self):
+        """Block until the data is loaded (re-raising a failed load).
+
+        Starts loading if nobody has yet.
+        """
+        if not self.loaded.is_set():
+            with self.starting:
+                if self.loader is None:
+                    self.load_async()
+                elif not self.loader.is_alive() and not self.loaded.is_set():
+                    # Forked while loading: the thread did not come along,
+                    # and the lock it held stays held in this process
+                    self.lock = threading.Lock()
+                    self.load_async()
+            self.loaded.wait()
+        if self.error is not None:
+            raise RuntimeError(f"Loading {self.path} failed") from self.error
+        return self
+
+    def loaded_version(self):
+        # Cache keys need the version of the loaded data, not the initial None
+        return self.wait().version
+
+    @property
+    def df(self):
+        # The compacted frame; rows() also covers not-yet-compacted ones
+        return self.wait().parts[0]
+
+    def rows(self, start_date=None, end_date=None, filters=()):
+        """Raw rows in the range (all rows without one), sorted by time.
+
+        filters, normalized (column, values) pairs (see Utils.query), keep
+        only the rows matching all of them.
+        """
+        self.wait()
+        with metrics.stage("filter"):
+            df, delta = self.parts
+            rows = filter_data(df, start_date, end_date, filters, self.row_index(df) if filters else None)
+            if len(delta):
+                # The small delta is not indexed: masks over its rows are cheap
+                recent = filter_data(delta, start_date, end_date, filters)
+                if len(recent):
+                    rows = concat_frames([rows, recent])
+                    if not rows.index.is_monotonic_increasing:
+                        rows = rows.sort_index(kind="stable")
+        metrics.add_rows(len(rows))
+        return rows
+
+    def row_index(self, df):
+        """Row-id indexes of the compacted frame, built on first use."""
+        indexes = self.indexes
+        if indexes is None or indexes[0] is not df:
+            with self.lock:
+                indexes = self.indexes
+                # A compaction replaces the frame, and with it the index
+                if indexes is None or indexes[0] is not df:
+                    indexes = self.indexes = (df, FrameIndex(df))
+        return indexes[1]
+
+    def filter_values(self):
+        """The values each filter column can take, for the filter bar."""
+        df, delta = self.wait().parts
+        values = {}
+        for col in FILTER_COLUMNS:
+            if col in df.columns:
+                # Categorical columns list their values without a scan
+                present = set()
+                for frame in (df, delta):
+                    column = frame[col]
+                    if isinstance(column.dtype, pd.CategoricalDtype):
+                        present.update(column.cat.categories)
+                    else:
+                        present.update(column.dropna().unique())
+                values[col] = sorted(present)
+        return values
+
+    def summary(self, start_date, end_date, filters=()):
+        if filters:
+            # The per-day tables cover all rows, so a filtered selection is
+            # aggregated from its rows (found through the row-id indexes)
+            return Rollup.from_frame(self.rows(start_date, end_date, filters))
+        return self.wait().rollup.query(self.rows, start_date, end_date)
+
+    def top_customers(self, start_date, end_date, k, mode=None, filters=()):
+        """Bookings of the k busiest customers in the range (None without IDs)."""
+        if not self.wait().has_customers:
+            return None
+        customers = self.customers
+        if customers is None:
+            with self.lock:
+                if self.customers is None:
+                    self.customers = self.build_customers()
+                customers = self.customers
+        if filters:
+            # Counted exactly over the matching rows only
+            return customers.top_of(self.rows(start_date, end_date, filters), k)
+        return customers.query(self.rows, start_date, end_date, k, mode or mode_from_env())
+
+    def build_customers(self):
+        df, delta = self.parts
+        customers = TopK.from_frame(df, "Customer ID")
+        if len(delta):
+            customers = customers.add(TopK.from_frame(delta, "Customer ID"))
+        return customers
+
+    def append(self, batch):
+        """Merge a prepared batch (see preprocessing.prepare) into the data."""
+        if not len(batch):
+            return
+        self.wait()
+        with self.lock:
+            df, delta = self.parts
+            delta = concat_frames([delta, batch])
+            if not delta.index.is_monotonic_increasing:
+                delta = delta.sort_index(kind="stable")
+            if len(delta) > max(COMPACT_MIN_ROWS, len(df) // COMPACT_RATIO):
+                df = concat_frames([df, delta])
+                if not df.index.is_monotonic_increasing:
+                    df = df.sort_index(kind="stable")
+                df = combine_chunks(df)
+                delta = df.iloc[:0]
+
+            # Swap in the new state: parts as one tuple so readers never see
+            # a compacted frame together with the delta it absorbed
+            self.rollup = self.rollup.add(Rollup.from_frame(batch))
+            if self.customers is not None:
+                self.customers = self.customers.add(TopK.from_frame(batch, "Customer ID"))
+            if self.eager_indexes and df is not self.parts[0]:
+                self.indexes = (df, FrameIndex(df))
+            self.parts = (df, delta)
+            self.ingested_rows += len(batch)
+            self.version = f"{self.fingerprint}+{self.ingested_rows}"
@@ -0,0 +1,129 @@
+import io
+import os
+import zlib
+from urllib.parse import urlencode
+
+import pandas as pd
+from flask import Response, abort, request
+
+from Utils import query
+
+# Raw data export at GET /export?start_date=...&end_date=...&format=csv|parquet
+# (&gzip=1), optionally cross-filtered with one parameter per selected value,
+# e.g. &Vehicle+Type=Auto&Vehicle+Type=Bike. The rows are streamed in chunks
+# as they are encoded, so memory stays bounded by one chunk however large the
+# range; the range itself is a slice of the loaded frame, not a copy (a
+# filtered export copies just the matching rows). Exports encode in the request
+# thread, not on the compute pool (Utils/compute.py), so a long download
+# never holds a slot the dashboard callbacks are waiting for:
+#   UBER_EXPORT_CHUNK_ROWS  rows encoded per chunk (default 50000)
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+PARQUET_MAX_CATEGORIES = 1_000
+
+
+def chunk_rows():
+    return int(os.environ.get("UBER_EXPORT_CHUNK_ROWS") or 50_000)
+
+
+def csv_chunks(rows, size):
+    for start in range(0, max(len(rows), 1), size):
+        yield rows.iloc[start:start + size].to_csv(index=False, header=start == 0).encode()
+
+
+class _Sink(io.RawIOBase):
+    """Write-only file collecting what the Parquet writer has written so far."""
+
+    def __init__(self):
+        self.parts = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def take(self):
+        data, self.parts = b"".join(self.parts), []
+        return data
+
+
+def parquet_chunks(rows, size):
+    # One row group per chunk, flushed to the client as soon as it is written
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # The schema of the empty frame, so an all-missing chunk is typed alike.
+    # Arrow repeats a categorical's whole dictionary in every row group, so
+    # large ones (Customer ID) are written as strings instead, which Parquet
+    # dictionary-encodes per row group with only the values that occur
+    schema = pa.Schema.from_pandas(rows.iloc[:0], preserve_index=False)
+    schema = pa.schema([
+        field.with_type(field.type.value_type)
+        if pa.types.is_dictionary(field.type) and len(rows[field.name].cat.categories) > PARQUET_MAX_CATEGORIES
+        else field
+        for field in schema
+    ], metadata=schema.metadata)
+    sink = _Sink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for start in range(0, len(rows), size):
+            table = pa.Table.from_pandas(rows.iloc[start:start + size], preserve_index=False)
+            writer.write_table(table.cast(schema))
+            yield sink.take()
+    yield sink.take()
+
+
+def gzipped(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # 31: gzip container
+    for chunk in chunks:
+        if data := compressor.compress(chunk):
+            yield data
+    yield compressor.flush()
+
+
+def export_chunks(rows, fmt="csv", gzip=False, size=None):
+    """The encoded rows as an iterator of byte strings."""
+    size = size or chunk_rows()
+    chunks = csv_chunks(rows, size) if fmt == "csv" else parquet_chunks(rows, size)
+    return gzipped(chunks) if gzip else chunks
+
+
+def href(start_date, end_date, fmt="csv", gzip=False, filters=()):
+    """Link to the export of a date range (and cross-filters)."""
+    params = {"start_date": start_date, "end_date": end_date, "format": fmt}
+    if gzip:
+        params["gzip"] = 1
+    params.update(query.as_dict(filters))
+    return "/export?" + urlencode(params, doseq=True)
+
+
+def init_app(server, dataset):
+    """Serve GET /export for the dataset's rows in a date range."""
+
+    @server.route("/export")
+    def export():
+        fmt = request.args.get("format", "csv")
+        if fmt not in FORMATS:
+            abort(400, f"format must be one of {', '.join(FORMATS)}")
+        start_date = request.args.get("start_date")
+        end_date = request.args.get("end_date")
+        try:
+            start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        except (TypeError, ValueError):
+            start = end = pd.NaT
+        if pd.isna(start) or pd.isna(end):
+            abort(400, "start_date and end_date must be dates")
+        gzip = request.args.get("gzip", "0") not in ("0", "", "false")
+        filters = query.normalize({col: request.args.getlist(col) for col in query.FILTER_COLUMNS})
+
+        # Taken once: rows ingested while the download runs are not part of it
+        rows = dataset.rows(start_date, end_date, filters)
+        mimetype, extension = FORMATS[fmt]
+        filename = f"uber_rides_{start:%Y-%m-%d}_{end:%Y-%m-%d}.{extension}" + (".gz" if gzip else "")
+        headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+        if gzip:
+            mimetype = "application/gzip"
+        return Response(export_chunks(rows, fmt, gzip), mimetype=mimetype, headers=headers)
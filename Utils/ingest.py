@@ -0,0 +1,122 @@
+import glob
+import io
+import os
+import threading
+
+import pandas as pd
+
+from Utils.preprocessing import prepare
+
+# Incremental ingestion, configured through the environment:
+#   UBER_INGEST_PATH      append-only CSV file, or a spool directory whose
+#                         *.csv files are each tailed the same way
+#   UBER_INGEST_INTERVAL  seconds between polls (default 2)
+#   UBER_INGEST_IN_WORKERS  1 leaves starting the ingestor to each gunicorn
+#                         worker (set by gunicorn.conf.py)
+DEFAULT_INTERVAL = 2.0
+
+
+class Tailer:
+    """Reads the complete lines appended to a CSV file since the last read."""
+
+    def __init__(self, path, offset=0):
+        self.path = path
+        self.offset = offset
+        self.header = None
+
+    def read(self):
+        """New rows as a raw DataFrame, or None when nothing was appended."""
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return None
+        if size < self.offset:
+            # Truncated or replaced: not append-only any more, start over
+            self.offset = 0
+            self.header = None
+        if size == self.offset:
+            return None
+
+        with open(self.path, "rb") as f:
+            if self.header is None:
+                self.header = f.readline()
+                self.offset = max(self.offset, len(self.header))
+            f.seek(self.offset)
+            chunk = f.read(size - self.offset)
+
+        # Leave a trailing partial line for the next read
+        end = chunk.rfind(b"\n") + 1
+        if end == 0:
+            return None
+        self.offset += end
+        return pd.read_csv(io.BytesIO(self.header + chunk[:end]))
+
+
+class Ingestor:
+    """Polls a file or spool directory and appends new rows to a Dataset."""
+
+    def __init__(self, dataset, path, interval=DEFAULT_INTERVAL):
+        self.dataset = dataset
+        self.path = path
+        self.interval = interval
+        self.tailers = {}
+        self.thread = None
+        self.pid = None
+        self.stopped = threading.Event()
+
+    def sources(self):
+        if os.path.isdir(self.path):
+            return sorted(glob.glob(os.path.join(self.path, "*.csv")))
+        return [self.path]
+
+    def tailer(self, source):
+        if source not in self.tailers:
+            # The loaded data already covers the main CSV up to its size at
+            # load time; any other file is new data from its first row
+            same = os.path.abspath(source) == os.path.abspath(self.dataset.path)
+            self.tailers[source] = Tailer(source, self.dataset.source_size if same else 0)
+        return self.tailers[source]
+
+    def poll(self):
+        """Ingest everything appended since the last poll; returns the row count."""
+        batches = []
+        for source in self.sources():
+            raw = self.tailer(source).read()
+            if raw is not None and len(raw):
+                batches.append(raw)
+        if not batches:
+            return 0
+        batch = prepare(pd.concat(batches, ignore_index=True))
+        self.dataset.append(batch)
+        return len(batch)
+
+    def run(self):
+        # New rows are only new relative to the loaded data
+        self.dataset.wait()
+        while not self.stopped.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as exc:  # keep polling after a bad batch
+                print(f"Ingest from {self.path} failed: {exc!r}", flush=True)
+
+    def start(self):
+        # Threads do not survive fork: a process forked from one whose
+        # ingestor runs starts its own
+        if self.thread is not None and self.thread.is_alive() and self.pid == os.getpid():
+            return self
+        self.pid = os.getpid()
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.run, name="ingest", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+
+
+def ingestor_from_env(dataset):
+    path = os.environ.get("UBER_INGEST_PATH")
+    if not path:
+        return None
+    interval = float(os.environ.get("UBER_INGEST_INTERVAL", DEFAULT_INTERVAL))
+    return Ingestor(dataset, path, interval)
@@ -0,0 +1,260 @@
+import contextlib
+import functools
+import glob
+import hashlib
+import inspect
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+# Result cache for page computations, configured through the environment:
+#   UBER_RESULT_CACHE        memory, disk or off (default memory, or disk when
+#                            background callbacks compute in job processes)
+#   UBER_RESULT_CACHE_BYTES  size bound in bytes (default 256 MiB)
+#   UBER_RESULT_CACHE_DIR    directory of the disk backend, shared by all
+#                            gunicorn workers (default Data/.cache/results)
+#   UBER_COALESCE            0 computes concurrent identical misses separately
+DEFAULT_MAX_BYTES = 256 * 2**20
+DEFAULT_DISK_DIR = "Data/.cache/results"
+# A worker that dies mid-computation releases its cross-process lock after this
+COMPUTE_LOCK_SECONDS = 120
+# Reported by /cache-stats
+COUNTERS = ("hits", "misses", "coalesced")
+# The disk backend outlives deploys, so keys also carry a hash of the code
+# that computed the results (see source_version)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class MemoryBackend:
+    """In-process LRU bounded by the pickled size of the stored values."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.evictions = 0
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            if key not in self.entries:
+                return None, False
+            self.entries.move_to_end(key)
+            return self.entries[key][0], True
+
+    def set(self, key, value):
+        size = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                self.nbytes -= self.entries.pop(key)[1]
+            self.entries[key] = (value, size)
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.nbytes -= evicted
+                self.evictions += 1
+
+    def count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+    def counts(self):
+        return dict(self.counters)
+
+    def stats(self):
+        return {"entries": len(self.entries), "bytes": self.nbytes, "evictions": self.evictions}
+
+    def compute_lock(self, key):
+        # Threads of this process already coalesce in SingleFlight
+        return contextlib.nullcontext()
+
+
+class DiskBackend:
+    """diskcache-backed LRU shared by every process using the same directory."""
+
+    def __init__(self, directory=DEFAULT_DISK_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        import diskcache
+
+        self.cache = diskcache.Cache(
+            directory,
+            size_limit=max_bytes,
+            eviction_policy="least-recently-used",
+        )
+        # Hit/miss counters of every process sharing the directory (workers
+        # and background jobs alike), kept apart so they are never evicted
+        self.counters = diskcache.Cache(os.path.join(directory, "stats"), eviction_policy="none")
+
+    def get(self, key):
+        value = self.cache.get(key, default=_MISSING)
+        if value is _MISSING:
+            return None, False
+        return value, True
+
+    def set(self, key, value):
+        self.cache.set(key, value)
+
+    def count(self, name):
+        self.counters.incr(name)
+
+    def counts(self):
+        return {name: self.counters.get(name, 0) for name in COUNTERS}
+
+    def stats(self):
+        return {"entries": len(self.cache), "bytes": self.cache.volume()}
+
+    def compute_lock(self, key):
+        # One computation per key across every process sharing the directory;
+        # the others wait here and then find the stored result
+        import diskcache
+
+        return diskcache.Lock(self.cache, ("lock",) + key, expire=COMPUTE_LOCK_SECONDS)
+
+
+_MISSING = object()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """Runs one computation per key at a time; concurrent callers share it."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def do(self, key, fn):
+        """fn()'s result, and whether it came from another caller's call."""
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        try:
+            call.value = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
+        return call.value, False
+
+
+def source_version(*dirs):
+    """Hash of the Python sources in the given project directories.
+
+    Results stored by a different version of the code (say, a page that
+    returns more outputs since) then never match a key of this one.
+    """
+    digest = hashlib.sha1()
+    for directory in dirs:
+        for path in sorted(glob.glob(os.path.join(PROJECT_ROOT, directory, "**", "*.py"), recursive=True)):
+            digest.update(os.path.relpath(path, PROJECT_ROOT).encode())
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+class ResultCache:
+    """Memoizes page computations keyed by (page, arguments, code, data version).
+
+    Concurrent misses for the same key are coalesced: one caller computes,
+    the rest wait for its result (across processes too with the disk
+    backend), so a burst of identical requests costs one computation.
+    """
+
+    def __init__(self, backend, version, coalesce=None, code_version=None):
+        if coalesce is None:
+            coalesce = os.environ.get("UBER_COALESCE", "1") != "0"
+        self.backend = backend
+        self.version = version
+        self.code_version = code_version
+        # Off in processes that may be killed mid-computation, whose lock
+        # would outlive them until it expires
+        self.cross_process_locks = True
+        self.flights = SingleFlight() if coalesce else None
+        # Without a backend there is nothing to share them with
+        self.counters = dict.fromkeys(COUNTERS, 0)
+
+    def memoize(self, page):
+        def decorator(fn):
+            signature = inspect.signature(fn)
+
+            @functools.wraps(fn)
+            def wrapper(*args):
+                # Omitted arguments are keyed by their defaults, so f(a, b)
+                # and f(a, b, ()) share an entry
+                bound = signature.bind(*args)
+                bound.apply_defaults()
+                args = bound.args
+                key = (page, args, self.code_version, self.version())
+                if self.backend is not None:
+                    value, found = self.backend.get(key)
+                    if found:
+                        self.count("hits")
+                        return value
+                if self.flights is None:
+                    return self.compute(key, fn, args)
+                value, shared = self.flights.do(key, lambda: self.compute(key, fn, args))
+                if shared:
+                    self.count("coalesced")
+                return value
+            return wrapper
+        return decorator
+
+    def compute(self, key, fn, args):
+        if self.backend is None:
+            self.count("misses")
+            return fn(*args)
+        coalesce = self.flights is not None
+        locked = coalesce and self.cross_process_locks
+        with self.backend.compute_lock(key) if locked else contextlib.nullcontext():
+            # Another process may have stored it while this one waited
+            value, found = self.backend.get(key) if coalesce else (None, False)
+            if found:
+                self.count("hits")
+                return value
+            self.count("misses")
+            value = fn(*args)
+            self.backend.set(key, value)
+            return value
+
+    def count(self, name):
+        if self.backend is not None:
+            self.backend.count(name)
+        else:
+            self.counters[name] += 1
+
+    def stats(self):
+        stats = {"backend": type(self.backend).__name__ if self.backend else None}
+        stats.update(self.backend.counts() if self.backend is not None else self.counters)
+        if self.backend is not None:
+            stats.update(self.backend.stats())
+        return stats
+
+
+def backend_from_env(default="memory"):
+    kind = os.environ.get("UBER_RESULT_CACHE", default)
+    max_bytes = int(os.environ.get("UBER_RESULT_CACHE_BYTES", DEFAULT_MAX_BYTES))
+    if kind == "off":
+        return None
+    if kind == "disk":
+        return DiskBackend(os.environ.get("UBER_RESULT_CACHE_DIR", DEFAULT_DISK_DIR), max_bytes)
+    return MemoryBackend(max_bytes)
@@ -0,0 +1,219 @@
+import bisect
+import contextvars
+import functools
+import inspect
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import Response, g, has_request_context
+
+# Per-callback latency instrumentation, configured through the environment:
+#   UBER_SLOW_CALLBACK_MS  log callbacks slower than this, with their date
+#                          range and stage breakdown (default off)
+#
+# Stages are timed exclusively: time spent in a nested stage (filtering the
+# edge rows inside an aggregation, say) counts only towards the inner one.
+# Metrics are per process; under gunicorn each worker reports its own.
+# Background callbacks (Callbacks.background) run in job processes outside
+# of any request: their timings are queued in the jobs' shared cache
+# (spool_to) and recorded by whichever worker next serves /metrics
+# (collect_from), without a serialize stage or response size.
+STAGES = ("queue", "filter", "aggregate", "figure", "serialize")
+SLOW_CALLBACK_MS = float(os.environ.get("UBER_SLOW_CALLBACK_MS") or 0) or None
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+ROWS_BUCKETS = (0, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+BYTES_BUCKETS = (256, 1_024, 4_096, 16_384, 65_536, 262_144, 1_048_576, 4_194_304)
+
+SPOOL_PREFIX = "metrics"
+SPOOL_EXPIRE_SECONDS = 3600
+
+_current = contextvars.ContextVar("callback_timing", default=None)
+# The cache this job process queues timings in, and those /metrics drains
+_spool = None
+_sources = []
+
+
+class Histogram:
+    """Prometheus-style cumulative histogram, one series per label set."""
+
+    def __init__(self, name, help, buckets, labels):
+        self.name = name
+        self.help = help
+        self.buckets = buckets
+        self.labels = labels
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self.lock:
+            counts, total = self.series.get(label_values, ([0] * (len(self.buckets) + 1), 0))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self.series[label_values] = (counts, total + value)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            series = {key: (list(counts), total) for key, (counts, total) in self.series.items()}
+        for label_values, (counts, total) in sorted(series.items()):
+            labels = ",".join(f'{k}="{v}"' for k, v in zip(self.labels, label_values))
+            cumulative = 0
+            for bound, count in zip(list(self.buckets) + ["+Inf"], counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{labels}}} {total}")
+            lines.append(f"{self.name}_count{{{labels}}} {cumulative}")
+        return lines
+
+
+callback_seconds = Histogram(
+    "uber_callback_seconds", "Wall time of a callback request, serialization included",
+    SECONDS_BUCKETS, ("callback",))
+stage_seconds = Histogram(
+    "uber_callback_stage_seconds", "Time spent in each stage of a callback",
+    SECONDS_BUCKETS, ("callback", "stage"))
+callback_rows = Histogram(
+    "uber_callback_rows", "Raw rows a callback filtered out of the dataset",
+    ROWS_BUCKETS, ("callback",))
+response_bytes = Histogram(
+    "uber_callback_response_bytes", "Size of a callback's JSON response",
+    BYTES_BUCKETS, ("callback",))
+HISTOGRAMS = (callback_seconds, stage_seconds, callback_rows, response_bytes)
+
+
+class CallbackTiming:
+    """Stage timings and row count of one callback invocation."""
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.stages = dict.fromkeys(STAGES, 0.0)
+        self.rows = 0
+        self.nested = [0.0]
+        self.seconds = 0.0
+
+
+@contextmanager
+def stage(name):
+    """Time a stage of the running callback (a no-op outside of one)."""
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    timing.nested.append(0.0)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        inner = timing.nested.pop()
+        timing.stages[name] += elapsed - inner
+        timing.nested[-1] += elapsed
+
+
+def add_rows(count):
+    timing = _current.get()
+    if timing is not None:
+        timing.rows += count
+
+
+def instrument(func):
+    """Time a Dash callback; its stages are recorded when the request ends."""
+    params = list(inspect.signature(func).parameters)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        timing = CallbackTiming(func.__name__, dict(zip(params, args), **kwargs))
+        token = _current.set(timing)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timing.seconds = time.perf_counter() - start
+            _current.reset(token)
+            if _spool is not None:
+                # A job process, checked first: it was forked inside the
+                # request that started it and still sees its context. Only
+                # the date range is logged; progress setters do not pickle
+                timing.args = {k: timing.args.get(k) for k in ("start_date", "end_date")}
+                _spool.push(timing, prefix=SPOOL_PREFIX, expire=SPOOL_EXPIRE_SECONDS)
+            elif has_request_context():
+                g.callback_timing = timing
+            else:
+                record(timing)
+
+    return wrapper
+
+
+def record(timing, request_seconds=None, nbytes=None):
+    # Whatever the request spent outside of the callback itself is Dash
+    # decoding the inputs and serializing the outputs to JSON
+    if request_seconds is not None:
+        timing.stages["serialize"] += max(request_seconds - timing.seconds, 0.0)
+    total = request_seconds if request_seconds is not None else timing.seconds
+    callback_seconds.observe(total, timing.name)
+    for name, seconds in timing.stages.items():
+        if seconds:
+            stage_seconds.observe(seconds, timing.name, name)
+    callback_rows.observe(timing.rows, timing.name)
+    if nbytes is not None:
+        response_bytes.observe(nbytes, timing.name)
+
+    if SLOW_CALLBACK_MS is not None and total * 1000 >= SLOW_CALLBACK_MS:
+        stages = ", ".join(f"{k}={v * 1000:.1f}ms" for k, v in timing.stages.items() if v)
+        print(
+            f"Slow callback {timing.name}: {total * 1000:.1f}ms for "
+            f"{timing.args.get('start_date')} to {timing.args.get('end_date')} "
+            f"({stages}; {timing.rows:,} rows, {nbytes or 0:,} bytes)",
+            flush=True,
+        )
+
+
+def spool_to(cache):
+    """Queue this process's timings in a diskcache.Cache instead of recording them."""
+    global _spool
+    _spool = cache
+
+
+def collect_from(cache):
+    """Record the timings queued in a diskcache.Cache whenever /metrics is read."""
+    _sources.append(cache)
+
+
+def collect():
+    for cache in _sources:
+        while True:
+            _, timing = cache.pull(prefix=SPOOL_PREFIX)
+            if timing is None:
+                break
+            record(timing)
+
+
+def render():
+    collect()
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    return "\n".join(lines) + "\n"
+
+
+def init_app(server):
+    """Record instrumented callbacks per request and serve GET /metrics."""
+
+    @server.before_request
+    def _start_timer():
+        g.request_started = time.perf_counter()
+
+    @server.after_request
+    def _record_callback(response):
+        timing = g.pop("callback_timing", None)
+        if timing is not None:
+            elapsed = time.perf_counter() - g.request_started
+            record(timing, elapsed, response.calculate_content_length())
+        return response
+
+    @server.route("/metrics")
+    def metrics():
+        return Response(render(), mimetype="text/plain; version=0.0.4")
+
@@ -0,0 +1,106 @@
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from Utils.preprocessing import DATA_PATH, concat_frames, prepare
+
+DEFAULT_CHUNK_BYTES = 64 * 2**20
+
+# Columns the dashboard pages read; pass as usecols to skip the rest
+PAGE_COLUMNS = [
+    "Date_Time",
+    "Booking ID",
+    "Booking Status",
+    "Customer ID",
+    "Vehicle Type",
+    "Payment Method",
+    "Cancelled Rides by Customer",
+    "Reason for cancelling by Customer",
+    "Cancelled Rides by Driver",
+    "Driver Cancellation Reason",
+    "Booking Value",
+    "Customer Rating",
+]
+
+
+def chunk_ranges(path, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """Header line plus (start, end) byte ranges that each end on a newline.
+
+    Assumes no quoted field spans a line break, which holds for the ride CSVs.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        header = f.readline()
+        start = len(header)
+        ranges = []
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            f.readline()
+            end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return header, ranges
+
+
+def _parse_chunk(path, header, start, end, usecols, schema):
+    with open(path, "rb") as f:
+        f.seek(start)
+        chunk = f.read(end - start)
+    df = pd.read_csv(io.BytesIO(header + chunk), usecols=usecols)
+    return prepare(df, schema=schema)
+
+
+def load_csv_parallel(path=DATA_PATH, workers=None, chunk_bytes=DEFAULT_CHUNK_BYTES,
+                      usecols=None, schema=True):
+    """parse_csv() split into byte-range chunks parsed in a process pool.
+
+    Each worker reads, parses and derives features for one chunk at a time,
+    and at most two chunks per worker are in flight, so peak memory beyond
+    the (compact) result is bounded by the chunk size.
+    """
+    header, ranges = chunk_ranges(path, chunk_bytes)
+    if usecols is not None:
+        # The header's own names, padding included (prepare() strips it),
+        # selected by their stripped form like parse_csv does
+        wanted = set(usecols)
+        present = pd.read_csv(io.BytesIO(header), nrows=0).columns
+        usecols = [c for c in present if c.strip() in wanted]
+
+    workers = workers or os.cpu_count()
+    parts = [None] * len(ranges)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+        queue = iter(enumerate(ranges))
+        for _ in range(2 * workers):
+            _submit(pool, pending, queue, path, header, usecols, schema)
+        while pending:
+            future = next(iter(pending))
+            index = pending.pop(future)
+            parts[index] = future.result()
+            _submit(pool, pending, queue, path, header, usecols, schema)
+
+    if not parts:
+        return prepare(pd.read_csv(io.BytesIO(header), usecols=usecols), schema=schema)
+
+    # Chunks are each sorted; a stable sort of the concatenation keeps ties
+    # in file order, exactly like parse_csv
+    df = concat_frames(parts)
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index(kind="stable")
+    if schema:
+        # Match astype("category") on the whole column: sorted categories
+        for col in df.columns:
+            dtype = df[col].dtype
+            if isinstance(dtype, pd.CategoricalDtype) and not dtype.ordered:
+                df[col] = df[col].cat.set_categories(sorted(dtype.categories))
+    return df
+
+
+def _submit(pool, pending, queue, path, header, usecols, schema):
+    item = next(queue, None)
+    if item is not None:
+        index, (start, end) = item
+        future = pool.submit(_parse_chunk, path, header, start, end, usecols, schema)
+        pending[future] = index
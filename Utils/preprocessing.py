@@ -1,7 +1,89 @@
+import calendar
+import glob
+import hashlib
+import os
+
+import numpy as np
 import pandas as pd
+from pandas.api.types import union_categoricals
+
+# UBER_DATA_PATH points the app (or a benchmark) at another ride CSV
+DATA_PATH = os.environ.get("UBER_DATA_PATH", "Data/uber_rides_cleaned.csv")
+
+# In-memory schema applied by load_data(); bump SCHEMA_VERSION whenever it
+# changes so cached frames written with the old schema are not reused
+SCHEMA_VERSION = 1
+CATEGORICAL_COLUMNS = [
+    "Booking Status",
+    "Vehicle Type",
+    "Payment Method",
+    "Customer ID",
+    "Reason for cancelling by Customer",
+    "Driver Cancellation Reason",
+    "Incomplete Rides Reason",
+]
+ORDERED_CATEGORIES = {
+    "Weekday": list(calendar.day_name),
+    "Month": list(calendar.month_name)[1:],
+}
+INT8_COLUMNS = [
+    "Hour",
+    "Month_Num",
+    "Cancelled Rides by Customer",
+    "Cancelled Rides by Driver",
+    "Incomplete Rides",
+]
+FLOAT32_COLUMNS = [
+    "Booking Value",
+    "Ride Distance",
+    "Customer Rating",
+    "Driver Ratings",
+    "Avg VTAT",
+    "Avg CTAT",
+]
+
+# Parsed frames are cached next to the data as Parquet (needs pyarrow)
+CACHE_DIR = "Data/.cache"
+FINGERPRINT_SAMPLE_BYTES = 1 << 20
+
+
+def load_data(path=DATA_PATH, use_cache=True, workers=None, usecols=None):
+    # workers > 1 parses the CSV in byte-range chunks in a process pool
+    # (UBER_LOAD_WORKERS); usecols reads only those columns, and
+    # UBER_LOAD_COLUMNS=pages reads only the columns the pages use
+    if workers is None:
+        workers = int(os.environ.get("UBER_LOAD_WORKERS", "1"))
+    if usecols is None and os.environ.get("UBER_LOAD_COLUMNS") == "pages":
+        from Utils.parallel_load import PAGE_COLUMNS
+        usecols = PAGE_COLUMNS
+
+    df = read_cache(path, usecols) if use_cache else None
+    if df is None:
+        if workers > 1:
+            from Utils.parallel_load import load_csv_parallel
+            df = load_csv_parallel(path, workers=workers, usecols=usecols)
+        else:
+            df = parse_csv(path, usecols=usecols)
+        if use_cache:
+            write_cache(path, df, usecols)
+    df = combine_chunks(df)
+
+    # Check sortedness once here: the result is cached on the index, so
+    # filter_data never rescans it and forked workers inherit the flag
+    df.index.is_monotonic_increasing
+    return df
+
+
+def parse_csv(path=DATA_PATH, schema=True, usecols=None):
+    if usecols is not None:
+        wanted = set(usecols)
+        usecols = lambda col: col.strip() in wanted
+    return prepare(pd.read_csv(path, usecols=usecols), schema=schema)
 
-def load_data():
-    df = pd.read_csv("Data/uber_rides_cleaned.csv")
+
+def prepare(df, schema=True):
+    # Shared by the full load and incremental ingestion (Utils.ingest), so
+    # appended batches get exactly the same parsing and features
 
     # Clean column names
     df.columns = df.columns.str.strip()
@@ -16,19 +98,185 @@ def load_data():
     # Drop rows with invalid datetime (optional but recommended)
     df = df.dropna(subset=["Datetime"])
 
+    # Sort once by time (stable, so ties keep file order) and index by it,
+    # so filter_data can binary-search instead of scanning every row
+    df = df.sort_values("Datetime", kind="stable")
+    df.index = pd.DatetimeIndex(df["Datetime"].to_numpy())
+
     # Time-based features
-    df["Date"] = df["Datetime"].dt.date
+    df["Date"] = df["Datetime"].dt.normalize() if schema else df["Datetime"].dt.date
     df["Hour"] = df["Datetime"].dt.hour
     df["Weekday"] = df["Datetime"].dt.day_name()
     df["Month"] = df["Datetime"].dt.month_name()
     df["Month_Num"] = df["Datetime"].dt.month
 
+    if schema:
+        df = apply_schema(df)
+    return df
+
+
+def apply_schema(df):
+    # Day as datetime64 (midnight) instead of Python date objects
+    df["Date"] = df["Datetime"].dt.normalize()
+
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    for col, categories in ORDERED_CATEGORIES.items():
+        if col in df.columns:
+            df[col] = pd.Categorical(df[col], categories=categories, ordered=True)
+
+    # Flags and calendar fields fit in int8 (missing flags count as 0)
+    for col in INT8_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].fillna(0).astype("int8")
+    for col in FLOAT32_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("float32")
+
+    return df
+
+
+def to_records(df):
+    # JSON-ready rows for tables: float32 values are widened through their
+    # shortest repr so 38.31 is not shown as 38.310001373291016, and days
+    # print as dates
+    out = df.copy()
+    for col in out.columns:
+        if out[col].dtype == "float32":
+            out[col] = out[col].astype(str).astype("float64")
+    if "Date" in out.columns and out["Date"].dtype.kind == "M":
+        out["Date"] = out["Date"].dt.strftime("%Y-%m-%d")
+    return out.to_dict("records")
+
+
+def concat_frames(frames):
+    # pd.concat turns categoricals with different categories into object
+    # columns; union the categories first so the schema survives
+    frames = [f for f in frames if f is not None]
+    if len(frames) == 1:
+        return frames[0]
+    for col in frames[0].columns:
+        if isinstance(frames[0][col].dtype, pd.CategoricalDtype) and not frames[0][col].cat.ordered:
+            # A part where the column is all missing has no categories, and
+            # of another dtype (float64), which union_categoricals rejects
+            parts = [f[col] for f in frames if col in f.columns and len(f[col].cat.categories)]
+            if not parts:
+                continue
+            categories = union_categoricals(parts).categories
+            frames = [
+                f.assign(**{col: f[col].cat.set_categories(categories)}) if col in f.columns else f
+                for f in frames
+            ]
+    return pd.concat(frames)
+
+
+def combine_chunks(df):
+    # Arrow-backed columns (the string columns) come in many chunks when read
+    # from Parquet or concatenated, and gathering rows by position from a
+    # chunked column costs time in its length; as one chunk, taking rows
+    # (cross-filters, table pages) costs time in the rows taken
+    for col in df.columns:
+        dtype = df[col].dtype
+        if isinstance(dtype, pd.ArrowDtype) or getattr(dtype, "storage", None) == "pyarrow":
+            import pyarrow as pa
+
+            values = pa.array(df[col])
+            if isinstance(values, pa.ChunkedArray) and values.num_chunks > 1:
+                df[col] = pd.array(values.combine_chunks(), dtype=dtype)
     return df
 
 
-def filter_data(df, start_date, end_date):
-    if start_date and end_date:
-        start = pd.to_datetime(start_date)
-        end = pd.to_datetime(end_date)
-        return df[(df["Datetime"] >= start) & (df["Datetime"] <= end)]
-    return df
\ No newline at end of file
+def memory_report(df):
+    report = pd.DataFrame({
+        "dtype": df.dtypes.astype(str),
+        "bytes": df.memory_usage(deep=True, index=False),
+    })
+    report.loc["(index)"] = [str(df.index.dtype), df.index.memory_usage(deep=True)]
+    report["MiB"] = report["bytes"] / 2**20
+    return report.sort_values("bytes", ascending=False)
+
+
+def filter_data(df, start_date, end_date, filters=(), index=None):
+    # filters: (column, values) pairs ANDed with the date range (see
+    # Utils.query.normalize); index, a query.FrameIndex of df, resolves them
+    # from per-value row ids instead of testing every row of the range
+    if not (start_date and end_date or filters):
+        return df
+    sorted_by_time = isinstance(df.index, pd.DatetimeIndex) and df.index.is_monotonic_increasing
+    if sorted_by_time:
+        # Sorted datetime index: locate the range with two binary searches
+        # and use a positional slice (no boolean masks, no row copy)
+        lo, hi = 0, len(df)
+        if start_date and end_date:
+            # Bounds finer than the index unit (e.g. ns against a us index)
+            # round inwards, which keeps both ends inclusive
+            unit = df.index.unit
+            lo = df.index.searchsorted(pd.to_datetime(start_date).ceil(unit), side="left")
+            hi = df.index.searchsorted(pd.to_datetime(end_date).floor(unit), side="right")
+        if filters and index is not None:
+            return df.iloc[index.select(lo, hi, filters)]
+        df = df.iloc[lo:hi]
+    elif start_date and end_date:
+        df = df[(df["Datetime"] >= pd.to_datetime(start_date)) & (df["Datetime"] <= pd.to_datetime(end_date))]
+
+    if filters:
+        mask = np.ones(len(df), bool)
+        for col, values in filters:
+            mask &= df[col].isin(values).to_numpy() if col in df.columns else False
+        df = df[mask]
+    return df
+
+
+# Columnar cache
+
+def source_fingerprint(path):
+    # Schema version, size and mtime catch ordinary rewrites; hashing the
+    # first and last MiB also catches same-size edits that kept the mtime
+    stat = os.stat(path)
+    digest = hashlib.sha1(f"{SCHEMA_VERSION}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    with open(path, "rb") as f:
+        digest.update(f.read(FINGERPRINT_SAMPLE_BYTES))
+        if stat.st_size > FINGERPRINT_SAMPLE_BYTES:
+            f.seek(max(stat.st_size - FINGERPRINT_SAMPLE_BYTES, FINGERPRINT_SAMPLE_BYTES))
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def cache_path(path, usecols=None):
+    name = os.path.splitext(os.path.basename(path))[0]
+    target = f"{name}-{source_fingerprint(path)}"
+    if usecols is not None:
+        # Column projections are cached separately from the full frame
+        target += "-" + hashlib.sha1("\0".join(sorted(usecols)).encode()).hexdigest()[:8]
+    return os.path.join(CACHE_DIR, f"{target}.parquet")
+
+
+def read_cache(path=DATA_PATH, usecols=None):
+    try:
+        target = cache_path(path, usecols)
+        if not os.path.exists(target):
+            return None
+        return pd.read_parquet(target)
+    except (ImportError, OSError, ValueError):
+        return None
+
+
+def write_cache(path, df, usecols=None):
+    try:
+        target = cache_path(path, usecols)
+        os.makedirs(CACHE_DIR, exist_ok=True)
+
+        # Write under a temporary name so concurrent workers never read a
+        # half-written file, then drop caches of older versions of the CSV
+        tmp = f"{target}.{os.getpid()}.tmp"
+        df.to_parquet(tmp)
+        os.replace(tmp, target)
+
+        name = os.path.splitext(os.path.basename(path))[0]
+        current = os.path.join(CACHE_DIR, f"{name}-{source_fingerprint(path)}")
+        for stale in glob.glob(os.path.join(CACHE_DIR, f"{name}-*.parquet")):
+            if not stale.startswith(current):
+                os.remove(stale)
+    except (ImportError, OSError, ValueError):
+        pass
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+
+# Dimensions every page can be cross-filtered by (the sidebar's filter bar).
+# A filter is a set of values per column: values of one column are ORed,
+# columns are ANDed with each other and with the date range.
+FILTER_COLUMNS = ["Vehicle Type", "Payment Method", "Booking Status"]
+
+
+def normalize(filters):
+    """Filters as a canonical, hashable tuple of (column, values) pairs.
+
+    Accepts the filter-state store's {column: [values]} or such pairs.
+    Columns without values select everything and are left out, so () means
+    no filter, and equal selections give equal cache keys.
+    """
+    if not filters:
+        return ()
+    items = filters.items() if isinstance(filters, dict) else filters
+    return tuple(sorted((col, tuple(sorted(set(values)))) for col, values in items if values))
+
+
+def as_dict(filters):
+    # Back to the filter-state store's {column: [values]}
+    return {col: list(values) for col, values in filters}
+
+
+def filter_id(col):
+    # "Vehicle Type" -> "filter-vehicle-type" (the sidebar dropdowns)
+    return "filter-" + col.lower().replace(" ", "-")
+
+
+class ValueIndex:
+    """Sorted row ids (positions) of every value of one categorical column.
+
+    The frame is sorted by time, so a value's row ids are ascending in time
+    too, and its rows inside a date range, itself a position range, are one
+    slice of them found by two binary searches. The column's category codes
+    are kept (a view, not a copy) to test other rows against a filter.
+    """
+
+    def __init__(self, values):
+        if not isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype("category")
+        self.labels = values.cat.categories
+        self.codes = values.cat.codes.to_numpy()
+        # Row ids grouped by code: missing values (-1) first, then code 0, 1, ...
+        dtype = np.int32 if len(values) < 2**31 else np.int64
+        self.order = np.argsort(self.codes, kind="stable").astype(dtype)
+        counts = np.bincount(self.codes.astype(np.int64) + 1, minlength=len(self.labels) + 1)
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    def postings(self, values):
+        codes = self.labels.get_indexer(list(values))
+        return [self.order[self.offsets[code + 1]:self.offsets[code + 2]] for code in codes[codes >= 0]]
+
+    def spans(self, values, lo, hi):
+        # Bounds in the row ids' own dtype: searching int32 ids for an int64
+        # bound would first copy the whole list to int64
+        bounds = np.array([lo, hi], dtype=self.order.dtype)
+        return [(p, *p.searchsorted(bounds)) for p in self.postings(values)]
+
+    def count(self, values, lo, hi):
+        """Rows with one of the values among positions [lo, hi)."""
+        return sum(int(b - a) for _, a, b in self.spans(values, lo, hi))
+
+    def rows(self, values, lo, hi):
+        """Ascending positions in [lo, hi) of the rows with one of the values."""
+        parts = [p[a:b] for p, a, b in self.spans(values, lo, hi)]
+        if not parts:
+            return np.empty(0, self.order.dtype)
+        return parts[0] if len(parts) == 1 else np.sort(np.concatenate(parts))
+
+    def matches(self, values, positions):
+        """Which of the positions hold one of the values."""
+        # One flag per code; missing values (-1) index the trailing False
+        allowed = np.zeros(len(self.labels) + 1, bool)
+        codes = self.labels.get_indexer(list(values))
+        allowed[codes[codes >= 0]] = True
+        return allowed[self.codes[positions]]
+
+
+class FrameIndex:
+    """Per-value row-id indexes of a time-sorted frame's filter columns.
+
+    select() answers a conjunction of filters and a date range without
+    scanning the range: the most selective filter's row ids in the range
+    drive the query, and only those rows are checked against the other
+    filters, so the cost follows the smallest posting list, not the rows.
+    """
+
+    def __init__(self, df, columns=FILTER_COLUMNS):
+        self.columns = {col: ValueIndex(df[col]) for col in columns if col in df.columns}
+
+    def select(self, lo, hi, filters):
+        """Ascending positions in [lo, hi) of the rows matching every filter."""
+        if any(col not in self.columns for col, _ in filters):
+            # Filtering on a column the frame does not have matches nothing
+            return np.empty(0, np.int64)
+        terms = [(self.columns[col], values) for col, values in filters]
+        if not terms:
+            return np.arange(lo, hi)
+        terms.sort(key=lambda term: term[0].count(term[1], lo, hi))
+        (driver, values), rest = terms[0], terms[1:]
+        positions = driver.rows(values, lo, hi)
+        for index, values in rest:
+            if not len(positions):
+                break
+            positions = positions[index.matches(values, positions)]
+        return positions
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+from Utils.cancellations import category_codes
+
+RATING = "Customer Rating"
+REVENUE = "Booking Value"
+FIVE_STARS = 5
+HOURS = 24
+
+
+def daily_tables(df, day):
+    """Per-day rating and revenue aggregates for the Ratings page.
+
+    Every row is encoded once as (day, vehicle type, rating value) and
+    counted with a single np.bincount. Because a rating is one of a few
+    distinct values, the cube holds everything: the rating histogram is a
+    sum over vehicles, the counts per vehicle a sum over ratings, and rating
+    sums are counts times the rating values. Revenue is one weighted
+    bincount over (day, hour). Returns the "totals" columns rating_sum,
+    rating_count, five_star and revenue, and the "Customer Rating",
+    "rating_sum_by_vehicle", "rating_count_by_vehicle" and "revenue_by_hour"
+    tables.
+    """
+    if not len(df) or (RATING not in df.columns and REVENUE not in df.columns):
+        return {}
+
+    day_codes, days = pd.factorize(day.to_numpy(), sort=True)
+    index = pd.DatetimeIndex(days, name="Day")
+    totals = pd.DataFrame(index=index)
+    tables = {"totals": totals}
+
+    if RATING in df.columns:
+        # Codes of the distinct stored values (float32 as stored, so sums
+        # match accumulating the column in float64), in order of value;
+        # missing values get the last slot, which the sort leaves out
+        rating, values = pd.factorize(df[RATING].to_numpy())
+        rating = rating.astype(np.int64)
+        rating[rating < 0] = len(values)
+        values = np.asarray(values, dtype="float64")
+        order = np.argsort(values)
+        if "Vehicle Type" in df.columns:
+            vehicle, vehicles = category_codes(df["Vehicle Type"])
+        else:
+            vehicle, vehicles = np.zeros(len(df), np.int64), np.array([])
+
+        shape = (len(days), len(vehicles) + 1, len(values) + 1)
+        cube = np.bincount(np.ravel_multi_index((day_codes, vehicle, rating), shape),
+                           minlength=int(np.prod(shape))).reshape(shape)[:, :, order]
+        values = values[order]
+
+        per_rating = cube.sum(axis=1)
+        totals["rating_sum"] = per_rating @ values
+        totals["rating_count"] = per_rating.sum(axis=1)
+        totals["five_star"] = per_rating[:, values == FIVE_STARS].sum(axis=1)
+
+        # Round away float32 noise so histogram bins stay e.g. 4.3, not 4.300000190734863
+        tables[RATING] = pd.DataFrame(per_rating, index=index, columns=values.round(6))
+        if len(vehicles):
+            per_vehicle = cube[:, :len(vehicles)]
+            tables["rating_sum_by_vehicle"] = pd.DataFrame(per_vehicle @ values, index=index, columns=vehicles)
+            tables["rating_count_by_vehicle"] = pd.DataFrame(per_vehicle.sum(axis=2), index=index, columns=vehicles)
+
+    if REVENUE in df.columns:
+        # Accumulate in float64 even when the column is stored as float32;
+        # revenue per hour serves hourly charts, its row sums the days
+        revenue = df[REVENUE].to_numpy().astype("float64")
+        revenue[np.isnan(revenue)] = 0
+        hour = df["Datetime"].dt.hour.to_numpy().astype(np.int64)
+        by_hour = np.bincount(day_codes * HOURS + hour, weights=revenue,
+                              minlength=len(days) * HOURS).reshape(len(days), HOURS)
+        totals["revenue"] = by_hour.sum(axis=1)
+        tables["revenue_by_hour"] = pd.DataFrame(by_hour, index=index, columns=np.arange(HOURS))
+    return tables
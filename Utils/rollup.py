@@ -0,0 +1,158 @@
+import numpy as np
+import pandas as pd
+
+from Utils import buckets, cancellations, ratings
+
+# Categorical dimensions pre-counted per day
+DIMENSIONS = ["Booking Status", "Vehicle Type", "Payment Method"]
+
+# Per-day scalar measures: name -> source column
+MEASURES = {
+    "customer_cancelled": "Cancelled Rides by Customer",
+    "driver_cancelled": "Cancelled Rides by Driver",
+}
+
+# Day x hour tables behind each measure's hourly time series
+HOURLY_TABLES = {
+    "bookings": "hourly",
+    "revenue": "revenue_by_hour",
+    "customer_cancelled": cancellations.table_name("customer", "hour"),
+    "driver_cancelled": cancellations.table_name("driver", "hour"),
+}
+
+ONE_NS = pd.Timedelta(1, "ns")
+ONE_DAY = pd.Timedelta(1, "D")
+
+
+class Rollup:
+    """Per-day (and per-hour) aggregates of the ride table.
+
+    Every table is indexed by day, so a date-range query only has to sum
+    the days it covers instead of re-grouping raw rows.
+    """
+
+    def __init__(self, tables):
+        self.tables = tables
+
+    @classmethod
+    def from_frame(cls, df):
+        day = df["Datetime"].dt.normalize().rename("Day")
+
+        # Scalar measures
+        totals = pd.DataFrame({"bookings": 1}, index=df.index)
+        for name, col in MEASURES.items():
+            if col in df.columns:
+                totals[name] = df[col].astype("float64")
+        tables = {"totals": totals.groupby(day.to_numpy()).sum()}
+
+        # Counts per dimension value
+        for col in DIMENSIONS:
+            if col in df.columns:
+                tables[col] = df.groupby([day, df[col]], observed=True).size().unstack(fill_value=0)
+
+        # Ratings and revenue: totals, rating histogram and rating sums per
+        # vehicle type, all from one pass
+        rating_tables = ratings.daily_tables(df, day)
+        if "totals" in rating_tables:
+            tables["totals"] = tables["totals"].join(rating_tables.pop("totals"))
+        tables.update(rating_tables)
+
+        # Bookings per hour of day
+        tables["hourly"] = df.groupby([day, df["Datetime"].dt.hour]).size().unstack(fill_value=0)
+
+        # Cancellations by party x hour / vehicle type / reason
+        tables.update(cancellations.daily_tables(df, day))
+
+        for table in tables.values():
+            table.index.name = "Day"
+            # Plain column labels, so tables built from frames with
+            # different category sets still align in add()
+            table.columns = np.asarray(table.columns)
+        return cls(tables)
+
+    def add(self, other):
+        tables = {}
+        for key in self.tables.keys() | other.tables.keys():
+            if key not in other.tables:
+                tables[key] = self.tables[key]
+            elif key not in self.tables:
+                tables[key] = other.tables[key]
+            else:
+                tables[key] = self.tables[key].add(other.tables[key], fill_value=0).sort_index()
+        return Rollup(tables)
+
+    def days(self, first, last):
+        # Restrict every table to whole days in [first, last]
+        return Rollup({key: table.loc[first:last] for key, table in self.tables.items()})
+
+    def query(self, rows, start_date, end_date):
+        """Aggregates for the rows between start_date and end_date.
+
+        Whole days come from the precomputed tables; the partial days at
+        either edge of the range are aggregated from their raw rows, which
+        rows(start, end) returns (see Dataset.rows).
+        """
+        if not (start_date and end_date):
+            return self
+
+        start = pd.to_datetime(start_date)
+        end = pd.to_datetime(end_date)
+        first = start.ceil("D")
+        stop = (end + ONE_NS).floor("D")
+
+        if first >= stop:
+            return Rollup.from_frame(rows(start, end))
+
+        result = self.days(first, stop - ONE_DAY)
+        if start < first:
+            result = result.add(Rollup.from_frame(rows(start, first - ONE_NS)))
+        if stop <= end:
+            result = result.add(Rollup.from_frame(rows(stop, end)))
+        return result
+
+    # Accessors
+
+    def total(self, name):
+        totals = self.tables["totals"]
+        return totals[name].sum() if name in totals.columns else 0
+
+    def counts(self, col):
+        if col not in self.tables:
+            return pd.Series(dtype="int64")
+        counts = self.tables[col].sum()
+        return counts[counts > 0]
+
+    def daily(self, name):
+        return self.tables["totals"][name]
+
+    def granularity(self, start_date, end_date):
+        """Bucket size for time series over the range (see Utils.buckets)."""
+        if not (start_date and end_date):
+            days = self.tables["totals"].index
+            if not len(days):
+                return "day"
+            start_date, end_date = days[0], days[-1]
+        return buckets.choose(start_date, end_date)
+
+    def over_time(self, name, granularity):
+        """A measure (bookings, revenue, ...) per time bucket."""
+        if granularity == "hour":
+            if HOURLY_TABLES[name] not in self.tables:
+                return pd.Series(dtype="float64")
+            return buckets.hourly(self.tables[HOURLY_TABLES[name]])
+        return buckets.bucketed(self.daily(name), granularity)
+
+    def average_rating(self):
+        # nan without ratings, like the mean of no rows
+        count = self.total("rating_count")
+        if not count:
+            return float("nan")
+        return self.total("rating_sum") / count
+
+    def average_rating_by_vehicle(self):
+        if "rating_sum_by_vehicle" not in self.tables:
+            return pd.Series(dtype="float64")
+        present = self.counts("Vehicle Type").index
+        sums = self.tables["rating_sum_by_vehicle"].sum()
+        counts = self.tables["rating_count_by_vehicle"].sum()
+        return (sums / counts.where(counts > 0)).reindex(present).sort_index()
@@ -0,0 +1,139 @@
+import operator
+import re
+
+import numpy as np
+import pandas as pd
+
+from Utils.preprocessing import to_records
+
+# One DataTable filter expression, e.g. `{Vehicle Type} scontains Auto` or
+# `{Booking Value} s> 100`; an optional s/i prefix selects case sensitivity
+FILTER_PART = re.compile(
+    r"^\{(?P<col>[^}]+)\}\s+(?P<case>[si])?(?P<op>>=|<=|!=|<|>|=|ge|le|gt|lt|ne|eq|contains|datestartswith)\s+(?P<value>.+)$"
+)
+# Unary terms, e.g. `{Customer Rating} is blank`
+UNARY_PART = re.compile(r"^\{(?P<col>[^}]+)\}\s+is\s+(?P<op>blank|nil|num|str)$")
+OPERATORS = {
+    ">=": "ge", "<=": "le", ">": "gt", "<": "lt", "!=": "ne", "=": "eq",
+}
+COMPARE = {
+    "ge": operator.ge, "le": operator.le, "gt": operator.gt,
+    "lt": operator.lt, "ne": operator.ne, "eq": operator.eq,
+}
+
+
+def parse_filter_query(filter_query):
+    """Split a DataTable filter_query into (column, operator, value, case) terms.
+
+    Raises ValueError for a term it cannot evaluate, rather than dropping it
+    and returning rows the filter should have excluded.
+    """
+    terms = []
+    for part in (filter_query or "").split(" && "):
+        part = part.strip()
+        if not part:
+            continue
+        unary = UNARY_PART.match(part)
+        if unary:
+            terms.append((unary.group("col"), unary.group("op"), None, True))
+            continue
+        match = FILTER_PART.match(part)
+        if not match:
+            raise ValueError(f"Unsupported filter: {part}")
+        value = match.group("value").strip()
+        if len(value) > 1 and value[0] == value[-1] and value[0] in "\"'`":
+            value = value[1:-1]
+        op = OPERATORS.get(match.group("op"), match.group("op"))
+        terms.append((match.group("col"), op, value, match.group("case") != "i"))
+    return terms
+
+
+def apply_filter(df, terms):
+    # Narrow by time first (binary search on the sorted index), then build
+    # masks on that slice only; categoricals are tested once per category
+    rest = []
+    for col, op, value, case_sensitive in terms:
+        when = pd.to_datetime(value, errors="coerce") if col == "Datetime" else None
+        if when is not None and not pd.isna(when) and op in ("ge", "gt", "le", "lt") \
+                and df.index.is_monotonic_increasing:
+            pos = df.index.searchsorted(when, side="left" if op in ("ge", "lt") else "right")
+            df = df.iloc[pos:] if op in ("ge", "gt") else df.iloc[:pos]
+        elif col in df.columns:
+            rest.append((col, op, value, case_sensitive))
+        else:
+            raise ValueError(f"Unknown column: {col}")
+
+    mask = None
+    for col, op, value, case_sensitive in rest:
+        term_mask = _term_mask(df[col], op, value, case_sensitive)
+        mask = term_mask if mask is None else mask & term_mask
+    return df if mask is None else df[mask]
+
+
+def _term_mask(series, op, value, case_sensitive):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Evaluate against the handful of categories, then map through codes
+        hits = _values_mask(pd.Series(series.cat.categories), op, value, case_sensitive)
+        # Missing values (code -1) take the last slot
+        return np.append(hits, op in ("blank", "nil"))[series.cat.codes.to_numpy()]
+    return _values_mask(series, op, value, case_sensitive)
+
+
+def _values_mask(series, op, value, case_sensitive):
+    if op in ("blank", "nil"):
+        missing = series.isna()
+        if op == "blank" and series.dtype.kind not in "biufM":
+            missing |= series.astype(str).str.strip() == ""
+        return missing.to_numpy()
+    if op in ("num", "str"):
+        numeric = series.dtype.kind in "biuf"
+        present = series.notna().to_numpy()
+        return present if numeric == (op == "num") else np.zeros(len(series), dtype=bool)
+    if op in ("contains", "datestartswith"):
+        text = series.astype(str)
+        if op == "datestartswith":
+            return text.str.startswith(value).to_numpy()
+        return text.str.contains(value, case=case_sensitive, regex=False).to_numpy()
+
+    if series.dtype.kind in "biuf":
+        target = pd.to_numeric(value, errors="coerce")
+        # Compare in the column's own precision: 4.3 as float64 never equals
+        # a float32 4.3
+        if series.dtype.kind == "f" and not pd.isna(target):
+            target = series.dtype.type(target)
+    elif series.dtype.kind == "M":
+        target = pd.to_datetime(value, errors="coerce")
+    else:
+        series = series.astype(str)
+        target = value
+        if not case_sensitive:
+            series, target = series.str.lower(), value.lower()
+    if pd.isna(target):
+        return np.zeros(len(series), dtype=bool)
+    return COMPARE[op](series, target).to_numpy()
+
+
+def sort_positions(df, sort_by):
+    """Row positions of df in sort_by order, sorting only the key columns."""
+    keys = [s["column_id"] for s in sort_by if s["column_id"] in df.columns]
+    if not keys:
+        return np.arange(len(df))
+    ascending = [s["direction"] == "asc" for s in sort_by if s["column_id"] in df.columns]
+    key_frame = df[keys].reset_index(drop=True)
+    return key_frame.sort_values(keys, ascending=ascending, kind="stable").index.to_numpy()
+
+
+def table_page(df, filter_query, sort_by, page_current, page_size):
+    """(total rows, page records, page count) for a server-side DataTable."""
+    filtered = apply_filter(df, parse_filter_query(filter_query))
+    total = len(filtered)
+
+    start = page_current * page_size
+    if sort_by:
+        positions = sort_positions(filtered, sort_by)[start:start + page_size]
+        page = filtered.iloc[positions]
+    else:
+        page = filtered.iloc[start:start + page_size]
+
+    page_count = max(1, -(-total // page_size))
+    return total, to_records(page), page_count
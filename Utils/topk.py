@@ -0,0 +1,239 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Top-k values of a categorical column (the Ratings page's top customers) for
+# any date range. Counts are kept per day as sparse (code, count) arrays,
+# codes being positions in one label index, so a query adds up integer
+# arrays instead of hashing every Customer ID in the range. Configured
+# through the environment:
+#   UBER_TOPK_MODE          exact, approx or auto (default): auto answers
+#                           ranges of more than UBER_TOPK_APPROX_ROWS rows
+#                           (default 5,000,000) approximately
+#   UBER_TOPK_CAPACITY      values kept per month in approximate mode
+#                           (default 1000)
+DEFAULT_APPROX_ROWS = 5_000_000
+DEFAULT_CAPACITY = 1000
+
+ONE_NS = pd.Timedelta(1, "ns")
+ONE_DAY = pd.Timedelta(1, "D")
+
+
+def mode_from_env():
+    mode = os.environ.get("UBER_TOPK_MODE", "auto")
+    if mode not in ("exact", "approx", "auto"):
+        raise ValueError(f"UBER_TOPK_MODE must be exact, approx or auto, not {mode!r}")
+    return mode
+
+
+class TopK:
+    """Per-day value counts of one column, queryable for the top k of a range.
+
+    Exact queries sum the counts of the whole days in the range. Approximate
+    queries use a Space-Saving style summary for each whole month instead:
+    the month's `capacity` most frequent values with their counts, plus the
+    count an untracked value can at most have there. Summaries merge by
+    adding counts, so a value's estimate is low by at most the sum of those
+    bounds (see error()). Partial days at either edge of a range are always
+    counted exactly from their rows.
+    """
+
+    def __init__(self, column, labels, days, counts, capacity=None, months=None):
+        self.column = column
+        self.labels = labels        # pd.Index; codes are positions in it
+        self.days = days            # sorted datetime64 day starts
+        self.counts = counts        # per day: (codes, counts) arrays
+        self.capacity = capacity or int(os.environ.get("UBER_TOPK_CAPACITY", DEFAULT_CAPACITY))
+        self.months = months if months is not None else {}
+        # Rows per day, cumulated: any range's row count in O(log days)
+        self.cumulative = np.concatenate([[0], np.cumsum([c.sum() for _, c in counts], dtype=np.int64)])
+
+    @classmethod
+    def from_frame(cls, df, column, capacity=None):
+        values = df[column]
+        if not isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype("category")
+        labels = pd.Index(values.cat.categories)
+        day = df["Datetime"].dt.normalize().to_numpy()
+        days, counts = _daily_counts(day, values.cat.codes.to_numpy(), len(labels))
+        return cls(column, labels, days, counts, capacity)
+
+    def add(self, other):
+        """Counts of both, e.g. the loaded data plus an ingested batch."""
+        indexer = self.labels.get_indexer(other.labels)
+        new = indexer < 0
+        labels = self.labels.append(other.labels[new]) if new.any() else self.labels
+        indexer[new] = np.arange(len(self.labels), len(labels))
+
+        merged = dict(zip(self.days, self.counts))
+        for day, (codes, counts) in zip(other.days, other.counts):
+            codes = indexer[codes].astype(np.int32)
+            if day in merged:
+                codes, counts = _sum_counts(
+                    np.concatenate([merged[day][0], codes]),
+                    np.concatenate([merged[day][1], counts]),
+                )
+            merged[day] = (codes, counts)
+        days = np.array(sorted(merged), dtype=self.days.dtype)
+
+        # Month summaries stay valid unless the other side touched the month
+        touched = set(_month(other.days))
+        months = {m: s for m, s in self.months.items() if m not in touched}
+        return TopK(self.column, labels, days, [merged[d] for d in days], self.capacity, months)
+
+    def rows_between(self, first, stop):
+        # Rows of the whole days in [first, stop)
+        a, b = np.searchsorted(self.days, [np.datetime64(first), np.datetime64(stop)])
+        return int(self.cumulative[b] - self.cumulative[a])
+
+    def query(self, rows, start_date, end_date, k, mode="exact"):
+        """The k most frequent values between start_date and end_date.
+
+        Returns counts as a Series sorted descending, ties by label, with
+        attrs["error"] how far below the truth they can be (0 when exact).
+        mode is exact, approx or auto (approximate above
+        UBER_TOPK_APPROX_ROWS rows); rows(start, end) returns the raw rows of
+        partial edge days, as in Rollup.query.
+        """
+        if not len(self.days):
+            return self._top(self._count_rows(rows(start_date, end_date)), k)
+        start, end, first, stop = self._bounds(start_date, end_date)
+        if first >= stop:
+            return self._top(self._count_rows(rows(start, end)), k)
+
+        if mode == "auto":
+            limit = int(os.environ.get("UBER_TOPK_APPROX_ROWS", DEFAULT_APPROX_ROWS))
+            mode = "approx" if self.rows_between(first, stop) > limit else "exact"
+        approximate = mode == "approx"
+        totals = self._count_days(first, stop, approximate)
+        if start is not None and start < first:
+            totals += self._count_rows(rows(start, first - ONE_NS))
+        if end is not None and stop <= end:
+            totals += self._count_rows(rows(stop, end))
+        top = self._top(totals, k)
+        if approximate:
+            top.attrs["error"] = self.error(start_date, end_date)
+        return top
+
+    def error(self, start_date, end_date):
+        """How far below the truth an approximate count in the range can be."""
+        if not len(self.days):
+            return 0
+        _, _, first, stop = self._bounds(start_date, end_date)
+        return sum(self._summary(m)[2] for m in _whole_months(first, stop))
+
+    def top_of(self, rows, k):
+        """The k most frequent values among the given rows, counted exactly."""
+        return self._top(self._count_rows(rows), k)
+
+    def _bounds(self, start_date, end_date):
+        # The range (None for all rows) and the whole days [first, stop) in it
+        if start_date and end_date:
+            start, end = pd.to_datetime(start_date), pd.to_datetime(end_date)
+            return start, end, start.ceil("D"), (end + ONE_NS).floor("D")
+        return None, None, pd.Timestamp(self.days[0]), pd.Timestamp(self.days[-1]) + ONE_DAY
+
+    # Counting
+
+    def _count_days(self, first, stop, approximate):
+        codes, counts = [], []
+        if approximate:
+            months = _whole_months(first, stop)
+            for month in months:
+                month_codes, month_counts, _ = self._summary(month)
+                codes.append(month_codes)
+                counts.append(month_counts)
+            # Whole days outside whole months are counted exactly
+            spans = [(first, months[0] if months else stop)]
+            if months:
+                spans.append((months[-1] + pd.DateOffset(months=1), stop))
+        else:
+            spans = [(first, stop)]
+        for span_start, span_stop in spans:
+            span_codes, span_counts = self._day_range(span_start, span_stop)
+            codes.append(span_codes)
+            counts.append(span_counts)
+        return _dense(codes, counts, len(self.labels))
+
+    def _day_range(self, first, stop):
+        a, b = np.searchsorted(self.days, [np.datetime64(first), np.datetime64(stop)])
+        if a >= b:
+            return np.empty(0, np.int32), np.empty(0, np.int32)
+        return (np.concatenate([self.counts[i][0] for i in range(a, b)]),
+                np.concatenate([self.counts[i][1] for i in range(a, b)]))
+
+    def _summary(self, month):
+        # Built on first use; a racing thread at worst builds it twice
+        summary = self.months.get(month)
+        if summary is None:
+            codes, counts = self._day_range(month, month + pd.DateOffset(months=1))
+            totals = _dense([codes], [counts], len(self.labels))
+            present = np.flatnonzero(totals)
+            bound = 0
+            if len(present) > self.capacity:
+                order = np.argpartition(totals[present], len(present) - self.capacity - 1)
+                bound = int(totals[present[order[len(present) - self.capacity - 1]]])
+                present = present[order[len(present) - self.capacity:]]
+            summary = (present.astype(np.int32), totals[present], bound)
+            self.months[month] = summary
+        return summary
+
+    def _count_rows(self, rows):
+        if not len(rows) or self.column not in rows.columns:
+            return np.zeros(len(self.labels), np.int64)
+        values = rows[self.column]
+        if not isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype("category")
+        # Only the distinct labels are looked up, not every row
+        indexer = self.labels.get_indexer(values.cat.categories)
+        codes = values.cat.codes.to_numpy()
+        codes = indexer[codes[codes >= 0]]
+        return np.bincount(codes[codes >= 0], minlength=len(self.labels)).astype(np.int64)
+
+    def _top(self, totals, k):
+        present = np.flatnonzero(totals)
+        if len(present) > k:
+            kth = np.partition(totals[present], len(present) - k)[len(present) - k]
+            present = present[totals[present] >= kth]
+        top = pd.Series(totals[present], index=self.labels[present], name="count")
+        top.index.name = self.column
+        top = top.sort_index().sort_values(ascending=False, kind="stable").head(k)
+        top.attrs["error"] = 0
+        return top
+
+
+def _daily_counts(day, codes, n):
+    # Sparse per-day counts of codes < n (missing values, -1, are dropped)
+    keep = codes >= 0
+    days, day_index = np.unique(day[keep], return_inverse=True)
+    keys, counts = np.unique(day_index.astype(np.int64) * n + codes[keep], return_counts=True)
+    bounds = np.searchsorted(keys // n, np.arange(len(days) + 1))
+    codes = (keys % n).astype(np.int32)
+    counts = counts.astype(np.int32)
+    return days, [(codes[a:b], counts[a:b]) for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+def _sum_counts(codes, counts):
+    codes, inverse = np.unique(codes, return_inverse=True)
+    return codes.astype(np.int32), np.bincount(inverse, weights=counts).astype(np.int32)
+
+
+def _dense(codes, counts, n):
+    if not codes:
+        return np.zeros(n, np.int64)
+    return np.bincount(np.concatenate(codes), weights=np.concatenate(counts), minlength=n).astype(np.int64)
+
+
+def _month(days):
+    return pd.DatetimeIndex(days).to_period("M").to_timestamp().unique()
+
+
+def _whole_months(first, stop):
+    # Month starts of the calendar months lying entirely within [first, stop)
+    month = first if first.day == 1 else first + pd.offsets.MonthBegin()
+    months = []
+    while month + pd.DateOffset(months=1) <= stop:
+        months.append(month)
+        month = month + pd.DateOffset(months=1)
+    return months
@@ -1,8 +1,22 @@
-from dash import Dash, callback, Input, Output
+import os
+
+# Cold start: reading the ride data is the slow part, so it starts first and
+# runs in a background thread while Dash is imported and the app is built;
+# whatever needs the data waits for it (UBER_LOAD_ASYNC=0 reads it up front).
+# Benchmarks/cold_start.py measures startup and each page's first request.
+from Callbacks.callbacks import data, ingest, register_callbacks, results
+if os.environ.get("UBER_LOAD_ASYNC", "1") == "0":
+    data.load()
+else:
+    data.load_async()
+
+from dash import Dash, Input, Output
+from flask import jsonify
 from Layouts.layout import (create_layout, create_overall_analysis_content,
                             create_cancellations_content, create_ratings_content,
                             create_raw_data_content)
-from Callbacks.callbacks import register_callbacks
+from Callbacks.warmup import format_report, warm_up
+from Utils import export, metrics
 
 app = Dash(__name__, suppress_callback_exceptions=True, assets_folder='Assets')
 server = app.server
@@ -26,5 +40,28 @@ def display_page(pathname):
 
 register_callbacks(app)
 
+# Result cache hit/miss counters, for tuning UBER_RESULT_CACHE_* settings
+@server.route("/cache-stats")
+def cache_stats():
+    return jsonify(results.stats())
+
+# Per-callback stage latency histograms at /metrics (UBER_SLOW_CALLBACK_MS
+# additionally logs slow callbacks)
+metrics.init_app(server)
+
+# Streaming CSV/Parquet downloads of the raw data at /export
+export.init_app(server, data)
+
+# Precompute page outputs before the server accepts traffic (UBER_WARMUP);
+# under gunicorn this runs once in the preloading master
+warmup_report = warm_up()
+if warmup_report:
+    print(format_report(warmup_report), flush=True)
+
+# Start tailing new ride records, if configured; gunicorn starts it in each
+# worker instead (see gunicorn.conf.py)
+if ingest is not None and os.environ.get("UBER_INGEST_IN_WORKERS") != "1":
+    ingest.start()
+
 if __name__ == "__main__":
     app.run(debug=True)
\ No newline at end of file
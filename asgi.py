@@ -0,0 +1,16 @@
+# ASGI entry point, for serving from an event loop:
+#
+#   GUNICORN_WORKER_CLASS=uvicorn_worker.UvicornWorker gunicorn asgi:application
+#   uvicorn asgi:application --workers 4
+#
+# The event loop holds any number of open connections cheaply; at most
+# UBER_ASGI_THREADS requests per worker (default 64) are inside the Dash (WSGI)
+# app at once, and of those only UBER_COMPUTE_THREADS aggregate at a time
+# (see Utils/compute.py).
+import os
+
+from a2wsgi import WSGIMiddleware
+
+from app import server
+
+application = WSGIMiddleware(server, workers=int(os.environ.get("UBER_ASGI_THREADS", "64")))
@@ -0,0 +1,60 @@
+# Gunicorn settings for `gunicorn app:server` (picked up automatically from
+# the working directory).
+#
+# The app is preloaded in the master process, so the ride data is parsed once
+# and every forked worker shares the same pages copy-on-write instead of
+# loading a private copy. Worker RSS therefore stays flat as the dataset grows
+# and a worker boots in milliseconds. Benchmarks/worker_rss.py measures both.
+import gc
+import os
+import time
+
+bind = os.environ.get("GUNICORN_BIND", "127.0.0.1:8050")
+workers = int(os.environ.get("GUNICORN_WORKERS", "4"))
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") != "0"
+
+# Each worker serves GUNICORN_THREADS requests at once (gthread), so a slow
+# callback no longer blocks the worker's other users. The page computations
+# themselves are capped by UBER_COMPUTE_THREADS (see Utils/compute.py), so a
+# thread waiting for one costs little: size this for concurrent users, not CPUs.
+# For the ASGI entry point use the uvicorn worker class instead:
+#   GUNICORN_WORKER_CLASS=uvicorn_worker.UvicornWorker gunicorn asgi:application
+threads = int(os.environ.get("GUNICORN_THREADS", "16"))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread" if threads > 1 else "sync")
+
+# Deploys warm every month and quarter, not just the default ranges; with
+# preloading the warmed in-memory result cache is inherited by all workers
+os.environ.setdefault("UBER_WARMUP", "common")
+
+# Ingestion starts in each worker (post_worker_init), never in the preloading
+# master: a worker forked while the master's ingest thread held the dataset's
+# lock in the middle of an append would inherit it held, and block forever
+os.environ["UBER_INGEST_IN_WORKERS"] = "1"
+
+
+def when_ready(server):
+    # Workers must fork from a master that has finished reading the data:
+    # the loading thread (see app.py) would not come along
+    if server.cfg.preload_app:
+        from Callbacks.callbacks import data
+        data.wait()
+
+    # Move everything built so far (the dataset, rollups, layouts) into the
+    # permanent generation: the cyclic GC in the workers then never walks
+    # those objects, which would otherwise dirty their shared pages
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    worker.boot_started = time.monotonic()
+
+
+def post_worker_init(worker):
+    # Each worker tails new records on its own (see UBER_INGEST_IN_WORKERS)
+    from Callbacks.callbacks import ingest
+    if ingest is not None:
+        ingest.start()
+
+    worker.log.info(
+        "Worker %s booted in %.3fs", worker.pid, time.monotonic() - worker.boot_started
+    )